@@ -2,8 +2,15 @@ import requests
 import gzip
 import os
 import shutil
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import json
 import sys
+from pipeline_config import get_param, keep_intermediates
+from gz_index import load_gz_index
+import telemetry
 
 
 # create folder 
@@ -40,6 +47,85 @@ def download_file(download_url, jsonl_gz, chunk_size):
             except RequestException as e:
                 print(f"warning, continue downloading: {e}")
 
+# manifest des segments terminés, pour ne reprendre que les plages manquantes
+def load_manifest(manifest_path, download_url, total_size, segment_size):
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+        if (manifest['url'] == download_url and manifest['size'] == total_size
+                and manifest['segment_size'] == segment_size):
+            return manifest
+        print(f"warning, manifest does not match remote file, restart download: {manifest_path}")
+    return {'url': download_url, 'size': total_size, 'segment_size': segment_size, 'done': []}
+
+def save_manifest(manifest_path, manifest):
+    temp_path = manifest_path + '.temp'
+    with open(temp_path, 'w') as file:
+        json.dump(manifest, file)
+    os.replace(temp_path, manifest_path)
+
+def download_segment(session, download_url, jsonl_gz, start, end, chunk_size):
+    while True:
+        try:
+            headers = {"range": f"bytes={start}-{end}"}
+            response = session.get(download_url, headers=headers, stream=True)
+            if response.status_code != 206:
+                raise RuntimeError(f"ERROR, range request refused: {response.status_code}")
+            position = start
+            with open(jsonl_gz, 'r+b') as file:
+                file.seek(start)
+                for chunk in response.iter_content(chunk_size):
+                    if chunk:
+                        file.write(chunk)
+                        position += len(chunk)
+            if position == end + 1:
+                return
+            print(f"warning, incomplete segment {start}-{end}, retry")
+        except RequestException as e:
+            print(f"warning, retry segment {start}-{end}: {e}")
+
+# téléchargement segmenté: N requêtes range en parallèle sur un pool de connexions partagé
+def download_file_segmented(download_url, jsonl_gz, chunk_size, nb_connections, segment_size):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=nb_connections)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    head = session.head(download_url, allow_redirects=True)
+    total_size = int(head.headers.get('content-length', 0))
+    if nb_connections < 2 or total_size == 0 or head.headers.get('accept-ranges') != 'bytes':
+        print("range requests not supported, single stream download")
+        download_file(download_url, jsonl_gz, chunk_size)
+        return
+    manifest_path = jsonl_gz + '.manifest.json'
+    resume = os.path.exists(manifest_path)
+    manifest = load_manifest(manifest_path, download_url, total_size, segment_size)
+    segments = [(start, min(start + segment_size, total_size) - 1)
+                for start in range(0, total_size, segment_size)]
+    if not resume and os.path.exists(jsonl_gz):
+        # fichier d'un ancien téléchargement en un seul flux: garder les segments déjà complets
+        file_size = os.path.getsize(jsonl_gz)
+        if file_size == total_size:
+            print(f"already downloaded: {jsonl_gz}")
+            return
+        manifest['done'] = [i for i, (start, end) in enumerate(segments) if end < file_size]
+    with open(jsonl_gz, 'ab') as file:
+        file.truncate(total_size)
+    save_manifest(manifest_path, manifest)
+    lock = threading.Lock()
+    def worker(index):
+        start, end = segments[index]
+        download_segment(session, download_url, jsonl_gz, start, end, chunk_size)
+        with lock:
+            manifest['done'].append(index)
+            save_manifest(manifest_path, manifest)
+    done = set(manifest['done'])
+    todo = [i for i in range(len(segments)) if i not in done]
+    print(f"segments to download: {len(todo)} / {len(segments)}")
+    with ThreadPoolExecutor(max_workers=nb_connections) as executor:
+        list(executor.map(worker, todo))
+    os.remove(manifest_path)
+    print(f"downloaded: {jsonl_gz}")
+
 # décompresser du fichier jsonl
 def un_gz_file(file_id, data_path, jsonl_gz, jsonl):
     with gzip.open(jsonl_gz, 'rb') as f_in:
@@ -49,7 +135,9 @@ def un_gz_file(file_id, data_path, jsonl_gz, jsonl):
     return jsonl_gz
 
 def delete_file(file_path):
-    if os.path.exists(file_path):
+    if keep_intermediates():
+        print(f"file kept for orchestrator: {file_path}")
+    elif os.path.exists(file_path):
         os.remove(file_path)
         print(f"file deleted: {file_path}")
     else:
@@ -63,14 +151,31 @@ def main(download_url, file_id, data_path, chunk_size):
     chunk_size = int(chunk_size)
     jsonl_gz = data_path + file_id + "_openfoodfacts_00" + ".jsonl.gz"
     jsonl = data_path + file_id + '_openfoodfacts_01.jsonl'
-    print("create folder")
-    create_folder(data_path)
+    nb_connections = int(get_param('download_connections', 1))
+    segment_size = int(get_param('download_segment_size', 64 * 1024 * 1024))
+    if os.path.exists(jsonl_gz + '.manifest.json'):
+        print("resume interrupted segmented download")
+    elif keep_intermediates() and os.path.exists(data_path):
+        print("data folder managed by orchestrator")
+    else:
+        print("create folder")
+        create_folder(data_path)
+    telemetry.start_stage('00_collect_data', file_id)
     print("start downloading jsonl file from open food facts data-base")
-    download_file(download_url, jsonl_gz, chunk_size)
+    download_file_segmented(download_url, jsonl_gz, chunk_size, nb_connections, segment_size)
+    if get_param('fused_projection', False):
+        # décompression faite en flux par 01_keep_usefull_columns.py, pas de jsonl 01 sur disque
+        print("fused projection enabled, keep jsonl file compressed")
+        if int(get_param('nb_workers', 1)) > 1:
+            print("building random access index of jsonl gz file")
+            load_gz_index(jsonl_gz, int(get_param('gz_index_spacing', 4 * 1024 * 1024)))
+        telemetry.end_stage([jsonl_gz])
+        return
     print("uncompress jsonl file")
     un_gz_file(file_id, data_path, jsonl_gz, jsonl)
     print("delete jsonl file compressed")
     delete_file(jsonl_gz)
+    telemetry.end_stage([jsonl])
 
 if __name__ == "__main__":
     download_url = sys.argv[1]
@@ -1,31 +1,224 @@
 import os
+import gzip
 import json
+import itertools
+import collections
+import multiprocessing
 import sys
+import time
+from pipeline_config import get_param, keep_intermediates
+from gz_index import load_gz_index, gz_ranges, read_gz_range
+import telemetry
+import row_filters
+from intermediate_io import open_writer, concat_files, extension, shard_path, shard_pattern, list_shards, has_big_integer
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+COLUMNS_TO_KEEP = ['code',
+                   'pnns_groups_1',
+                   'ingredients_tags',
+                   'product_name',
+                   'ecoscore_tags',
+                   'categories_tags',
+                   'ecoscore_score',
+                   'countries',
+                   'ecoscore_data',
+                   'food_groups_tags',
+                   'nova_group',
+                   'ingredients_from_or_that_may_be_from_palm_oil_n',
+                   'nutrient_levels_tags',
+                   'categories',
+                   'nutriscore_tags',
+                   'additives_old_n',
+                   'stores',
+                   'compared_to_category',
+                   '_keywords',
+                   'packaging_tags',]
 
 
 def delete_file(file_path):
-    if os.path.exists(file_path):
+    if keep_intermediates():
+        print(f"file kept for orchestrator: {file_path}")
+    elif os.path.exists(file_path):
         os.remove(file_path)
-        print(f"file jsonl 01 deleted: {file_path}")
+        print(f"file deleted: {file_path}")
     else:
         print(f"ERROR, does not exists: {file_path}")
 
+# ouverture en flux, décompression à la volée si l'entrée est le jsonl.gz
+def open_input(file_path):
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, 'rt', encoding='utf-8')
+    return open(file_path, 'r', encoding='utf-8')
+
+# backends de décodage: extraction des seules colonnes utiles, repli sur json (stdlib)
+def stdlib_extractor(columns_to_keep):
+    def extract(line):
+        record = json.loads(line)
+        return {key: record.get(key) for key in columns_to_keep}
+    return extract
+
+# orjson: décodage complet de la ligne (plus rapide que json, mais pas partiel), colonnes gardées ensuite;
+# lignes aux grands entiers laissées à json (has_big_integer)
+def orjson_extractor(columns_to_keep):
+    def extract(line):
+        if has_big_integer(line):
+            raise ValueError("integer out of 64-bit range")
+        record = orjson.loads(line)
+        return {key: record.get(key) for key in columns_to_keep}
+    return extract
+
+# simdjson: document parsé paresseusement, seules les colonnes gardées sont converties en objets python
+def simdjson_extractor(columns_to_keep):
+    parser = simdjson.Parser()
+    def as_python(value):
+        if isinstance(value, simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, simdjson.Array):
+            return value.as_list()
+        return value
+    def extract(line):
+        document = parser.parse(line)
+        return {key: as_python(document.get(key)) for key in columns_to_keep}
+    return extract
+
+# auto: décodage partiel par simdjson s'il est installé, json sinon (orjson seulement sur demande)
+def resolve_json_backend(json_backend):
+    if json_backend == 'auto':
+        return 'simdjson' if simdjson is not None else 'json'
+    if (json_backend == 'simdjson' and simdjson is None) or (json_backend == 'orjson' and orjson is None):
+        print(f"warning, {json_backend} not installed, fallback to json")
+        return 'json'
+    return json_backend
+
+def get_json_codec(json_backend, columns_to_keep):
+    json_backend = resolve_json_backend(json_backend)
+    fallback = stdlib_extractor(columns_to_keep)
+    if json_backend == 'simdjson':
+        fast = simdjson_extractor(columns_to_keep)
+    elif json_backend == 'orjson':
+        fast = orjson_extractor(columns_to_keep)
+    else:
+        fast = None
+    def extract(line):
+        if fast is not None:
+            try:
+                return fast(line)
+            except (ValueError, RuntimeError): # grands entiers, etc.
+                pass
+        return fallback(line)
+    def dumps(record):
+        if orjson is not None and json_backend != 'json':
+            try:
+                return orjson.dumps(record).decode('utf-8')
+            except TypeError: # grands entiers
+                pass
+        return json.dumps(record)
+    return extract, dumps
+
+# lignes regroupées par paquets de chunk_size
+def line_batches(lines, chunk_size):
+    lines = iter(lines)
+    while True:
+        batch = list(itertools.islice(lines, chunk_size))
+        if not batch:
+            return
+        yield batch
+
+# filtrage des lignes vers le fichier de sortie, écriture par paquets de chunk_size; prune: lignes
+# inutiles (row_filters.py) écartées dès la projection, comptées par règle dans pruned
+def write_filtered_lines(lines, columns_to_keep, jsonl_02, chunk_size, json_backend='json', prune=False, pruned=None):
+    extract, dumps = get_json_codec(json_backend, columns_to_keep)
+    count = 0
+    with open_writer(jsonl_02, dumps, raw=True) as writer:
+        for batch in telemetry.track_chunks(line_batches(lines, chunk_size)):
+            records = [extract(line.strip()) for line in batch]
+            if prune:
+                reasons = [row_filters.record_prune_reason(record) for record in records]
+                pruned.update(reason for reason in reasons if reason is not None)
+                records = [record for record, reason in zip(records, reasons) if reason is None]
+            writer.write_records(records)
+            count += len(records)
+    telemetry.add_rows_out(count)
+    return count
+
 # génération jsonl filtré
-def jsonl_filtered_creator(jsonl_01, columns_to_keep, jsonl_02, chunk_size):
-    with open(jsonl_01, 
-            'r', 
-            encoding='utf-8') as infile, open(jsonl_02, 'w', 
-                                                encoding='utf-8') as outfile:
-        buffer = []
-        for i, line in enumerate(infile):
-            record = json.loads(line.strip())        
-            filtered_record = {key: record.get(key) for key in columns_to_keep}        
-            buffer.append(json.dumps(filtered_record) + '\n')
-            if len(buffer) >= chunk_size:
-                outfile.writelines(buffer)
-                buffer = []
-        if buffer:
-            outfile.writelines(buffer)
+def jsonl_filtered_creator(jsonl_01, columns_to_keep, jsonl_02, chunk_size, json_backend='json', prune=False):
+    pruned = collections.Counter()
+    with open_input(jsonl_01) as infile:
+        count = write_filtered_lines(infile, columns_to_keep, jsonl_02, chunk_size, json_backend, prune, pruned)
+    if prune:
+        telemetry.add_rows_pruned(pruned)
+        row_filters.report('01 projection', pruned, count + sum(pruned.values()))
+    print(f"jsonl 02 generated: {jsonl_02}")
+
+# découpe du jsonl en nb_ranges plages d'octets [début, fin[ alignées sur les retours à la ligne
+def file_ranges(jsonl_01, nb_ranges):
+    file_size = os.path.getsize(jsonl_01)
+    bounds = [0]
+    with open(jsonl_01, 'rb') as infile:
+        for i in range(1, nb_ranges):
+            infile.seek((file_size * i) // nb_ranges)
+            infile.readline()
+            bounds.append(min(infile.tell(), file_size))
+    bounds.append(file_size)
+    return [(bounds[i], bounds[i + 1]) for i in range(nb_ranges) if bounds[i] < bounds[i + 1]]
+
+def read_file_range(jsonl_01, start, end):
+    with open(jsonl_01, 'rb') as infile:
+        infile.seek(start)
+        position = start
+        while position < end:
+            line = infile.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+# projection d'une plage de l'entrée vers un fichier shard (exécuté dans un processus du pool)
+def project_range(task):
+    jsonl_01, start, end, columns_to_keep, shard, chunk_size, json_backend, prune = task
+    if jsonl_01.endswith('.gz'):
+        lines = read_gz_range(jsonl_01, start, end)
+    else:
+        lines = read_file_range(jsonl_01, start, end)
+    started = time.perf_counter()
+    pruned = collections.Counter()
+    count = write_filtered_lines(lines, columns_to_keep, shard, chunk_size, json_backend, prune, pruned)
+    return shard, count, pruned, time.perf_counter() - started
+
+# génération jsonl filtré en parallèle, une plage par tâche, shards concaténés dans l'ordre
+# (ou laissés tels quels, lus dans l'ordre par 02_columns_preprocessing.py)
+def jsonl_filtered_creator_parallel(jsonl_01, columns_to_keep, jsonl_02, chunk_size, nb_workers, ranges,
+                                    json_backend='json', keep_shards=False, prune=False):
+    tasks = [(jsonl_01, start, end, columns_to_keep, shard_path(jsonl_02, i), chunk_size, json_backend, prune)
+             for i, (start, end) in enumerate(ranges)]
+    shards = []
+    pruned = collections.Counter()
+    rows = 0
+    with multiprocessing.Pool(nb_workers) as pool:
+        for shard, count, range_pruned, seconds in pool.imap(project_range, tasks):
+            shards.append(shard)
+            # latence par plage, mesurée dans le processus du pool
+            telemetry.record_chunk(seconds, count + sum(range_pruned.values()))
+            telemetry.add_rows_out(count)
+            pruned.update(range_pruned)
+            rows += count + sum(range_pruned.values())
+            print(f"-----------------------------------------------------------> progress: {(len(shards) * 100) / len(tasks)} %")
+    if prune:
+        telemetry.add_rows_pruned(pruned)
+        row_filters.report('01 projection', pruned, rows)
+    if keep_shards:
+        print(f"jsonl 02 generated as {len(shards)} shards: {shard_pattern(jsonl_02)}")
+        return
+    concat_files(shards, jsonl_02)
     print(f"jsonl 02 generated: {jsonl_02}")
 
 
@@ -35,30 +228,35 @@ def jsonl_filtered_creator(jsonl_01, columns_to_keep, jsonl_02, chunk_size):
 def main(chunk_size, file_id, data_path):
     chunk_size = int(chunk_size)
     jsonl_01 = data_path + file_id + "_openfoodfacts_01" + ".jsonl" 
-    jsonl_02 = data_path + file_id + '_openfoodfacts_02.jsonl' 
-    columns_to_keep = ['pnns_groups_1',
-                'ingredients_tags',
-                'product_name',
-                'ecoscore_tags',
-                'categories_tags',
-                'ecoscore_score',
-                'countries',
-                'ecoscore_data',
-                'food_groups_tags',
-                'nova_group',
-                'ingredients_from_or_that_may_be_from_palm_oil_n',
-                'nutrient_levels_tags',
-                'categories',
-                'nutriscore_tags',
-                'additives_old_n',
-                'stores',
-                'compared_to_category',
-                '_keywords',
-                'packaging_tags',]
-    print("generating jsonl 02 with only usefull columns")
-    jsonl_filtered_creator(jsonl_01, columns_to_keep, jsonl_02, chunk_size)
-    print("deleting file jsonl 01")
-    delete_file(jsonl_01)
+    if get_param('fused_projection', False):
+        jsonl_01 = data_path + file_id + "_openfoodfacts_00" + ".jsonl.gz"
+    jsonl_02 = data_path + file_id + '_openfoodfacts_02' + extension()
+    nb_workers = int(get_param('nb_workers', 1))
+    ranges = None
+    if nb_workers > 1 and jsonl_01.endswith('.gz'):
+        print("loading random access index of jsonl gz file")
+        line_offsets = load_gz_index(jsonl_01, int(get_param('gz_index_spacing', 4 * 1024 * 1024)))
+        if line_offsets:
+            ranges = gz_ranges(line_offsets, nb_workers * 4)
+    elif nb_workers > 1:
+        ranges = file_ranges(jsonl_01, nb_workers * 4)
+    json_backend = get_param('json_backend', 'json')
+    prune = get_param('prune_useless_lines', False)
+    telemetry.start_stage('01_keep_usefull_columns', file_id, [jsonl_01])
+    print(f"generating jsonl 02 with only usefull columns, json backend: {resolve_json_backend(json_backend)}")
+    if ranges:
+        jsonl_filtered_creator_parallel(jsonl_01, COLUMNS_TO_KEEP, jsonl_02, chunk_size, nb_workers, ranges,
+                                        json_backend, get_param('keep_shards', False), prune)
+    else:
+        jsonl_filtered_creator(jsonl_01, COLUMNS_TO_KEEP, jsonl_02, chunk_size, json_backend, prune)
+    telemetry.end_stage([jsonl_02] + list_shards(jsonl_02))
+    if jsonl_01.endswith('.gz'):
+        # archive téléchargée gardée avec son index d'accès aléatoire à côté (invalidé par la taille
+        # et la date de l'archive), réutilisés au passage suivant
+        print(f"input archive and its index kept: {jsonl_01}")
+    else:
+        print(f"deleting input file: {jsonl_01}")
+        delete_file(jsonl_01)
 
 if __name__ == "__main__":
     chunk_size = sys.argv[1]
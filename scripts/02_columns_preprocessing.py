@@ -4,1930 +4,1915 @@ import os
 import warnings
 import json
 import re
+import csv
 import sys
+import time
+import collections
+import multiprocessing
+import importlib
+from pipeline_config import get_param, keep_intermediates
+import telemetry
+from intermediate_io import open_writer, read_chunks, read_raw_chunks, chunk_frame, extension, list_shards, is_parquet
+from progress import Progress
+from text_normalization import normalize_text, normalize_columns
+from encoders import GRADES, PNNS_1_GROUPS, LANGUAGE_PREFIX as TAG_LANGUAGE_PREFIX, encode_categories, encode_grades
+from vocabularies import Vocabulary, load_vocabularies, save_vocabularies
+import row_filters
+import dedup
+from row_filters import VALUES_TO_REPLACE
+
+keep_usefull_columns = importlib.import_module('01_keep_usefull_columns')
 
 pd.set_option('display.max_rows', 100)
 warnings.filterwarnings("ignore", category=pd.errors.DtypeWarning)
 pd.set_option('future.no_silent_downcasting', True)
 
-def count_chunks(jsonl_02, chunk_size):
-    with open(jsonl_02, 'r') as file:
-        line_count = sum(1 for _ in file)
-    estimated_chunks = (line_count + chunk_size - 1) // chunk_size
-    print(f"total chunk estimated: {estimated_chunks}")
-    return estimated_chunks
-
-def delete_file(file_path):
-    if os.path.exists(file_path):
-        os.remove(file_path)
-        print(f"file deleted: {file_path}")
-    else:
-        print(f"ERROR, does not exists: {file_path}")
-
-def rename_columns_processing(df): 
-    df.rename(columns={'pnns_groups_1': 'pnns_1'}, inplace=True)
-    df.rename(columns={'ingredients_tags': 'ingredients_temp'}, inplace=True)
-    df.rename(columns={'product_name': 'name'}, inplace=True)
-    df.rename(columns={'categories_tags': 'categories_temp'}, inplace=True)
-    df.rename(columns={'food_groups_tags': 'food_group'}, inplace=True)
-    df.rename(columns={'nova_group': 'nova'}, inplace=True)
-    df.rename(columns={'ingredients_from_or_that_may_be_from_palm_oil_n': 'palm_oil'}, inplace=True)
-    df.rename(columns={'nutrient_levels_tags': 'nutrient_level'}, inplace=True)
-    df.rename(columns={'additives_old_n': 'additives'}, inplace=True)
-    df.rename(columns={'_keywords': 'keywords'}, inplace=True)
-    df.rename(columns={'packaging_tags': 'packaging'}, inplace=True)
-    df.rename(columns={'compared_to_category': 'main_category'}, inplace=True)
-    return df
+# normalisation des noms de pays (toutes langues) puis identifiant numérique
+COUNTRY_MAPPING = {
+    'åland': 'finland',
+    'european-union': 'europe',
+    'cap-vert': 'cape verde',
+    'república de china': 'china',
+    'sudán': 'sudan',
+    'scotland': 'united kingdom',
+    'nueva zelanda': 'new zealand',
+    'libye': 'libya',
+    'великобритания': 'united kingdom',
+    'رومانيا': 'romania',
+    'burundi': 'burundi',
+    'galmudug': 'somalia',
+    'østrig': 'austria',
+    'holland': 'netherlands',
+    'libya': 'libya',
+    'bahrain': 'bahrain',
+    'islanda': 'iceland',
+    'belgica': 'belgium',
+    'irsko': 'ireland',
+    'βουλγαρία': 'bulgaria',
+    'гърция': 'greece',
+    'islandia': 'iceland',
+    'olanda': 'netherlands',
+    'worldwide': 'world',
+    'malawi': 'malawi',
+    'bénin': 'benin',
+    'shqipëria': 'albania',
+    'republic-of-macedonia': 'north macedonia',
+    'северна македония': 'north macedonia',
+    'албания': 'albania',
+    'белгија': 'belgium',
+    'democratic-republic-of-the-congo': 'democratic republic of the congo',
+    'ghana': 'ghana',
+    'europese unie': 'europe',
+    'volksrepubliek china': 'china',
+    'united-arab-emirates': 'united arab emirates',
+    'arménia': 'armenia',
+    'norvegia': 'norway',
+    'nový zéland': 'new zealand',
+    'portugali': 'portugal',
+    'albânia': 'albania',
+    'ierland': 'ireland',
+    'poľsko': 'poland',
+    'nyderlandai': 'netherlands',
+    'central african republic': 'central african republic',
+    'algieria': 'algeria',
+    'bośnia i hercegowina': 'bosnia and herzegovina',
+    'chorwacja': 'croatia',
+    'rosja': 'russia',
+    'benin': 'benin',
+    'spanish': 'spain', 
+    'fr': 'france', 
+    "people's republic of china": 'china', 
+    'es': 'spain',
+    'america': "united states",
+    'ca': 'canada', 
+    'be': 'belgium', 
+    'iraqi kurdistan': 'irak', 
+    'turks and caicos islands': 'turkey',
+    'indian subcontinent': 'india', 
+    'san marino': 'italy', 
+    'sicily': 'italy',
+    'all countries': 'world',
+    'vatican city': 'italy',
+    'sudáfrica': 'south africa',
+    'áfrica do sul': 'south africa',
+    'benín': 'benin',
+    'belçika': 'belgium',
+    'i̇sviçre': 'switzerland',
+    'кот д\'ивоар': 'ivory coast',
+    'кувейт': 'kuwait',
+    'люксембург': 'luxembourg',
+    'paquistão': 'pakistan',
+    'gibraltar': 'united kingdom',
+    'iraque': 'iraq',
+    'nemčija': 'germany',
+    'grčija': 'greece',
+    'luksemburg': 'luxembourg',
+    'španija': 'spain',
+    'monténégro': 'montenegro',
+    'kenya': 'kenya',
+    'portugalia': 'portugal',
+    'azerbaïdjan': 'azerbaijan',
+    'malte': 'malta',
+    'kroatia': 'croatia',
+    'sveits': 'switzerland',
+    'guinea': 'united states',
+    'հայաստան': 'armenia',
+    'estonsko': 'estonia',
+    'kuwejt': 'kuwait',
+    'bulgaaria': 'bulgaria',
+    'rumeenia': 'romania',
+    'словенија': 'slovenia',
+    'thajsko': 'thailand',
+    'สาธารณรัฐเช็ก': 'czech republic',
+    'ประเทศสโลวาเกีย': 'slovakia',
+    'мађарска': 'hungary',
+    'namibia': 'namibia',
+    'niger': 'niger',
+    'namibie': 'namibia',
+    'sudafrica': 'south africa',
+    'botswana': 'botswana',
+    'tanzania': 'tanzania',
+    'algerie': 'algeria',
+    'republic of the congo': 'republic of the congo',
+    'république centrafricaine': 'central african republic',
+    'guinée équatoriale': 'united states',
+    'wybrzeże kości słoniowej': 'ivory coast',
+    'costa d\'avorio': 'ivory coast',
+    'tunezja': 'tunisia',
+    'tunesië': 'tunisia',
+    'brunei': 'brunei',
+    'مصر': 'egypt',
+    'ایالات متحده آمریکا': 'united states',
+    'soomaaliya': 'somalia',
+    'katar': 'qatar',
+    'سوريا': 'syria',
+    'اليمن': 'yemen',
+    'yemen': 'yemen',
+    'venäjä': 'russia',
+    'finsko': 'finland',
+    'viro': 'estonia',
+    'salvador': 'el salvador',
+    '英国': 'united kingdom',
+    'turquía': 'turkey',
+    'bosnia y herzegovina': 'bosnia and herzegovina',
+    'bósnia e herzegovina': 'bosnia and herzegovina',
+    'turquia': 'turkey',
+    'irlanti': 'ireland',
+    'ruoŧŧa': 'sweden',
+    'sri-lanka': 'sri lanka',
+    'se': 'sweden',
+    'an fhraing': 'france',
+    'a\' ghearmailt': 'germany',
+    'poblachd na h-èireann': 'ireland',
+    'an rìoghachd aonaichte': 'united kingdom',
+    'dominican-republic': 'dominican republic',
+    'messico': 'mexico',
+    'indien': 'india',
+    'benelux': 'benelux',
+    'new-zealand': 'new zealand',
+    'فرانس': 'france',
+    'جمہوریہ آئرستان': 'ireland',
+    'پاکستان': 'pakistan',
+    'ریاستہائے متحدہ آمریکا': 'united states',
+    'република македонија': 'north macedonia',
+    'la-reunion': 'reunion',
+    'portugalsko': 'portugal',
+    'kolumbien': 'colombia',
+    'mauritania': 'mauritania',
+    'isle of man': 'united kingdom',
+    'haití': 'haiti',
+    'cile': 'chile',
+    'équateur': 'ecuador',
+    'brasilien': 'brazil',
+    'br': 'brazil',
+    'írán': 'iran',
+    'צרפת': 'france',
+    'איטליה': 'italy',
+    'principato di monaco': 'monaco',
+    'repubblica ceca': 'czech republic',
+    'letónia': 'latvia',
+    'guadalupa': 'reunion',
+    'cipro': 'cyprus',
+    'macedonia del norte': 'north macedonia',
+    'finska': 'finland',
+    'algerije': 'algeria',
+    'spanyolország': 'hungary',
+    'dánmárku': 'denmark',
+    'βέλγιο': 'belgium',
+    'guiana francesa': 'french guiana',
+    'polinésia francesa': 'french polynesia',
+    'jordânia': 'jordan',
+    'north korea': 'north korea',
+    'ประเทศจีน': 'china',
+    'islândia': 'iceland',
+    'zuid-afrika': 'south africa',
+    'letonia': 'latvia',
+    'república democrática del congo': 'democratic republic of the congo',
+    'santoña': 'spain',
+    'cantabria': 'spain',
+    'france spain': 'france',
+    'costa do marfim': 'ivory coast',
+    'túnez': 'tunisia',
+    'португалия': 'portugal',
+    'tunesien': 'tunisia',
+    'угорщина': 'hungary',
+    'італія': 'italy',
+    'іспанія': 'spain',
+    'марокко': 'morocco',
+    'mónaco': 'monaco',
+    'jordania': 'jordan',
+    'cabo verde': 'cape verde',
+    'franca': 'france',
+    'ισπανία': 'spain',
+    'arábia saudita': 'saudi arabia',
+    'andora': 'andorra',
+    'maldives': 'maldives',
+    'tunisko': 'tunisia',
+    'martinik': 'martinique',
+    'bosnia-and-herzegovina': 'bosnia and herzegovina',
+    'швајцарска': 'switzerland',
+    'bosnie-herzégovine': 'bosnia and herzegovina',
+    'кипар': 'cyprus',
+    'türkei': 'turkey',
+    'تركيا': 'turkey',
+    'amerika birleşik devletleri': 'united states',
+    'řecko': 'greece',
+    'royaume uni': 'united kingdom',
+    'cz': 'czech republic',
+    'singapura': 'singapore',
+    'frankriika': 'france',
+    'nuova zelanda': 'new zealand',
+    'kroatië': 'croatia',
+    'elfenbeinküste': 'ivory coast',
+    'philippinen': 'philippines',
+    'palestinian territories': 'palestine',
+    'índia': 'india',
+    'nova caledónia': 'australia',
+    'moldavsko': 'moldova',
+    'slovinsko': 'slovenia',
+    '프랑스': 'france',
+    '독일': 'germany',
+    'filipini': 'philippines',
+    'južna koreja': 'south korea',
+    'zuid-korea': 'south korea',
+    'corea del sud': 'south korea',
+    '캐나다': 'canada',
+    '네덜란드': 'netherlands',
+    'tšekki': 'czech republic',
+    'cambogia': 'cambodia',
+    'saudi-arabia': 'saudi arabia',
+    'laos': 'laos',
+    'соединённые штаты америки': 'united states',
+    'ประเทศกัมพูชา': 'cambodia',
+    'kamerun': 'cameroon',
+    'ประเทศอินโดนีเซีย': 'indonesia',
+    'timor-leste': 'timor-leste',
+    'wereld': 'world',
+    'fiji': 'fiji',
+    'ประเทศแคนาดา': 'canada',
+    'ประเทศสิงคโปร์': 'singapore',
+    'bangladés': 'bangladesh',
+    'nepal': 'nepal',
+    'pháp': 'france',
+    'việt nam': 'vietnam',
+    'irán': 'iran',
+    'kirgisistan': 'kyrgyzstan',
+    'bosnien und herzegowina': 'bosnia and herzegovina',
+    'albánie': 'albania',
+    'francia': 'france',
+    'bosna a hercegovina': 'bosnia and herzegovina',
+    'saúdská arábie': 'saudi arabia',
+    'evropska unija': 'europe',
+    '澳大利亚': 'australia',
+    'wallis and futuna': 'wallis and futuna',
+    'البحرين': 'bahrain',
+    'cook islands': 'cook islands',
+    'fidji': 'fiji',
+    'malaisie': 'malaysia',
+    'anguilla': 'anguilla',
+    'montserrat': 'montserrat',
+    'габон': 'gabon',
+    'almanya': 'germany',
+    'スイス': 'switzerland',
+    'فرانسه': 'france',
+    'ایران': 'iran',
+    'baréin': 'bahrain',
+    'fas': 'morocco',
+    'népal': 'nepal',
+    'ประเทศโกตดิวัวร์': 'ivory coast',
+    'saint lucia': 'saint lucia',
+    'regatul unit al marii britanii și al irlandei de nord': 'united kingdom',
+    'somalia': 'somalia',
+    'rwanda': 'rwanda',
+    'sierra leone': 'sierra leone',
+    'nijer': 'niger',
+    'brasile': 'brazil',
+    'cehia': 'czech republic',
+    'slovacia': 'slovakia',
+    'ue': 'europe',
+    'demokratická republika kongo': 'democratic republic of the congo',
+    'nova kaledonien': 'australia',
+    'jugoslavija': 'yugoslavia',
+    'canadà': 'canada',
+    'turcia': 'turkey',
+    'polynésie francaise': 'french polynesia',
+    'бельгія': 'belgium',
+    'francjia': 'france',
+    'antigua and barbuda': 'antigua and barbuda',
+    'trinidad y tobago': 'trinidad and tobago',
+    'republic of ireland': 'ireland',
+    'frantsa': 'france',
+    'γουαδελούπη': 'reunion',
+    'كوت ديفوار': 'ivory coast',
+    'cina': 'china',
+    'statele unite ale americii': 'united states',
+    'hu': 'hungary',
+    'словения': 'slovenia',
+    'nieuw-caledonië': 'australia',
+    'algéria': 'algeria',
+    'marokkó': 'morocco',
+    'république de macédoine': 'north macedonia',
+    'macao': 'macau',
+    'греция': 'greece',
+    'lesotho': 'lesotho',
+    'libanon': 'lebanon',
+    'palästinensische autonomiegebiete': 'palestine',
+    'vereinigte arabische emirate': 'united arab emirates',
+    'dz': 'algeria',
+    'pf': 'french polynesia',
+    'bg': 'bulgaria',
+    'mo': 'macau',
+    'sa': 'saudi arabia',
+    'gn': 'united states',
+    've': 'venezuela',
+    'pe': 'peru',
+    'th': 'thailand',
+    'cl': 'chile',
+    'nz': 'new zealand',
+    'in': 'india',
+    'au': 'australia',
+    'id': 'indonesia',
+    'gr': 'greece',
+    'co': 'colombia',
+    'ro': 'romania',
+    'hk': 'hong kong',
+    'rs': 'serbia',
+    'dk': 'denmark',
+    'ae': 'united arab emirates',
+    'sc': 'seychelles',
+    'middle east': 'middle east',
+    'kasachstan': 'kazakhstan',
+    'tn': 'tunisia',
+    'ci': 'ivory coast',
+    'kw': 'kuwait',
+    'pt': 'portugal',
+    'ar': 'argentina',
+    'tw': 'taiwan',
+    'ga': 'gabon',
+    'tg': 'togo',
+    'bh': 'bahrain',
+    'pk': 'pakistan',
+    'pa': 'panama',
+    'etats-unis': 'united states',
+    'mu': 'mauritius',
+    'faroe islands': 'denmark',
+    'ht': 'haiti',
+    'ドイツ': 'germany',
+    'za': 'south africa',
+    'fi': 'finland',
+    'litvánia': 'lithuania',
+    'ua': 'ukraine',
+    'il': 'israel',
+    'si': 'slovenia',
+    'sk': 'slovakia',
+    'south-africa': 'south africa',
+    'east-germany': 'germany',
+    'tr': 'turkey',
+    'pl': 'poland',
+    'mk': 'north macedonia',
+    'île maurice': 'mauritius',
+    'pr': 'puerto rico',
+    'ne': 'niger',
+    'cr': 'costa rica',
+    'my': 'malaysia',
+    'bj': 'benin',
+    'ec': 'ecuador',
+    'mt': 'malta',
+    'vn': 'vietnam',
+    'ba': 'bosnia and herzegovina',
+    'qa': 'qatar',
+    'by': 'belarus',
+    'gd': 'grenada',
+    'mx': 'mexico',
+    'eg': 'egypt',
+    'eu': 'europe',
+    'cm': 'cameroon',
+    'ng': 'nigeria',
+    'ml': 'mali',
+    'om': 'oman',
+    'gt': 'guatemala',
+    'grenada': 'grenada',
+    'thaimaa': 'thailand',
+    'lt': 'lithuania',
+    'mr': 'mauritania',
+    'papua new guinea': 'united states',
+    'białoruś': 'belarus',
+    'ph': 'philippines',
+    'itàlia': 'italy',
+    'u.s.a': 'united states',
+    'sv': 'el salvador',
+    'kz': 'kazakhstan',
+    'lv': 'latvia',
+    'cg': 'congo',
+    'arabia saudyjska': 'saudi arabia',
+    'turcja': 'turkey',
+    'saint martin': 'france',
+    'bf': 'burkina faso',
+    'bd': 'bangladesh',
+    'gh': 'ghana',
+    'mz': 'mozambique',
+    'al': 'albania',
+    'uz': 'uzbekistan',
+    'pm': 'saint pierre and miquelon',
+    'gy': 'guyana',
+    'dj': 'djibouti',
+    'uy': 'uruguay',
+    'cd': 'democratic republic of the congo',
+    'sowjetunion': 'soviet union',
+    'frantzia': 'france',
+    'espainia': 'spain',
+    'mg': 'madagascar',
+    'ke': 'kenya',
+    'uae': 'united arab emirates',
+    'td': 'chad',
+    'méxico españa': 'mexico spain',
+    'az': 'azerbaijan',
+    'norveška': 'norway',
+    'republik kongo': 'republic of the congo',
+    'np': 'nepal',
+    'gi': 'gibraltar',
+    'ad': 'andorra',
+    'yugoslavia': 'serbia',
+    'porto rico': 'puerto rico',
+    'czechia': 'czech republic',
+    'kr': 'south korea',
+    'md': 'moldova',
+    'ประเทศนิวซีแลนด์': 'new zealand',
+    'абхазия': 'abkhazia',
+    'zimbabwe': 'zimbabwe',
+    'mc': 'monaco',
+    'република ирландия': 'republic of ireland',
+    'lr': 'liberia',
+    'yt': 'mayotte',
+    'cy': 'cyprus',
+    'nowa kaledonia': 'australia',
+    'je': 'jersey',
+    'gg': 'guernsey',
+    'hashemite kingdom of jordan': 'jordan',
+    'lëtzebuerg (land)': 'luxembourg',
+    'santona': 'saint',
+    'هولندا': 'netherlands',
+    'congo': 'congo',
+    'ivory coast': 'cote d\'ivoire',
+    'norsko': 'norway',
+    'lc': 'saint lucia',
+    'macedonia': 'north macedonia',
+    'emirados árabes unidos': 'united arab emirates',
+    'tajlandia': 'thailand',
+    'me': 'montenegro',
+    'america': 'united states',
+    'wf': 'wallis and futuna',
+    'do': 'dominican republic',
+    'united-states-of-america': 'united states',
+    'indonesië': 'indonesia',
+    'maleisië': 'malaysia',
+    'filipijnen': 'philippines',
+    'republika chińska': 'china',
+    'ge': 'georgia',
+    'croazia': 'croatia',
+    'uniunea europeană': 'europe',
+    'evropská unie': 'europe',
+    'cape verde': 'cape verde',
+    'szlovénia': 'slovenia',
+    '++': 'unknown',
+    'kolumbia': 'colombia',
+    'タイ王国': 'thailand',
+    'grekland': 'greece',
+    'polinesia perancis': 'french polynesia',
+    'libano': 'lebanon',
+    'usbekistan': 'uzbekistan',
+    'tadschikistan': 'tajikistan',
+    'weißrussland': 'belarus',
+    'republic-of-the-congo': 'republic of the congo',
+    'ky': 'cayman islands',
+    'republic of lithuania': 'lithuania',
+    'توغو': 'togo',
+    'is': 'iceland',
+    'bhutan': 'bhutan',
+    'paraguai': 'paraguay',
+    'uruguai': 'uruguay',
+    'it:..': 'italy',
+    'am': 'armenia',
+    '荷蘭': 'netherlands',
+    'japāna': 'japan',
+    'japonija': 'japan',
+    'ir': 'iran',
+    'izrael': 'israel',
+    'py': 'paraguay',
+    'cu': 'cuba',
+    'yu': 'serbia',
+    'ประเทศตุรกี': 'turkey',
+    'netherlands france': 'france',
+    'ägypten': 'egypt',
+    'lk': 'sri lanka',
+    'турция': 'turkey',
+    'palestine': 'palestine',
+    'wyspy owcze': 'faroe islands',
+    'остров рождества': 'christmas island',
+    'hr': 'croatia',
+    'état unis': 'united states',
+    'jo': 'jordan',
+    'iq': 'iraq',
+    'ni': 'nicaragua',
+    'パキスタン': 'pakistan',
+    '中国': 'china',
+    'american samoa': 'american samoa',
+    'mm': 'myanmar',
+    'cv': 'cape verde',
+    'словакия': 'slovakia',
+    'km': 'comoros',
+    'syrie': 'syria',
+    'kambodscha': 'cambodia',
+    'la': 'laos',
+    'bn': 'brunei',
+    'south america': 'south america',
+    'turkije': 'turkey',
+    'surinam': 'suriname',
+    'ukrajina': 'ukraine',
+    'vu': 'vanuatu',
+    'filipinas': 'philippines',
+    'm': 'unknown',
+    'cypr': 'cyprus',
+    'république démocratique allemande': 'german democratic republic',
+    'tunis': 'tunisia',
+    'естония': 'estonia',
+    'storbritannia': 'united kingdom',
+    'tz': 'tanzania',
+    'cw': 'curaçao',
+    'bosnia': 'bosnia and herzegovina',
+    'thailandia': 'thailand',
+    'fo': 'faroe islands',
+    'lenkija': 'poland',
+    'ee': 'estonia',
+    'costa-rica': 'costa rica',
+    'republic of moldova': 'moldova',
+    'na': 'namibia',
+    'объединённые арабские эмираты': 'united arab emirates',
+    'unione europea': 'europe',
+    'beļģija': 'belgium',
+    'caribisch nederland': 'caribbean netherlands',
+    'south-korea': 'south korea',
+    'el-salvador': 'el salvador',
+    'spánia': 'spain',
+    'الكاميرون': 'cameroon',
+    'santa lucía': 'saint lucia',
+    'romanya': 'romania',
+    'i̇spanya': 'spain',
+    'reino-unido': 'united kingdom',
+    'curazao': 'curaçao',
+    'узбекистан': 'uzbekistan',
+    'guayana francesa': 'french guiana',
+    'mv': 'maldives',
+    'bosznia-hercegovina': 'bosnia and herzegovina',
+    'észtország': 'estonia',
+    'jm': 'jamaica',
+    'et': 'ethiopia',
+    'ao': 'angola',
+    'sint maarten': 'sint maarten',
+    'bulgarija': 'bulgaria',
+    'chad': 'chad',
+    'cezayir': 'algeria',
+    'suopma': 'finland',
+    'iraqi kurdistan': 'iraq',
+    '---': 'unknown',
+    'egipto': 'egypt',
+    'caribbean netherlands': 'caribbean netherlands',
+    'fr €': 'france',
+    'zambia': 'zambia',
+    'bs': 'bahamas',
+    'cf': 'central african republic',
+    'uganda': 'uganda',
+    'sr': 'suriname',
+    'gq': 'united states',
+    'guinea ecuatorial': 'united states',
+    'bb': 'barbados',
+    '西班牙': 'spain',
+    'san martín': 'saint martin',
+    'san vicente y las granadinas': 'saint vincent and the grenadines',
+    'sx': 'sint maarten',
+    'argentyna': 'argentina',
+    'ukraina': 'ukraine',
+    'san marino': 'san marino',
+    'arabia saudită': 'saudi arabia',
+    'polinesia francese': 'french polynesia',
+    'ประเทศเม็กซิโก': 'mexico',
+    'pobřeží slonoviny': 'ivory coast',
+    'spojené arabské emiráty': 'united arab emirates',
+    'gabun': 'gabon',
+    'österrike': 'austria',
+    'argentina - español': 'argentina',
+    'armenia - pyсский': 'armenia',
+    'aruba - español': 'aruba',
+    'asia pacific': 'asia',
+    'australia - english': 'australia',
+    'austria - deutsch': 'austria',
+    'azerbaijan - русский': 'azerbaijan',
+    'belarus - pyсский': 'belarus',
+    'belgium - français': 'belgium',
+    'belgium - nederlands': 'belgium',
+    'bolivia - español': 'bolivia',
+    'bosnia i hercegovina - bosnian': 'bosnia and herzegovina',
+    'botswana - english': 'botswana',
+    'brazil - português': 'brazil',
+    'bulgaria - български': 'bulgaria',
+    'cambodia - english': 'cambodia',
+    'cambodia - ភាសាខ្មែរ': 'cambodia',
+    'canada - english': 'canada',
+    'canada - français': 'canada',
+    'chile - español': 'chile',
+    'china - 中文': 'china',
+    'colombia - español': 'colombia',
+    'costa rica - español': 'costa rica',
+    'croatia - hrvatski': 'croatia',
+    'cyprus - ελληνικά': 'cyprus',
+    'czech republic - čeština': 'czech republic',
+    'denmark - dansk': 'denmark',
+    'ecuador - español': 'ecuador',
+    'el salvador - español': 'el salvador',
+    'estonia - eesti': 'estonia',
+    'europe': 'europe',
+    'finland - suomi': 'finland',
+    'france - français': 'france',
+    'georgia - ქართული': 'georgia',
+    'germany - deutsch': 'germany',
+    'ghana - english': 'ghana',
+    'greece - ελληνικά': 'greece',
+    'guatemala - español': 'guatemala',
+    'honduras - español': 'honduras',
+    'hong kong - 粵語': 'hong kong',
+    'hungary - magyar': 'hungary',
+    'iceland - íslenska': 'iceland',
+    'india - english': 'india',
+    'indonesia - bahasa indonesia': 'indonesia',
+    'ireland - english': 'ireland',
+    'israel - עברית': 'israel',
+    'italy - italiano': 'italy',
+    'jamaica - english': 'jamaica',
+    'japan - 日本語': 'japan',
+    'kazakhstan - pyсский': 'kazakhstan',
+    'korea - 한국어': 'south korea',
+    'kyrgyzstan - русский': 'kyrgyzstan',
+    'latvia - latviešu': 'latvia',
+    'lebanon - english': 'lebanon',
+    'lesotho - english': 'lesotho',
+    'lithuania - lietuvių': 'lithuania',
+    'macau - 中文': 'macau',
+    'malaysia - bahasa melayu': 'malaysia',
+    'malaysia - english': 'malaysia',
+    'malaysia - 中文': 'malaysia',
+    'mexico - español': 'mexico',
+    'middle east & africa': 'middle east and africa',
+    'moldova - român': 'moldova',
+    'mongolia - монгол хэл': 'mongolia',
+    'namibia - english': 'namibia',
+    'netherlands - nederlands': 'netherlands',
+    'new zealand - english': 'new zealand',
+    'nicaragua - español': 'nicaragua',
+    'north macedonia - македонски јазик': 'north macedonia',
+    'norway - norsk': 'norway',
+    'panamá - español': 'panama',
+    'paraguay - español': 'paraguay',
+    'perú - español': 'peru',
+    'philippines - english': 'philippines',
+    'poland - polski': 'poland',
+    'portugal - português': 'portugal',
+    'puerto rico - español': 'puerto rico',
+    'república dominicana - español': 'dominican republic',
+    'romania - română': 'romania',
+    'russia - русский': 'russia',
+    'serbia - srpski': 'serbia',
+    'singapore - english': 'singapore',
+    'slovak republic - slovenčina': 'slovakia',
+    'slovenia - slovene': 'slovenia',
+    'south africa -english': 'south africa',
+    'spain - español': 'spain',
+    'swaziland - english': 'eswatini',
+    'sweden - svenska': 'sweden',
+    'switzerland - deutsch': 'switzerland',
+    'switzerland - français': 'switzerland',
+    'taiwan - 中文': 'taiwan',
+    'thailand - ไทย': 'thailand',
+    'trinidad & tobago - english': 'trinidad and tobago',
+    'turkey - türkçe': 'turkey',
+    'ukraine - yкраї́нська': 'ukraine',
+    'united kingdom - english': 'united kingdom',
+    'united states - english': 'united states',
+    'united states - español': 'united states',
+    'uruguay - español': 'uruguay',
+    'venezuela - español': 'venezuela',
+    'vietnam - tiếng việt': 'vietnam',
+    'zambia - english': 'zambia',
+    'mongolei': 'mongolia',
+    'xk': 'kosovo',
+    'zentralafrikanische republik': 'central african republic',
+    'latinoamerica': 'latin america',
+    'bermuda': 'bermuda',
+    'zm': 'zambia',
+    'pakistán': 'pakistan',
+    '5018 rue harwood': 'canada',
+    'allemagne nazi': 'germany',
+    'шпанија': 'spain',
+    'london': 'united kingdom',
+    'slovenië': 'slovenia',
+    'bhoutan': 'bhutan',
+    'madagascar - toamasina': 'madagascar',
+    'madžarska': 'hungary',
+    'maurícia': 'mauritius',
+    'tailândia': 'thailand',
+    'ly': 'libya',
+    'ベルギー': 'belgium',
+    'camerún': 'cameroon',
+    'gambia': 'gambia',
+    'united states minor outlying islands': 'united states',
+    'írország': 'ireland',
+    'литва': 'lithuania',
+    'itävalta': 'austria',
+    'malasia': 'malaysia',
+    'birmanie': 'myanmar',
+    'camerun': 'cameroon',
+    'liberia': 'liberia',
+    'السنغال': 'senegal',
+    'bahamas': 'bahamas',
+    'américa': 'america',
+    'belleville wa': 'united states',
+    'kazachstan': 'kazakhstan',
+    'ps': 'palestine',
+    'tt': 'trinidad and tobago',
+    'ethiopia': 'ethiopia',
+    'الاتحاد الأوروبي': 'europe',
+    'ryssland': 'russia',
+    'îles cook': 'cook islands',
+    'fj': 'fiji',
+    'カナダ': 'canada',
+    'уједињено краљевство': 'united kingdom',
+    'サウジアラビア': 'saudi arabia',
+    'černá hora': 'montenegro',
+    'coreia do sul': 'south korea',
+    'chorvátsko': 'croatia',
+    'malezja': 'malaysia',
+    'либия': 'libya',
+    'liettua': 'lithuania',
+    'oroszország': 'hungary',
+    'lux': 'luxembourg',
+    'hn': 'honduras',
+    'libia': 'libya',
+    'brazylia': 'brazil',
+    'korean tasavalta': 'south korea',
+    'northern mariana islands': 'united states',
+    'puerto-rico': 'united states',
+    'ahvenanmaan maakunta': 'aland islands',
+    'moldávia': 'moldova',
+    'state of palestine': 'palestine',
+    'unknown': 'unknown',
+    'イタリア': 'italy',
+    'azərbaycan': 'azerbaijan',
+    'virgin-islands-of-the-united-states': 'united states',
+    'čekija': 'czech republic',
+    'suedia': 'sweden',
+    'guam': 'united states',
+    'bq': 'bonaire',
+    'france.': 'france',
+    'bm': 'bermuda',
+    'sudan': 'sudan',
+    'yémen': 'yemen',
+    'north-macedonia': 'north macedonia',
+    'belize': 'belize',
+    'モロッコ': 'morocco',
+    'egito': 'egypt',
+    'السودان': 'sudan',
+    'u.s.a.': 'united states',
+    'pw': 'palau',
+    'sambia': 'zambia',
+    'ameriketako estatu batuak': 'united states',
+    'soudan': 'sudan',
+    'airija': 'ireland',
+    '.': 'unknown',
+    'bw': 'botswana',
+    'equatorial guinea': 'united states',
+    'кипър': 'cyprus',
+    'camboya': 'cambodia',
+    'ss': 'south sudan',
+    'gu': 'guam',
+    'ai': 'anguilla',
+    'meksiko': 'mexico',
+    'saint vincent and the grenadines': 'saint vincent and the grenadines',
+    'китайская народная республика': 'china',
+    'オーストラリア': 'australia',
+    'γερμανία': 'germany',
+    'stato di palestina': 'palestine',
+    'prepared for siwin foods edmonton alberta t6b 3v2': 'canada',
+    'sierra-leone': 'sierra leone',
+    'maldive': 'maldives',
+    'pg': 'united states',
+    'united states of america': 'united states',
+    'monako': 'monaco',
+    'finlanda': 'finland',
+    'česká republika': 'czech republic',
+    'mn': 'mongolia',
+    'ευρωπαϊκή ένωση': 'europe',
+    'greenland': 'denmark',
+    'er': 'eritrea',
+    'обединени арабски емирства': 'united arab emirates',
+    'ルクセンブルク': 'luxembourg',
+    'アイルランド': 'ireland',
+    'ニュージーランド': 'new zealand',
+    'severní makedonie': 'north macedonia',
+    'ليتوانيا': 'lithuania',
+    'cipar': 'cyprus',
+    'sm': 'san marino',
+    'tunézia': 'tunisia',
+    'repubblica dominicana': 'dominican republic',
+    'colômbia': 'colombia',
+    'aw': 'aruba',
+    'sao tomé and príncipe': 'sao tome and principe',
+    'যুক্তরাজ্য': 'united kingdom',
+    'comoros': 'comoros',
+    'germa': 'germany',
+    'moldawien': 'moldova',
+    'малта': 'malta',
+    'hellas': 'greece',
+    'ug': 'uganda',
+    'ニューカレドニア': 'australia',
+    'aland-islands': 'aland islands',
+    'vi': 'united states virgin islands',
+    'rw': 'rwanda',
+    'sardinia': 'italy',
+    'японія': 'japan',
+    'mannin': 'isle of man',
+    'reeriaght unnaneysit': 'united kingdom',
+    'republica mexicana': 'mexico',
+    'republika południowej afryki': 'south africa',
+    'georgien': 'georgia',
+    '南アフリカ共和国': 'south africa',
+    'espagnol': 'spanish',
+    'ye': 'yemen',
+    'vatican city': 'vatican city',
+    'indonesien': 'indonesia',
+    'kn': 'saint kitts and nevis',
+    'bo': 'bolivia',
+    'en: españa': 'spain',
+    'северна македонија': 'north macedonia',
+    'албанија': 'albania',
+    'sy': 'syria',
+    'im': 'isle of man',
+    'beyaz rusya': 'belarus',
+    'nowa zelandia': 'new zealand',
+    'المجر': 'hungary',
+    'norga': 'norway',
+    'tjeckien': 'czech republic',
+    'eeuu': 'united states',
+    'birmania': 'myanmar',
+    'македонија': 'north macedonia',
+    'sd': 'sudan',
+    'ливан': 'lebanon',
+    'tasty foods αβγε': 'greece',
+    'камерун': 'cameroon',
+    'монгол улс': 'mongolia',
+    'mp': 'northern mariana islands',
+    'so': 'somalia',
+    'русия': 'russia',
+    '::': 'unknown',
+    'イラク': 'iraq',
+    'macedonia de nord': 'north macedonia',
+    'líbia': 'libya',
+    'japani': 'japan',
+    'vg': 'british virgin islands',
+    'ag': 'antigua and barbuda',
+    '中華人民共和国': 'people\'s republic of china',
+    'turkiye': 'turkey',
+    'ประเทศญี่ปุ่น': 'japan',
+    'indian subcontinent': 'indian subcontinent',
+    'エルサルバドル': 'el salvador',
+    'emirati arabi uniti': 'united arab emirates',
+    'saint-marin': 'san marino',
+    'british virgin islands': 'british virgin islands',
+    'tjekkiet': 'czech republic',
+    '意大利': 'italy',
+    'tonga': 'tonga',
+    'obala bjelokosti': 'ivory coast',
+    'wietnam': 'vietnam',
+    'jamaïque': 'jamaica',
+    'turks and caicos islands': 'turks and caicos islands',
+    'moçambique': 'mozambique',
+    'cc': 'cocos (keeling) islands',
+    'filipiny': 'philippines',
+    'kurdistan irakien': 'iraqi kurdistan',
+    'va': 'vatican city',
+    'servië': 'serbia',
+    '沙特阿拉伯': 'saudi arabia',
+    'zw': 'zimbabwe',
+    'mondo': 'world',
+    'macedonia del nord': 'north macedonia',
+    'sl': 'sierra leone',
+    'moldavië': 'moldova',
+    'нидерланды': 'netherlands',
+    'kp': 'north korea',
+    'iirimaa': 'ireland',
+    'egitto': 'egypt',
+    'islanti': 'iceland',
+    'na stàitean aonaichte': 'united states',
+    'bz': 'belize',
+    'belice': 'belize',
+    'bi': 'burundi',
+    'bellingham wa usa': 'united states',
+    'as': 'american samoa',
+    'الاردن': 'jordan',
+    'dm': 'dominica',
+    'ken': 'kenya',
+    'アラブ首長国連邦': 'united arab emirates',
+    'nyl': 'unknown',
+    'samoa': 'samoa',
+    'wit-rusland': 'belarus',
+    'txekia': 'czech republic',
+    'luxenburgo': 'luxembourg',
+    'индия': 'india',
+    'brazil france': 'france',
+    'dél-korea': 'south korea',
+    'bermudas': 'bermuda',
+    'īrija': 'ireland',
+    'coquitlam bc': 'canada',
+    'salwador': 'el salvador',
+    'amerika syarikat': 'united states',
+    'جميع البلدان': 'all countries',
+    'киргизия': 'kyrgyzstan',
+    'kuba': 'cuba',
+    'bih': 'bosnia and herzegovina',
+    'аржентина': 'argentina',
+    'молдова': 'moldova',
+    'indie': 'india',
+    'omán': 'oman',
+    'sudán del sur': 'south sudan',
+    'украйна': 'ukraine',
+    'дания': 'denmark',
+    'جنوب أفريقيا': 'south africa',
+    'japonsko': 'japan',
+    'армения': 'armenia',
+    'gm': 'gambia',
+    'fiyi': 'fiji',
+    'st': 'são tomé and príncipe',
+    'slov': 'unknown',
+    'šveice': 'switzerland',
+    'デンマーク': 'denmark',
+    'albanië': 'albania',
+    'tc': 'turks and caicos islands',
+    'الهند': 'india',
+    'maldivas': 'maldives',
+    'შვეიცარია': 'switzerland',
+    'ශ් රී ලංකාව': 'sri lanka',
+    'roemenie': 'romania',
+    'russian federation': 'russia',
+    'jordánsko': 'jordan',
+    'ভুটান': 'bhutan',
+    'ভারত': 'india',
+    'নেপাল': 'nepal',
+    'মার্কিন যুক্তরাষ্ট্র': 'united states',
+    'mw': 'malawi',
+    'y deyrnas unedig': 'united kingdom',
+    'ck': 'cook islands',
+    'монголия': 'mongolia',
+    'territorios palestinos': 'palestine',
+    'giappone': 'japan',
+    'ประเทศซาอุดีอาระเบีย': 'saudi arabia',
+    'éthiopie': 'ethiopia',
+    'эстония': 'estonia',
+    'польша': 'poland',
+    'kıbrıs cumhuriyeti': 'cyprus',
+    'vc': 'saint vincent and the grenadines',
+    'ireland & uk': 'united kingdom',
+    'yhdistyneet arabiemiirikunnat': 'united arab emirates',
+    'chint': 'unknown',
+    'малайзия': 'malaysia',
+    'egipt': 'egypt',
+    'malásia': 'malaysia',
+    'u.s. minor outlying islands': 'united states',
+    'leedu': 'lithuania',
+    'gruusia': 'georgia',
+    'république serbe de bosnie': 'serbia',
+    'япония': 'japan',
+    'romani': 'romania',
+    'afganistán': 'afghanistan',
+    'the-bahamas': 'bahamas',
+    'filippinene': 'philippines',
+    'ôsterreich': 'austria',
+    'spojené kráľovstvo': 'united kingdom',
+    'west africa': 'west africa',
+    'الأراضي الفلسطينية': 'palestine',
+    'νότια αφρική': 'south africa',
+    'tanzanie': 'tanzania',
+    'ประเทศมาเลเซีย': 'malaysia',
+    'jordanië': 'jordan',
+    'vatican': 'vatican city',
+    'sb': 'solomon islands',
+    'sz': 'eswatini',
+    'armenië': 'armenia',
+    'territori palestinesi': 'palestine',
+    'ประเทศฟิลิปปินส์': 'philippines',
+    'bg::bulgaria': 'bulgaria',
+    'läti': 'latvia',
+    'letland': 'latvia',
+    'велика британія': 'ukraine',
+    'тунис': 'tunisia',
+    'bosnië en herzegovina': 'bosnia and herzegovina',
+    'central america': 'central america',
+    'france 🇫🇷': 'france',
+    'urugwaj': 'uruguay',
+    'cocoa horizons': 'unknown',
+    'arab saudi': 'saudi arabia',
+    'british-indian-ocean-territory': 'british indian ocean territory',
+    'ruanda': 'rwanda',
+    'färöer': 'faroe islands',
+    'ijsland': 'iceland',
+    'færøerne': 'faroe islands',
+    'belanda': 'netherlands',
+    'korea selatan': 'south korea',
+    'nouvelle caledonie': 'australia',
+    'northern ireland': 'united kingdom',
+    'wales': 'united kingdom',
+    'antigua-and-barbuda': 'antigua and barbuda',
+    'ouganda': 'uganda',
+    'kroatija': 'croatia',
+    'etiopía': 'ethiopia',
+    'saint-kitts-and-nevis': 'saint kitts and nevis',
+    'nouvelle-aquitaine': 'france',
+    'virazeil': 'france',
+    'quebec': 'canada',
+    'the netherlands': 'netherlands',
+    'japonia': 'japan',
+    'word': 'unknown',
+    'aus': 'australia',
+    'беларусь': 'belarus',
+    'made in the u k (ni)': 'united kingdom',
+    'wa usa': 'united states',
+    'baden': 'germany',
+    'ouzbékistan': 'uzbekistan',
+    'dr congo': 'democratic republic of the congo',
+    'ariège': 'france',
+    'imported by mccormick canada': 'canada',
+    'on canada n6a 4z2': 'canada',
+    'vancouver canada': 'canada',
+    'vancouver bc canada': 'canada',
+    'product of usa. packed in canada. imported by: strong international trading inc. richmond bc | www.siti.ca': 'canada',
+    'rakúsko': 'austria',
+    'norwa': 'norway',
+    '马来西亚': 'malaysia',
+    'natural calm canada 5 idleswift dr. thornhill on l4j 1k6': 'canada',
+    'マダガスカル': 'madagascar',
+    'santo domingo': 'dominican republic',
+    'hoa kỳ': 'united states',
+    'svalbard et jan mayen': 'norway',
+    'europa': 'europe',
+    'corsica': 'france',
+    'الدمام': 'damam',
+    'dubai': 'united arab emirates',
+    'asia': 'asia',
+    'brasill': 'brazil',
+    'sicile': 'sicily',
+    'surrey bc canada': 'canada',
+    'italien': 'italy',
+    'germany': 'germany',
+    'france': 'france',
+    'united states': 'united states',
+    'irlande': 'ireland',
+    'united kingdom': 'united kingdom',
+    'états-unis': 'united states',
+    'canada': 'canada',
+    'suisse': 'switzerland',
+    'schweiz': 'switzerland',
+    'spain': 'spain',
+    'deutschland': 'germany',
+    'slovenia': 'slovenia',
+    'frankreich': 'france',
+    'netherlands': 'netherlands',
+    'switzerland': 'switzerland',
+    'de': 'germany',
+    'italy': 'italy',
+    'romania': 'romania',
+    'españa': 'spain',
+    'australia': 'australia',
+    'world': 'world',
+    'guadeloupe': 'reunion',
+    'república dominicana': 'dominican republic',
+    'estados unidos': 'united states',
+    'nederland': 'netherlands',
+    'bolivia': 'bolivia',
+    'méxico': 'mexico',
+    'new zealand': 'new zealand',
+    'sweden': 'sweden',
+    'alemania': 'germany',
+    'italia': 'italy',
+    'antarctic': 'antarctica',
+    'royaume-uni': 'united kingdom',
+    'belgique': 'belgium',
+    'pays-bas': 'netherlands',
+    'suède': 'sweden',
+    'denemark': 'denmark',
+    'norvège': 'norway',
+    'espagne': 'spain',
+    'pologne': 'poland',
+    'none': np.nan,
+    'inde': 'india',
+    'autriche': 'austria',
+    'espagne': 'spain',
+    'united-kingdom': 'united kingdom',
+    'hongrie': 'hungary',
+    'république tchèque': 'czech republic',
+    'france': 'france',
+    'united-states': 'united states',
+    'république tchèque': 'czech republic',
+    'united-kingdom': 'united kingdom',
+    'thailande': 'thailand',
+    'états-unis': 'united states',
+    'egypte': 'egypt',
+    'états-unis': 'united states',
+    'territoires palestiniens': 'palestine',
+    'irlande': 'ireland',
+    'états-unis': 'united states',
+    'japon': 'japan',
+    'canada': 'canada',
+    'réunion': 'france',
+    'monde': 'world',
+    'france': 'france',
+    'croatie': 'croatia',
+    'irlande': 'ireland',
+    'allemagne': 'germany',
+    'états-unis': 'united states',
+    'suisse': 'switzerland',
+    'taiwan': 'taiwan',
+    'belgique': 'belgium',
+    'luxembourg': 'luxembourg',
+    'argentine': 'argentina',
+    'maroc': 'morocco',
+    'brésil': 'brazil',
+    'belgique': 'belgium',
+    'allemagne': 'germany',
+    'france': 'france',
+    'guatemala': 'guatemala',
+    'australie': 'australia',
+    'mexique': 'mexico',
+    'arabie saoudite': 'saudi arabia',
+    'arabie saoudite': 'saudi arabia',
+    'émirats arabes unis': 'united arab emirates',
+    'irak': 'iraq',
+    'koweït': 'kuwait',
+    'émirats arabes unis': 'united arab emirates',
+    'roumanie': 'romania',
+    'costa rica': 'costa rica',
+    'moldavie': 'moldova',
+    'martinique': 'france',
+    'new caledonia': 'australia',
+    'singapore': 'singapore',
+    'sverige': 'sweden',
+    'usa': 'united states',
+    'polynésie française': 'french polynesia',
+    'french polynesia': 'french polynesia',
+    'at': 'austria',
+    'suiza': 'switzerland',
+    'mexique': 'mexico',
+    'ch': 'switzerland',
+    'panamá': 'panama',
+    'nouvelle-calédonie': 'france',
+    'panama': 'panama',
+    'brazil': 'brazil',
+    'australien': 'australia',
+    'kanada': 'canada',
+    'russia': 'russia',
+    'vereinigtes königreich': 'united kingdom',
+    'países bajos': 'netherlands',
+    'norway': 'norway',
+    'reino unido': 'united kingdom',
+    'monde': 'world',
+    'yhdysvallat': 'united states',
+    'suomi': 'finland',
+    'made in canada from domestic and imported ingredients.': 'canada',
+    'regno unito': 'united kingdom',
+    'finland': 'finland',
+    'ประเทศฝรั่งเศส': 'france',
+    'สหราชอาณาจักร': 'united kingdom',
+    '法国': 'france',
+    '香港': 'hong kong',
+    'hong kong': 'hong kong',
+    'maurice': 'mauritius',
+    'ประเทศไทย (thai)': 'thailand',
+    '中华人民共和国': 'china',
+    'liban': 'lebanon',
+    'philippines': 'philippines',
+    'niederlande': 'netherlands',
+    'belgien': 'belgium',
+    'belgio': 'belgium',
+    'germania': 'germany',
+    'belgia': 'belgium',
+    'sveitsi': 'switzerland',
+    'saksa': 'germany',
+    'ranska': 'france',
+    'espanja': 'spain',
+    'yhdistynyt kuningaskunta': 'united kingdom',
+    'spagna': 'spain',
+    'malaysia': 'malaysia',
+    'guyana': 'guyana',
+    'hungary': 'hungary',
+    'mundo': 'world',
+    'canadá': 'canada',
+    'barbados': 'barbados',
+    '中華民國': 'taiwan',
+    'mexiko': 'mexico',
+    'saint kitts and nevis': 'saint kitts and nevis',
+    'us': 'united states',
+    'haïti': 'haiti',
+    'el salvador': 'el salvador',
+    'china': 'china',
+    'bahreïn': 'bahrain',
+    'italie': 'italy',
+    'serbia': 'serbia',
+    'フランス': 'france',
+    'colombia': 'colombia',
+    'réunion': 'france',
+    'lebanon': 'lebanon',
+    'oman': 'oman',
+    'corée du sud': 'south korea',
+    'trinidad and tobago': 'trinidad and tobago',
+    'sénégal': 'senegal',
+    'γαλλία': 'france',
+    'ελλάδα': 'greece',
+    'greece': 'greece',
+    'niemcy': 'germany',
+    'cuba': 'cuba',
+    'portugal': 'portugal',
+    'kuwait': 'kuwait',
+    'österreich': 'austria',
+    'französisch-polynesien': 'french polynesia',
+    'israël': 'israel',
+    'israel': 'israel',
+    'puerto rico': 'puerto rico',
+    'the bahamas': 'bahamas',
+    'en': 'united kingdom',
+    'polen': 'poland',
+    'schweden': 'sweden',
+    'aruba': 'aruba',
+    'polinesia francesa': 'french polynesia',
+    '美国': 'united states',
+    'uk': 'united kingdom',
+    'angola': 'angola',
+    'bolivie': 'bolivia',
+    'frança': 'france',
+    'maroc': 'morocco',
+    'アメリカ合衆国': 'united states',
+    'noruega': 'norway',
+    'dominican republic': 'dominican republic',
+    'wielka brytania': 'united kingdom',
+    'guinée': 'united states',
+    'jordan': 'jordan',
+    'burkina faso': 'burkina faso',
+    'it': 'italy',
+    'vietnam': 'vietnam',
+    'pakistan': 'pakistan',
+    'العراق': 'iraq',
+    'россия': 'russia',
+    'франция': 'france',
+    'българия': 'bulgaria',
+    'algérie': 'algeria',
+    'saint pierre and miquelon': 'saint pierre and miquelon',
+    'كندا': 'canada',
+    'saint-pierre-et-miquelon': 'saint pierre and miquelon',
+    'ascension island': 'ascension island',
+    'côte d\'ivoire': 'ivory coast',
+    'jan mayen': 'norway',
+    'uruguay': 'uruguay',
+    'lb': 'lebanon',
+    'haiti': 'haiti',
+    '加拿大': 'canada',
+    'new-caledonia': 'france',
+    'gb': 'united kingdom',
+    'england': 'united kingdom',
+    'svizzera': 'switzerland',
+    'bélgica': 'belgium',
+    'russland': 'russia',
+    'mauritius': 'mauritius',
+    'indonésie': 'indonesia',
+    'arménie': 'armenia',
+    '瑞士': 'switzerland',
+    'autriche': 'austria',
+    'grecia': 'greece',
+    'grèce': 'greece',
+    'india': 'india',
+    'poland': 'poland',
+    'curaçao': 'curaçao',
+    'perancis': 'france',
+    'indonesia': 'indonesia',
+    'selandia baru': 'new zealand',
+    'swiss': 'switzerland',
+    'finnland': 'finland',
+    'polska': 'poland',
+    'südkorea': 'south korea',
+    'south africa': 'south africa',
+    'ecuador': 'ecuador',
+    'chile': 'chile',
+    'perú': 'peru',
+    'honduras': 'honduras',
+    'nicaragua': 'nicaragua',
+    'turkey': 'turkey',
+    'arabie saoudite': 'saudi arabia',
+    'spojené státy americké': 'united states',
+    'meksyk': 'mexico',
+    'émirats arabes unis': 'united arab emirates',
+    'croatia': 'croatia',
+    'cambodia': 'cambodia',
+    'neukaledonien': 'france',
+    'republik china': 'china',
+    'spojené království': 'united kingdom',
+    'guernsey': 'guernsey',
+    'mauricio': 'mauritius',
+    'singapour': 'singapore',
+    'european union': 'europe',
+    'jamaica': 'jamaica',
+    'denmark': 'denmark',
+    'luxemburg': 'luxembourg',
+    'hawaii': 'united states',
+    'german democratic republic': 'germany', 
+    'corea del sur': 'south korea',
+    'tunisie': 'tunisia',
+    'soviet union': 'russia', 
+    'algeria': 'algeria',
+    'jordanie': 'jordan',
+    'ประเทศสวิตเซอร์แลนด์': 'switzerland',
+    'fr  €': 'france', 
+    'hongkong': 'hong kong',
+    'verenigde staten van amerika': 'united states',
+    'ηνωμένο βασίλειο': 'united kingdom',
+    'république démocratique du congo': 'democratic republic of the congo',
+    'tunísia': 'tunisia',
+    'togo': 'togo',
+    'qatar': 'qatar',
+    'dinamarca': 'denmark',
+    'guyane': 'french guiana',
+    'union européenne': 'europe',
+    'bulgaria': 'bulgaria',
+    'zjednoczone królestwo': 'united kingdom',
+    'somalía': 'somalia',
+    'unión europea': 'europe',
+    'líbano': 'lebanon',
+    'belgië': 'belgium',
+    'peru': 'peru',
+    'luxemburgo': 'luxembourg',
+    'zwitserland': 'switzerland',
+    'jordanien': 'jordan',
+    'تونس': 'tunisia',
+    'république tchèque': 'czech republic',
+    'românia': 'romania',
+    'saint-pierre und miquelon': 'saint pierre and miquelon',
+    'égypte': 'egypt',
+    'monaco': 'monaco',
+    'cyprus': 'cyprus',
+    'الجزائر': 'algeria',
+    'vezuela': 'venezuela',
+    'finlande': 'finland',
+    '日本': 'japan',
+    'afrique du sud': 'south africa',
+    'cayman islands': 'cayman islands',
+    'الإمارات العربية المتحدة': 'united arab emirates',
+    'irlanda': 'ireland',
+    'paraguay': 'paraguay',
+    'denemarken': 'denmark',
+    'italië': 'italy',
+    'noorwegen': 'norway',
+    'spanje': 'spain',
+    'zweden': 'sweden',
+    'لبنان': 'lebanon',
+    'فرنسا': 'france',
+    'cameroon': 'cameroon',
+    'mongolia': 'mongolia',
+    'irland': 'ireland',
+    'myanmar': 'myanmar',
+    'marruecos': 'morocco',
+    'भारत': 'india',
+    'senegal': 'senegal',
+    'tchad': 'chad',
+    'suriname': 'suriname',
+    'bulgarie': 'bulgaria',
+    'albania': 'albania',
+    'chili': 'chile',
+    'norwegen': 'norway',
+    'cameroun': 'cameroon',
+    'virgin islands of the united states': 'united states',
+    'japón': 'japan',
+    'الولايات المتحدة': 'united states',
+    'bangladesh': 'bangladesh',
+    'australië': 'australia',
+    'nieuw-zeeland': 'new zealand',
+    'slowakije': 'slovakia',
+    'dominica': 'dominica',
+    'méxico': 'mexico',
+    'suecia': 'sweden',
+    'бельгия': 'belgium',
+    'nigeria': 'nigeria',
+    'mađarska': 'hungary',
+    'italija': 'italy',
+    'poljska': 'poland',
+    'japon': 'japan',
+    'বাংলাদেশ': 'bangladesh',
+    'włochy': 'italy',
+    'hiszpania': 'spain',
+    'szwajcaria': 'switzerland',
+    'frankrike': 'france',
+    'lotyšsko': 'latvia',
+    'litva': 'lithuania',
+    'polsko': 'poland',
+    'djibouti': 'djibouti',
+    'dänemark': 'denmark',
+    'tyskland': 'germany',
+    'finlândia': 'finland',
+    'espanha': 'spain',
+    'suécia': 'sweden',
+    'lithuania': 'lithuania',
+    'suíça': 'switzerland',
+    'south korea': 'south korea',
+    'švedska': 'sweden',
+    'německo': 'germany',
+    'islande': 'iceland',
+    'grécia': 'greece',
+    'itália': 'italy',
+    'polónia': 'poland',
+    'hongrie': 'hungary',
+    'serbie': 'serbia',
+    'союз советских социалистических республик': 'ussr',
+    'brésil': 'brazil',
+    'ukraine': 'ukraine',
+    'ísland': 'iceland',
+    'türkiye': 'turkey',
+    'madagascar': 'madagascar',
+    'macau': 'macau',
+    'franța': 'france',
+    'україна': 'ukraine',
+    'latvia': 'latvia',
+    'estonia': 'estonia',
+    'германия': 'germany',
+    'швейцария': 'switzerland',
+    'duitsland': 'germany',
+    'südafrika': 'south africa',
+    'bulharsko': 'bulgaria',
+    'czech-republic': 'czech republic',
+    'nizozemsko': 'netherlands',
+    'austrija': 'austria',
+    'alemanha': 'germany',
+    'áustria': 'austria',
+    'némorszag': 'hungary',
+    'kroatien': 'croatia',
+    'csehország': 'czech republic',
+    'lengyelország': 'poland',
+    'svédország': 'sweden',
+    'rumania': 'romania',
+    'ungarn': 'hungary',
+    'países baixos': 'netherlands',
+    'австрия': 'austria',
+    'финландия': 'finland',
+    'швеция': 'sweden',
+    'bulgarien': 'bulgaria',
+    'tschechien': 'czech republic',
+    'slowakei': 'slovakia',
+    'slowenien': 'slovenia',
+    'lituania': 'lithuania',
+    'испания': 'spain',
+    'república checa': 'czech republic',
+    'marrocos': 'morocco',
+    'полша': 'poland',
+    'румъния': 'romania',
+    'сърбия': 'serbia',
+    'хърватия': 'croatia',
+    'ungheria': 'hungary',
+    'storbritannien': 'united kingdom',
+    'rumänien': 'romania',
+    'finlandia': 'finland',
+    'polonia': 'poland',
+    'италия': 'italy',
+    'украина': 'ukraine',
+    'белгия': 'belgium',
+    'griechenland': 'greece',
+    'alankomaat': 'netherlands',
+    'olaszország': 'hungary',
+    'románia': 'romania',
+    'danmark': 'denmark',
+    'amerikai egyesült államok': 'united states',
+    'ruotsi': 'finland',
+    'tanska': 'denmark',
+    'paesi bassi': 'netherlands',
+    'france switzerland germany': 'france',
+    'nederländerna': 'sweden',
+    'унгария': 'hungary',
+    'nizozemska': 'netherlands',
+    'španjolska': 'spain',
+    'ujedinjeno kraljevstvo': 'united kingdom',
+    'espanya': 'spain',
+    'regne unit': 'united kingdom',
+    'norwegia': 'norway',
+    'hongarije': 'hungary',
+    'češka': 'czech republic',
+    'slovačka': 'slovakia',
+    'lu': 'luxembourg',
+    'república da irlanda': 'ireland',
+    'švédsko': 'sweden',
+    'rakousko': 'austria',
+    'serbien': 'serbia',
+    'czechy': 'czech republic',
+    'litwa': 'lithuania',
+    'holandia': 'netherlands',
+    'słowacja': 'slovakia',
+    'itálie': 'italy',
+    'prancūzija': 'france',
+    'vokietija': 'germany',
+    'šveicarija': 'switzerland',
+    'lietuva': 'lithuania',
+    'slovensko': 'slovakia',
+    'croácia': 'croatia',
+    'sérvia': 'serbia',
+    'eslováquia': 'slovakia',
+    'eslovénia': 'slovenia',
+    'birleşik krallık': 'united kingdom',
+    'slovakia': 'slovakia',
+    'republik zypern': 'cyprus',
+    'bułgaria': 'bulgaria',
+    'eslovenia': 'slovenia',
+    'bulgária': 'bulgaria',
+    'hungria': 'hungary',
+    'roménia': 'romania',
+    'puola': 'poland',
+    'slovenija': 'slovenia',
+    'srbija': 'serbia',
+    'bugarska': 'bulgaria',
+    'svezia': 'sweden',
+    'nouvelle-zélande': 'new zealand',
+    'görögország': 'greece',
+    'belgicko': 'belgium',
+    'francúzsko': 'france',
+    'nemecko': 'germany',
+    'rusko': 'russia',
+    'croatie': 'croatia',
+    'croacia': 'croatia',
+    'hungría': 'hungary',
+    'švýcarsko': 'switzerland',
+    'dania': 'denmark',
+    'grecja': 'greece',
+    'szwecja': 'sweden',
+    'albanien': 'albania',
+    'estonija': 'estonia',
+    'latvija': 'latvia',
+    'švajčiarsko': 'switzerland',
+    'oostenrijk': 'austria',
+    'united kingdom & ireland': 'united kingdom',
+    'eslovaquia': 'slovakia',
+    'słowenia': 'slovenia',
+    'francija': 'france',
+    'moldova': 'moldova',
+    'malta': 'malta',
+    'съединени американски щати': 'united states',
+    'обединено кралство великобритания и северна ирландия': 'united kingdom',
+    'slovénie': 'slovenia',
+    'rumunsko': 'romania',
+    'tsjechië': 'czech republic',
+    'slovacchia': 'slovakia',
+    'slovaquie': 'slovakia',
+    'łotwa': 'latvia',
+    'lituânia': 'lithuania',
+    'maďarsko': 'hungary',
+    'španělsko': 'spain',
+    'gabon': 'gabon',
+    'španielsko': 'spain',
+    'belgija': 'belgium',
+    'grčka': 'greece',
+    'србија': 'serbia',
+    'ie': 'ireland',
+    'frankrig': 'denmark',
+    'rumunjska': 'romania',
+    'portogallo': 'portugal',
+    'إيطاليا': 'italy',
+    'чехия': 'czech republic',
+    'republika srpska': 'bosnia and herzegovina',
+    'cn': 'china',
+    'chine': 'china',
+    'austrália': 'australia',
+    'iran': 'iran',
+    'algerien': 'algeria',
+    'nederlân': 'netherlands',
+    'pérou': 'peru',
+    'švica': 'switzerland',
+    'スペイン': 'spain',
+    'kína': 'china',
+    'ausztria': 'austria',
+    'bèlgica': 'belgium',
+    'belgie': 'belgium',
+    'austrálie': 'australia',
+    '대한민국': 'south korea',
+    'french guiana': 'french guiana',
+    're': 'reunion',
+    'af': 'afghanistan',
+    'argelia': 'algeria',
+    'argentine': 'argentina',
+    'colombie': 'colombia',
+    'russie': 'russia',
+    'mali': 'mali',
+    'martinica': 'martinique',
+    'reunión': 'reunion',
+    'reunion': 'reunion',
+    'jp': 'japan',
+    'guadalupe': 'reunion',
+    'cote-d-ivoire': 'ivory coast',
+    'казахстан': 'kazakhstan',
+    'afghanistan': 'afghanistan',
+    'saint-martin': 'saint martin',
+    'marocco': 'morocco',
+    'biélorussie': 'belarus',
+    'mq': 'martinique',
+    'kazakhstan': 'kazakhstan',
+    'marokko': 'morocco',
+    'tunisia': 'tunisia',
+    'république du congo': 'republic of the congo',
+    'maroko': 'morocco',
+    'mayotte': 'mayotte',
+    'estonie': 'estonia',
+    'french-polynesia': 'french polynesia',
+    'thaïlande': 'thailand',
+    'австралия': 'australia',
+    'мароко': 'morocco',
+    'нова зеландия': 'new zealand',
+    'estónia': 'estonia',
+    'andorra': 'andorra',
+    'nova zelândia': 'new zealand',
+    'rússia': 'russia',
+    'tailandia': 'thailand',
+    'ประเทศออสเตรเลีย': 'australia',
+    'ประเทศออสเตรีย': 'austria',
+    'ประเทศเบลเยียม': 'belgium',
+    'ประเทศเยอรมนี': 'germany',
+    'ประเทศอิตาลี': 'italy',
+    'ประเทศเลบานอน': 'lebanon',
+    'ประเทศโมร็อกโก': 'morocco',
+    'ประเทศโรมาเนีย': 'romania',
+    'ประเทศสเปน': 'spain',
+    'åland islands': 'finland',
+    'bielorussia': 'belarus',
+    'frakland': 'france',
+    '#value!': np.nan,
+    'nl': 'netherlands',
+    'koeweit': 'kuwait',
+    'dom tom': 'france',
+    'алжир': 'algeria',
+    'reunião': 'reunion',
+    'dom-tom': 'france',
+    'ประเทศรัสเซีย': 'russia',
+    'สหรัฐอเมริกา': 'united states',
+    'sg': 'singapore',
+    'svájc': 'switzerland',
+    'латвия': 'latvia',
+    'грузия': 'georgia',
+    'nueva caledonia': 'australia',
+    'ru': 'russia',
+    'seychelles': 'seychelles',
+    'costa de marfil': 'ivory coast',
+    'sjedinjene američke države': 'united states',
+    'danska': 'denmark',
+    'rusija': 'russia',
+    'burkina-faso': 'burkina faso',
+    'norge': 'norway',
+    'li': 'liechtenstein',
+    'реюнион': 'reunion',
+    'lussemburgo': 'luxembourg',
+    'vanuatu': 'vanuatu',
+    'roemenië': 'romania',
+    'rumunia': 'romania',
+    'ma': 'morocco',
+    'viêt nam': 'vietnam',
+    'albanie': 'albania',
+    'argélia': 'algeria',
+    'pas': np.nan,
+    'kh': 'cambodia',
+    'الأردن': 'jordan',
+    'mf': 'saint martin',
+    'french-guiana': 'french guiana',
+    'mongolie': 'mongolia',
+    'gp': 'reunion',
+    'französisch-guayana': 'french guiana',
+    'nuova caledonia': 'australia',
+    'france la réunion': 'reunion',
+    'сенегал': 'senegal',
+    'cambodge': 'cambodia',
+    'jersey': 'jersey',
+    'france 🇨🇵🇫🇷': 'france',
+    'gf': 'french guiana',
+    'angleterre': 'england',
+    'andorre': 'andorra',
+    'irak': 'iraq',
+    'emirats arabes unis': 'united arab emirates',
+    'democratic republic of the congo': 'democratic republic of the congo',
+    'bulgarije': 'bulgaria',
+    'griekenland': 'greece',
+    'république dominicaine': 'dominican republic',
+    'spania': 'spain',
+    'nc': 'australia',
+    'ucrania': 'ukraine',
+    'welt': 'world',
+    'liechtenstein': 'liechtenstein',
+    'estland': 'estonia',
+    'hollande': 'netherlands',
+    'turquie': 'turkey',
+    'mauritanie': 'mauritania',
+    'iceland': 'iceland',
+    'сингапур': 'singapore',
+    'szerbia': 'serbia',
+    'srbsko': 'serbia',
+    'georgia': 'georgia',
+    'ungaria': 'hungary',
+    'avstrija': 'austria',
+    'hrvaška': 'croatia',
+    'republika srbska': 'bosnia and herzegovina',
+    'bosna in hercegovina': 'bosnia and herzegovina',
+    'črna gora': 'montenegro',
+    'bosna i hercegovina': 'bosnia and herzegovina',
+    'sjeverna makedonija': 'north macedonia',
+    'albanija': 'albania',
+    'saudijska arabija': 'saudi arabia',
+    'republic of macedonia': 'north macedonia',
+    'bosnia and herzegovina': 'bosnia and herzegovina',
+    'montenegro': 'montenegro',
+    'nordmazedonien': 'north macedonia',
+    'szlovákia': 'slovakia',
+    'француска': 'france',
+    'босна и херцеговина': 'bosnia and herzegovina',
+    'crna gora': 'montenegro',
+    'црна гора': 'montenegro',
+    'nya kaledonien': 'australia',
+    'singapur': 'singapore',
+    'русија': 'russia',
+    'prantsusmaa': 'france',
+    'hispaania': 'spain',
+    'eesti': 'estonia',
+    'saksamaa': 'germany',
+    'dánsko': 'denmark',
+    'chińska republika ludowa': 'china',
+    'нидерландия': 'netherlands',
+    'estija': 'estonia',
+    'suomija': 'finland',
+    'rumunija': 'romania',
+    'švedija': 'sweden',
+    'jungtinė karalystė': 'united kingdom',
+    'chipre': 'cyprus',
+    'κύπρος': 'cyprus',
+    'белоруссия': 'belarus',
+    'bělorusko': 'belarus',
+    'argentinien': 'argentina',
+    'saudi-arabien': 'saudi arabia',
+    'イギリス': 'united kingdom',
+    'bahrain': 'bahrain',
+    'deutsche demokratische republik': 'east germany',
+    'немачка': 'germany',
+    'німеччина': 'germany',
+    'польща': 'poland',
+    'węgry': 'hungary',
+    'north macedonia': 'north macedonia',
+    'swaziland': 'eswatini',
+    'elveția': 'switzerland',
+    'macédoine du nord': 'north macedonia',
+    'east germany': 'germany',
+    'chypre': 'cyprus',
+    'بلجيكا': 'belgium',
+    'ألمانيا': 'germany',
+    'island': 'iceland',
+    'alemanya': 'germany',
+    'ليبيا': 'libya',
+    'росія': 'russia',
+    'unkari': 'hungary',
+    'lucembursko': 'luxembourg',
+    'chorvatsko': 'croatia',
+    'rusland': 'russia',
+    'no': 'norway',
+    'danimarca': 'denmark',
+    'kosovo': 'kosovo',
+    'bolivien': 'bolivia',
+    'deut': 'germany',
+    'rusia': 'russia',
+    'belarus': 'belarus',
+    'kyrgyzstan': 'kyrgyzstan',
+    'tajikistan': 'tajikistan',
+    'uzbekistan': 'uzbekistan',
+    'armenia': 'armenia',
+    'азербайджан': 'azerbaijan',
+    'azerbaijan': 'azerbaijan',
+    'australija': 'australia',
+    'lettonie': 'latvia',
+    'lettland': 'latvia',
+    'fransa': 'france',
+    'aserbaidschan': 'azerbaijan',
+    'lituanie': 'lithuania',
+    'jungtinės amerikos valstijos': 'united states',
+    'sri lanka': 'sri lanka',
+    'เขตบริหารพิเศษฮ่องกง': 'hong kong',
+    'นิวแคลิโดเนีย': 'australia',
+    'neuseeland': 'new zealand',
+    'таджикистан': 'tajikistan',
+    'франція': 'france',
+    'латвія': 'latvia',
+    'ucrânia': 'ukraine',
+    'ucraina': 'ukraine',
+    'republica moldova': 'moldova',
+    'moldavie': 'moldova',
+    'géorgie': 'georgia',
+    'საქართველო': 'georgia',
+    'hong-kong': 'hong kong',
+    'قطر': 'qatar',
+    '中華民国': 'taiwan',
+    '澳门': 'macau',
+    'mozambique': 'mozambique',
+    'arabia saudita': 'saudi arabia',
+    'ישראל': 'israel',
+    'irlandia': 'ireland',
+    'zjednoczone emiraty arabskie': 'united arab emirates',
+    'norja': 'norway',
+    'المملكة المتحدة': 'united kingdom',
+    'المغرب': 'morocco',
+    'republic of ireland': 'ireland',
+    'europäische union': 'europe',
+    'franciaország': 'france', 
+    'spanien': 'spain', 
+    'česko': 'czech republic', 
+    'francie': 'france', 
+    'nagy-britannia': 'united kingdom', 
+    'magyarország': 'hungary', 
+    'frankrijk': 'france', 
+    'verenigd koninkrijk': 'united kingdom', 
+    'vereinigte staaten von amerika': 'united states', 
+    'la réunion': 'reunion', 
+    'svijet': 'world', 
+    'francuska': 'france', 
+    'hrvatska': 'croatia', 
+    'irska': 'ireland', 
+    'njemačka': 'europe', 
+    'sjedinjene-američke-države': 'united states', 
+    'švicarska': 'switzerland', 
+    "stati uniti d'america": 'united states', 
+    'saint kitts and nevis': 'united states', 
+    'el salvador': 'salvador', 
+    'emiratos árabes unidos': 'united arab emirates', 
+    'francja': 'france', 
+    'stany zjednoczone': 'united states', 
+    'brasil': 'brazil', 
+    'guernsey': 'united kingdom', 
+    'french guiana': 'united states', 
+    'saint pierre and miquelon': 'united states', 
+    'trinidad and tobago': 'united states',
+    'mŕxico': 'mexico', 
+    'latvia': 'lithuania', 
+    'ussr': 'russia', 
+    'macau': 'china', 
+    'németország': 'germany', 
+    'litauen': 'lithuania', 
+    'saint martin': 'reunion', 
+    'guadeloupe': 'reunion', 
+    'republic of the congo': 'democratic republic of the congo', 
+    'mayotte': 'reunion', 
+    'new caledonia': 'australia', 
+    'seychelles': 'reunion', 
+    'liechtenstein': 'switzerland',
+    'france - la réunion': 'reunion', 
+    'jersey': 'united kingdom', 
+    'england': 'united kingdom', 
+    'madagascar': 'reunion', 
+    'east germany': 'germany', 
+    'bangladesh': 'india', 
+    'francia  españa': 'france', 
+    'france  spain': 'france', 
+    'palestinian territories': 'palestine', 
+    'europäische union': 'europe', 
+    'soviet union': 'russia', 
+    'republic of ireland': 'ireland', 
+    'middle east:': 'romania',
+    'saint': 'united states', 
+    'papua new guinea': 'united states',
+    'канада': 'canada', 
+    'south america': 'peru',
+    'zimbabwe': 'reunion', 
+    'america': 'united states',
+    'product of usa. packed in canada.  imported by: strong international trading inc. richmond bc | www.siti.ca': 'united states', 
+    'natural calm canada 5 idleswift dr.  thornhill on  l4j 1k6': 'canada', 
+}
 
-def countries_processing(df, values_to_replace): 
-    def clean_abrev(texte):
-        if isinstance(texte, str):
-            return re.sub(r'\b\w{2}:\b', '', texte).strip()
-        return texte
-    country_mapping = {
-        'åland': 'finland',
-        'european-union': 'europe',
-        'cap-vert': 'cape verde',
-        'república de china': 'china',
-        'sudán': 'sudan',
-        'scotland': 'united kingdom',
-        'nueva zelanda': 'new zealand',
-        'libye': 'libya',
-        'великобритания': 'united kingdom',
-        'رومانيا': 'romania',
-        'burundi': 'burundi',
-        'galmudug': 'somalia',
-        'østrig': 'austria',
-        'holland': 'netherlands',
-        'libya': 'libya',
-        'bahrain': 'bahrain',
-        'islanda': 'iceland',
-        'belgica': 'belgium',
-        'irsko': 'ireland',
-        'βουλγαρία': 'bulgaria',
-        'гърция': 'greece',
-        'islandia': 'iceland',
-        'olanda': 'netherlands',
-        'worldwide': 'world',
-        'malawi': 'malawi',
-        'bénin': 'benin',
-        'shqipëria': 'albania',
-        'republic-of-macedonia': 'north macedonia',
-        'северна македония': 'north macedonia',
-        'албания': 'albania',
-        'белгија': 'belgium',
-        'democratic-republic-of-the-congo': 'democratic republic of the congo',
-        'ghana': 'ghana',
-        'europese unie': 'europe',
-        'volksrepubliek china': 'china',
-        'united-arab-emirates': 'united arab emirates',
-        'arménia': 'armenia',
-        'norvegia': 'norway',
-        'nový zéland': 'new zealand',
-        'portugali': 'portugal',
-        'albânia': 'albania',
-        'ierland': 'ireland',
-        'poľsko': 'poland',
-        'nyderlandai': 'netherlands',
-        'central african republic': 'central african republic',
-        'algieria': 'algeria',
-        'bośnia i hercegowina': 'bosnia and herzegovina',
-        'chorwacja': 'croatia',
-        'rosja': 'russia',
-        'benin': 'benin',
-        'spanish': 'spain', 
-        'fr': 'france', 
-        "people's republic of china": 'china', 
-        'es': 'spain',
-        'america': "united states",
-        'ca': 'canada', 
-        'be': 'belgium', 
-        'iraqi kurdistan': 'irak', 
-        'turks and caicos islands': 'turkey',
-        'indian subcontinent': 'india', 
-        'san marino': 'italy', 
-        'sicily': 'italy',
-        'all countries': 'world',
-        'vatican city': 'italy',
-        'sudáfrica': 'south africa',
-        'áfrica do sul': 'south africa',
-        'benín': 'benin',
-        'belçika': 'belgium',
-        'i̇sviçre': 'switzerland',
-        'кот д\'ивоар': 'ivory coast',
-        'кувейт': 'kuwait',
-        'люксембург': 'luxembourg',
-        'paquistão': 'pakistan',
-        'gibraltar': 'united kingdom',
-        'iraque': 'iraq',
-        'nemčija': 'germany',
-        'grčija': 'greece',
-        'luksemburg': 'luxembourg',
-        'španija': 'spain',
-        'monténégro': 'montenegro',
-        'kenya': 'kenya',
-        'portugalia': 'portugal',
-        'azerbaïdjan': 'azerbaijan',
-        'malte': 'malta',
-        'kroatia': 'croatia',
-        'sveits': 'switzerland',
-        'guinea': 'united states',
-        'հայաստան': 'armenia',
-        'estonsko': 'estonia',
-        'kuwejt': 'kuwait',
-        'bulgaaria': 'bulgaria',
-        'rumeenia': 'romania',
-        'словенија': 'slovenia',
-        'thajsko': 'thailand',
-        'สาธารณรัฐเช็ก': 'czech republic',
-        'ประเทศสโลวาเกีย': 'slovakia',
-        'мађарска': 'hungary',
-        'namibia': 'namibia',
-        'niger': 'niger',
-        'namibie': 'namibia',
-        'sudafrica': 'south africa',
-        'botswana': 'botswana',
-        'tanzania': 'tanzania',
-        'algerie': 'algeria',
-        'republic of the congo': 'republic of the congo',
-        'république centrafricaine': 'central african republic',
-        'guinée équatoriale': 'united states',
-        'wybrzeże kości słoniowej': 'ivory coast',
-        'costa d\'avorio': 'ivory coast',
-        'tunezja': 'tunisia',
-        'tunesië': 'tunisia',
-        'brunei': 'brunei',
-        'مصر': 'egypt',
-        'ایالات متحده آمریکا': 'united states',
-        'soomaaliya': 'somalia',
-        'katar': 'qatar',
-        'سوريا': 'syria',
-        'اليمن': 'yemen',
-        'yemen': 'yemen',
-        'venäjä': 'russia',
-        'finsko': 'finland',
-        'viro': 'estonia',
-        'salvador': 'el salvador',
-        '英国': 'united kingdom',
-        'turquía': 'turkey',
-        'bosnia y herzegovina': 'bosnia and herzegovina',
-        'bósnia e herzegovina': 'bosnia and herzegovina',
-        'turquia': 'turkey',
-        'irlanti': 'ireland',
-        'ruoŧŧa': 'sweden',
-        'sri-lanka': 'sri lanka',
-        'se': 'sweden',
-        'an fhraing': 'france',
-        'a\' ghearmailt': 'germany',
-        'poblachd na h-èireann': 'ireland',
-        'an rìoghachd aonaichte': 'united kingdom',
-        'dominican-republic': 'dominican republic',
-        'messico': 'mexico',
-        'indien': 'india',
-        'benelux': 'benelux',
-        'new-zealand': 'new zealand',
-        'فرانس': 'france',
-        'جمہوریہ آئرستان': 'ireland',
-        'پاکستان': 'pakistan',
-        'ریاستہائے متحدہ آمریکا': 'united states',
-        'република македонија': 'north macedonia',
-        'la-reunion': 'reunion',
-        'portugalsko': 'portugal',
-        'kolumbien': 'colombia',
-        'mauritania': 'mauritania',
-        'isle of man': 'united kingdom',
-        'haití': 'haiti',
-        'cile': 'chile',
-        'équateur': 'ecuador',
-        'brasilien': 'brazil',
-        'br': 'brazil',
-        'írán': 'iran',
-        'צרפת': 'france',
-        'איטליה': 'italy',
-        'principato di monaco': 'monaco',
-        'repubblica ceca': 'czech republic',
-        'letónia': 'latvia',
-        'guadalupa': 'reunion',
-        'cipro': 'cyprus',
-        'macedonia del norte': 'north macedonia',
-        'finska': 'finland',
-        'algerije': 'algeria',
-        'spanyolország': 'hungary',
-        'dánmárku': 'denmark',
-        'βέλγιο': 'belgium',
-        'guiana francesa': 'french guiana',
-        'polinésia francesa': 'french polynesia',
-        'jordânia': 'jordan',
-        'north korea': 'north korea',
-        'ประเทศจีน': 'china',
-        'islândia': 'iceland',
-        'zuid-afrika': 'south africa',
-        'letonia': 'latvia',
-        'república democrática del congo': 'democratic republic of the congo',
-        'santoña': 'spain',
-        'cantabria': 'spain',
-        'france spain': 'france',
-        'costa do marfim': 'ivory coast',
-        'túnez': 'tunisia',
-        'португалия': 'portugal',
-        'tunesien': 'tunisia',
-        'угорщина': 'hungary',
-        'італія': 'italy',
-        'іспанія': 'spain',
-        'марокко': 'morocco',
-        'mónaco': 'monaco',
-        'jordania': 'jordan',
-        'cabo verde': 'cape verde',
-        'franca': 'france',
-        'ισπανία': 'spain',
-        'arábia saudita': 'saudi arabia',
-        'andora': 'andorra',
-        'maldives': 'maldives',
-        'tunisko': 'tunisia',
-        'martinik': 'martinique',
-        'bosnia-and-herzegovina': 'bosnia and herzegovina',
-        'швајцарска': 'switzerland',
-        'bosnie-herzégovine': 'bosnia and herzegovina',
-        'кипар': 'cyprus',
-        'türkei': 'turkey',
-        'تركيا': 'turkey',
-        'amerika birleşik devletleri': 'united states',
-        'řecko': 'greece',
-        'royaume uni': 'united kingdom',
-        'cz': 'czech republic',
-        'singapura': 'singapore',
-        'frankriika': 'france',
-        'nuova zelanda': 'new zealand',
-        'kroatië': 'croatia',
-        'elfenbeinküste': 'ivory coast',
-        'philippinen': 'philippines',
-        'palestinian territories': 'palestine',
-        'índia': 'india',
-        'nova caledónia': 'australia',
-        'moldavsko': 'moldova',
-        'slovinsko': 'slovenia',
-        '프랑스': 'france',
-        '독일': 'germany',
-        'filipini': 'philippines',
-        'južna koreja': 'south korea',
-        'zuid-korea': 'south korea',
-        'corea del sud': 'south korea',
-        '캐나다': 'canada',
-        '네덜란드': 'netherlands',
-        'tšekki': 'czech republic',
-        'cambogia': 'cambodia',
-        'saudi-arabia': 'saudi arabia',
-        'laos': 'laos',
-        'соединённые штаты америки': 'united states',
-        'ประเทศกัมพูชา': 'cambodia',
-        'kamerun': 'cameroon',
-        'ประเทศอินโดนีเซีย': 'indonesia',
-        'timor-leste': 'timor-leste',
-        'wereld': 'world',
-        'fiji': 'fiji',
-        'ประเทศแคนาดา': 'canada',
-        'ประเทศสิงคโปร์': 'singapore',
-        'bangladés': 'bangladesh',
-        'nepal': 'nepal',
-        'pháp': 'france',
-        'việt nam': 'vietnam',
-        'irán': 'iran',
-        'kirgisistan': 'kyrgyzstan',
-        'bosnien und herzegowina': 'bosnia and herzegovina',
-        'albánie': 'albania',
-        'francia': 'france',
-        'bosna a hercegovina': 'bosnia and herzegovina',
-        'saúdská arábie': 'saudi arabia',
-        'evropska unija': 'europe',
-        '澳大利亚': 'australia',
-        'wallis and futuna': 'wallis and futuna',
-        'البحرين': 'bahrain',
-        'cook islands': 'cook islands',
-        'fidji': 'fiji',
-        'malaisie': 'malaysia',
-        'anguilla': 'anguilla',
-        'montserrat': 'montserrat',
-        'габон': 'gabon',
-        'almanya': 'germany',
-        'スイス': 'switzerland',
-        'فرانسه': 'france',
-        'ایران': 'iran',
-        'baréin': 'bahrain',
-        'fas': 'morocco',
-        'népal': 'nepal',
-        'ประเทศโกตดิวัวร์': 'ivory coast',
-        'saint lucia': 'saint lucia',
-        'regatul unit al marii britanii și al irlandei de nord': 'united kingdom',
-        'somalia': 'somalia',
-        'rwanda': 'rwanda',
-        'sierra leone': 'sierra leone',
-        'nijer': 'niger',
-        'brasile': 'brazil',
-        'cehia': 'czech republic',
-        'slovacia': 'slovakia',
-        'ue': 'europe',
-        'demokratická republika kongo': 'democratic republic of the congo',
-        'nova kaledonien': 'australia',
-        'jugoslavija': 'yugoslavia',
-        'canadà': 'canada',
-        'turcia': 'turkey',
-        'polynésie francaise': 'french polynesia',
-        'бельгія': 'belgium',
-        'francjia': 'france',
-        'antigua and barbuda': 'antigua and barbuda',
-        'trinidad y tobago': 'trinidad and tobago',
-        'republic of ireland': 'ireland',
-        'frantsa': 'france',
-        'γουαδελούπη': 'reunion',
-        'كوت ديفوار': 'ivory coast',
-        'cina': 'china',
-        'statele unite ale americii': 'united states',
-        'hu': 'hungary',
-        'словения': 'slovenia',
-        'nieuw-caledonië': 'australia',
-        'algéria': 'algeria',
-        'marokkó': 'morocco',
-        'république de macédoine': 'north macedonia',
-        'macao': 'macau',
-        'греция': 'greece',
-        'lesotho': 'lesotho',
-        'libanon': 'lebanon',
-        'palästinensische autonomiegebiete': 'palestine',
-        'vereinigte arabische emirate': 'united arab emirates',
-        'dz': 'algeria',
-        'pf': 'french polynesia',
-        'bg': 'bulgaria',
-        'mo': 'macau',
-        'sa': 'saudi arabia',
-        'gn': 'united states',
-        've': 'venezuela',
-        'pe': 'peru',
-        'th': 'thailand',
-        'cl': 'chile',
-        'nz': 'new zealand',
-        'in': 'india',
-        'au': 'australia',
-        'id': 'indonesia',
-        'gr': 'greece',
-        'co': 'colombia',
-        'ro': 'romania',
-        'hk': 'hong kong',
-        'rs': 'serbia',
-        'dk': 'denmark',
-        'ae': 'united arab emirates',
-        'sc': 'seychelles',
-        'middle east': 'middle east',
-        'kasachstan': 'kazakhstan',
-        'tn': 'tunisia',
-        'ci': 'ivory coast',
-        'kw': 'kuwait',
-        'pt': 'portugal',
-        'ar': 'argentina',
-        'tw': 'taiwan',
-        'ga': 'gabon',
-        'tg': 'togo',
-        'bh': 'bahrain',
-        'pk': 'pakistan',
-        'pa': 'panama',
-        'etats-unis': 'united states',
-        'mu': 'mauritius',
-        'faroe islands': 'denmark',
-        'ht': 'haiti',
-        'ドイツ': 'germany',
-        'za': 'south africa',
-        'fi': 'finland',
-        'litvánia': 'lithuania',
-        'ua': 'ukraine',
-        'il': 'israel',
-        'si': 'slovenia',
-        'sk': 'slovakia',
-        'south-africa': 'south africa',
-        'east-germany': 'germany',
-        'tr': 'turkey',
-        'pl': 'poland',
-        'mk': 'north macedonia',
-        'île maurice': 'mauritius',
-        'pr': 'puerto rico',
-        'ne': 'niger',
-        'cr': 'costa rica',
-        'my': 'malaysia',
-        'bj': 'benin',
-        'ec': 'ecuador',
-        'mt': 'malta',
-        'vn': 'vietnam',
-        'ba': 'bosnia and herzegovina',
-        'qa': 'qatar',
-        'by': 'belarus',
-        'gd': 'grenada',
-        'mx': 'mexico',
-        'eg': 'egypt',
-        'eu': 'europe',
-        'cm': 'cameroon',
-        'ng': 'nigeria',
-        'ml': 'mali',
-        'om': 'oman',
-        'gt': 'guatemala',
-        'grenada': 'grenada',
-        'thaimaa': 'thailand',
-        'lt': 'lithuania',
-        'mr': 'mauritania',
-        'papua new guinea': 'united states',
-        'białoruś': 'belarus',
-        'ph': 'philippines',
-        'itàlia': 'italy',
-        'u.s.a': 'united states',
-        'sv': 'el salvador',
-        'kz': 'kazakhstan',
-        'lv': 'latvia',
-        'cg': 'congo',
-        'arabia saudyjska': 'saudi arabia',
-        'turcja': 'turkey',
-        'saint martin': 'france',
-        'bf': 'burkina faso',
-        'bd': 'bangladesh',
-        'gh': 'ghana',
-        'mz': 'mozambique',
-        'al': 'albania',
-        'uz': 'uzbekistan',
-        'pm': 'saint pierre and miquelon',
-        'gy': 'guyana',
-        'dj': 'djibouti',
-        'uy': 'uruguay',
-        'cd': 'democratic republic of the congo',
-        'sowjetunion': 'soviet union',
-        'frantzia': 'france',
-        'espainia': 'spain',
-        'mg': 'madagascar',
-        'ke': 'kenya',
-        'uae': 'united arab emirates',
-        'td': 'chad',
-        'méxico españa': 'mexico spain',
-        'az': 'azerbaijan',
-        'norveška': 'norway',
-        'republik kongo': 'republic of the congo',
-        'np': 'nepal',
-        'gi': 'gibraltar',
-        'ad': 'andorra',
-        'yugoslavia': 'serbia',
-        'porto rico': 'puerto rico',
-        'czechia': 'czech republic',
-        'kr': 'south korea',
-        'md': 'moldova',
-        'ประเทศนิวซีแลนด์': 'new zealand',
-        'абхазия': 'abkhazia',
-        'zimbabwe': 'zimbabwe',
-        'mc': 'monaco',
-        'република ирландия': 'republic of ireland',
-        'lr': 'liberia',
-        'yt': 'mayotte',
-        'cy': 'cyprus',
-        'nowa kaledonia': 'australia',
-        'je': 'jersey',
-        'gg': 'guernsey',
-        'hashemite kingdom of jordan': 'jordan',
-        'lëtzebuerg (land)': 'luxembourg',
-        'santona': 'saint',
-        'هولندا': 'netherlands',
-        'congo': 'congo',
-        'ivory coast': 'cote d\'ivoire',
-        'norsko': 'norway',
-        'lc': 'saint lucia',
-        'macedonia': 'north macedonia',
-        'emirados árabes unidos': 'united arab emirates',
-        'tajlandia': 'thailand',
-        'me': 'montenegro',
-        'america': 'united states',
-        'wf': 'wallis and futuna',
-        'do': 'dominican republic',
-        'united-states-of-america': 'united states',
-        'indonesië': 'indonesia',
-        'maleisië': 'malaysia',
-        'filipijnen': 'philippines',
-        'republika chińska': 'china',
-        'ge': 'georgia',
-        'croazia': 'croatia',
-        'uniunea europeană': 'europe',
-        'evropská unie': 'europe',
-        'cape verde': 'cape verde',
-        'szlovénia': 'slovenia',
-        '++': 'unknown',
-        'kolumbia': 'colombia',
-        'タイ王国': 'thailand',
-        'grekland': 'greece',
-        'polinesia perancis': 'french polynesia',
-        'libano': 'lebanon',
-        'usbekistan': 'uzbekistan',
-        'tadschikistan': 'tajikistan',
-        'weißrussland': 'belarus',
-        'republic-of-the-congo': 'republic of the congo',
-        'ky': 'cayman islands',
-        'republic of lithuania': 'lithuania',
-        'توغو': 'togo',
-        'is': 'iceland',
-        'bhutan': 'bhutan',
-        'paraguai': 'paraguay',
-        'uruguai': 'uruguay',
-        'it:..': 'italy',
-        'am': 'armenia',
-        '荷蘭': 'netherlands',
-        'japāna': 'japan',
-        'japonija': 'japan',
-        'ir': 'iran',
-        'izrael': 'israel',
-        'py': 'paraguay',
-        'cu': 'cuba',
-        'yu': 'serbia',
-        'ประเทศตุรกี': 'turkey',
-        'netherlands france': 'france',
-        'ägypten': 'egypt',
-        'lk': 'sri lanka',
-        'турция': 'turkey',
-        'palestine': 'palestine',
-        'wyspy owcze': 'faroe islands',
-        'остров рождества': 'christmas island',
-        'hr': 'croatia',
-        'état unis': 'united states',
-        'jo': 'jordan',
-        'iq': 'iraq',
-        'ni': 'nicaragua',
-        'パキスタン': 'pakistan',
-        '中国': 'china',
-        'american samoa': 'american samoa',
-        'mm': 'myanmar',
-        'cv': 'cape verde',
-        'словакия': 'slovakia',
-        'km': 'comoros',
-        'syrie': 'syria',
-        'kambodscha': 'cambodia',
-        'la': 'laos',
-        'bn': 'brunei',
-        'south america': 'south america',
-        'turkije': 'turkey',
-        'surinam': 'suriname',
-        'ukrajina': 'ukraine',
-        'vu': 'vanuatu',
-        'filipinas': 'philippines',
-        'm': 'unknown',
-        'cypr': 'cyprus',
-        'république démocratique allemande': 'german democratic republic',
-        'tunis': 'tunisia',
-        'естония': 'estonia',
-        'storbritannia': 'united kingdom',
-        'tz': 'tanzania',
-        'cw': 'curaçao',
-        'bosnia': 'bosnia and herzegovina',
-        'thailandia': 'thailand',
-        'fo': 'faroe islands',
-        'lenkija': 'poland',
-        'ee': 'estonia',
-        'costa-rica': 'costa rica',
-        'republic of moldova': 'moldova',
-        'na': 'namibia',
-        'объединённые арабские эмираты': 'united arab emirates',
-        'unione europea': 'europe',
-        'beļģija': 'belgium',
-        'caribisch nederland': 'caribbean netherlands',
-        'south-korea': 'south korea',
-        'el-salvador': 'el salvador',
-        'spánia': 'spain',
-        'الكاميرون': 'cameroon',
-        'santa lucía': 'saint lucia',
-        'romanya': 'romania',
-        'i̇spanya': 'spain',
-        'reino-unido': 'united kingdom',
-        'curazao': 'curaçao',
-        'узбекистан': 'uzbekistan',
-        'guayana francesa': 'french guiana',
-        'mv': 'maldives',
-        'bosznia-hercegovina': 'bosnia and herzegovina',
-        'észtország': 'estonia',
-        'jm': 'jamaica',
-        'et': 'ethiopia',
-        'ao': 'angola',
-        'sint maarten': 'sint maarten',
-        'bulgarija': 'bulgaria',
-        'chad': 'chad',
-        'cezayir': 'algeria',
-        'suopma': 'finland',
-        'iraqi kurdistan': 'iraq',
-        '---': 'unknown',
-        'egipto': 'egypt',
-        'caribbean netherlands': 'caribbean netherlands',
-        'fr €': 'france',
-        'zambia': 'zambia',
-        'bs': 'bahamas',
-        'cf': 'central african republic',
-        'uganda': 'uganda',
-        'sr': 'suriname',
-        'gq': 'united states',
-        'guinea ecuatorial': 'united states',
-        'bb': 'barbados',
-        '西班牙': 'spain',
-        'san martín': 'saint martin',
-        'san vicente y las granadinas': 'saint vincent and the grenadines',
-        'sx': 'sint maarten',
-        'argentyna': 'argentina',
-        'ukraina': 'ukraine',
-        'san marino': 'san marino',
-        'arabia saudită': 'saudi arabia',
-        'polinesia francese': 'french polynesia',
-        'ประเทศเม็กซิโก': 'mexico',
-        'pobřeží slonoviny': 'ivory coast',
-        'spojené arabské emiráty': 'united arab emirates',
-        'gabun': 'gabon',
-        'österrike': 'austria',
-        'argentina - español': 'argentina',
-        'armenia - pyсский': 'armenia',
-        'aruba - español': 'aruba',
-        'asia pacific': 'asia',
-        'australia - english': 'australia',
-        'austria - deutsch': 'austria',
-        'azerbaijan - русский': 'azerbaijan',
-        'belarus - pyсский': 'belarus',
-        'belgium - français': 'belgium',
-        'belgium - nederlands': 'belgium',
-        'bolivia - español': 'bolivia',
-        'bosnia i hercegovina - bosnian': 'bosnia and herzegovina',
-        'botswana - english': 'botswana',
-        'brazil - português': 'brazil',
-        'bulgaria - български': 'bulgaria',
-        'cambodia - english': 'cambodia',
-        'cambodia - ភាសាខ្មែរ': 'cambodia',
-        'canada - english': 'canada',
-        'canada - français': 'canada',
-        'chile - español': 'chile',
-        'china - 中文': 'china',
-        'colombia - español': 'colombia',
-        'costa rica - español': 'costa rica',
-        'croatia - hrvatski': 'croatia',
-        'cyprus - ελληνικά': 'cyprus',
-        'czech republic - čeština': 'czech republic',
-        'denmark - dansk': 'denmark',
-        'ecuador - español': 'ecuador',
-        'el salvador - español': 'el salvador',
-        'estonia - eesti': 'estonia',
-        'europe': 'europe',
-        'finland - suomi': 'finland',
-        'france - français': 'france',
-        'georgia - ქართული': 'georgia',
-        'germany - deutsch': 'germany',
-        'ghana - english': 'ghana',
-        'greece - ελληνικά': 'greece',
-        'guatemala - español': 'guatemala',
-        'honduras - español': 'honduras',
-        'hong kong - 粵語': 'hong kong',
-        'hungary - magyar': 'hungary',
-        'iceland - íslenska': 'iceland',
-        'india - english': 'india',
-        'indonesia - bahasa indonesia': 'indonesia',
-        'ireland - english': 'ireland',
-        'israel - עברית': 'israel',
-        'italy - italiano': 'italy',
-        'jamaica - english': 'jamaica',
-        'japan - 日本語': 'japan',
-        'kazakhstan - pyсский': 'kazakhstan',
-        'korea - 한국어': 'south korea',
-        'kyrgyzstan - русский': 'kyrgyzstan',
-        'latvia - latviešu': 'latvia',
-        'lebanon - english': 'lebanon',
-        'lesotho - english': 'lesotho',
-        'lithuania - lietuvių': 'lithuania',
-        'macau - 中文': 'macau',
-        'malaysia - bahasa melayu': 'malaysia',
-        'malaysia - english': 'malaysia',
-        'malaysia - 中文': 'malaysia',
-        'mexico - español': 'mexico',
-        'middle east & africa': 'middle east and africa',
-        'moldova - român': 'moldova',
-        'mongolia - монгол хэл': 'mongolia',
-        'namibia - english': 'namibia',
-        'netherlands - nederlands': 'netherlands',
-        'new zealand - english': 'new zealand',
-        'nicaragua - español': 'nicaragua',
-        'north macedonia - македонски јазик': 'north macedonia',
-        'norway - norsk': 'norway',
-        'panamá - español': 'panama',
-        'paraguay - español': 'paraguay',
-        'perú - español': 'peru',
-        'philippines - english': 'philippines',
-        'poland - polski': 'poland',
-        'portugal - português': 'portugal',
-        'puerto rico - español': 'puerto rico',
-        'república dominicana - español': 'dominican republic',
-        'romania - română': 'romania',
-        'russia - русский': 'russia',
-        'serbia - srpski': 'serbia',
-        'singapore - english': 'singapore',
-        'slovak republic - slovenčina': 'slovakia',
-        'slovenia - slovene': 'slovenia',
-        'south africa -english': 'south africa',
-        'spain - español': 'spain',
-        'swaziland - english': 'eswatini',
-        'sweden - svenska': 'sweden',
-        'switzerland - deutsch': 'switzerland',
-        'switzerland - français': 'switzerland',
-        'taiwan - 中文': 'taiwan',
-        'thailand - ไทย': 'thailand',
-        'trinidad & tobago - english': 'trinidad and tobago',
-        'turkey - türkçe': 'turkey',
-        'ukraine - yкраї́нська': 'ukraine',
-        'united kingdom - english': 'united kingdom',
-        'united states - english': 'united states',
-        'united states - español': 'united states',
-        'uruguay - español': 'uruguay',
-        'venezuela - español': 'venezuela',
-        'vietnam - tiếng việt': 'vietnam',
-        'zambia - english': 'zambia',
-        'mongolei': 'mongolia',
-        'xk': 'kosovo',
-        'zentralafrikanische republik': 'central african republic',
-        'latinoamerica': 'latin america',
-        'bermuda': 'bermuda',
-        'zm': 'zambia',
-        'pakistán': 'pakistan',
-        '5018 rue harwood': 'canada',
-        'allemagne nazi': 'germany',
-        'шпанија': 'spain',
-        'london': 'united kingdom',
-        'slovenië': 'slovenia',
-        'bhoutan': 'bhutan',
-        'madagascar - toamasina': 'madagascar',
-        'madžarska': 'hungary',
-        'maurícia': 'mauritius',
-        'tailândia': 'thailand',
-        'ly': 'libya',
-        'ベルギー': 'belgium',
-        'camerún': 'cameroon',
-        'gambia': 'gambia',
-        'united states minor outlying islands': 'united states',
-        'írország': 'ireland',
-        'литва': 'lithuania',
-        'itävalta': 'austria',
-        'malasia': 'malaysia',
-        'birmanie': 'myanmar',
-        'camerun': 'cameroon',
-        'liberia': 'liberia',
-        'السنغال': 'senegal',
-        'bahamas': 'bahamas',
-        'américa': 'america',
-        'belleville wa': 'united states',
-        'kazachstan': 'kazakhstan',
-        'ps': 'palestine',
-        'tt': 'trinidad and tobago',
-        'ethiopia': 'ethiopia',
-        'الاتحاد الأوروبي': 'europe',
-        'ryssland': 'russia',
-        'îles cook': 'cook islands',
-        'fj': 'fiji',
-        'カナダ': 'canada',
-        'уједињено краљевство': 'united kingdom',
-        'サウジアラビア': 'saudi arabia',
-        'černá hora': 'montenegro',
-        'coreia do sul': 'south korea',
-        'chorvátsko': 'croatia',
-        'malezja': 'malaysia',
-        'либия': 'libya',
-        'liettua': 'lithuania',
-        'oroszország': 'hungary',
-        'lux': 'luxembourg',
-        'hn': 'honduras',
-        'libia': 'libya',
-        'brazylia': 'brazil',
-        'korean tasavalta': 'south korea',
-        'northern mariana islands': 'united states',
-        'puerto-rico': 'united states',
-        'ahvenanmaan maakunta': 'aland islands',
-        'moldávia': 'moldova',
-        'state of palestine': 'palestine',
-        'unknown': 'unknown',
-        'イタリア': 'italy',
-        'azərbaycan': 'azerbaijan',
-        'virgin-islands-of-the-united-states': 'united states',
-        'čekija': 'czech republic',
-        'suedia': 'sweden',
-        'guam': 'united states',
-        'bq': 'bonaire',
-        'france.': 'france',
-        'bm': 'bermuda',
-        'sudan': 'sudan',
-        'yémen': 'yemen',
-        'north-macedonia': 'north macedonia',
-        'belize': 'belize',
-        'モロッコ': 'morocco',
-        'egito': 'egypt',
-        'السودان': 'sudan',
-        'u.s.a.': 'united states',
-        'pw': 'palau',
-        'sambia': 'zambia',
-        'ameriketako estatu batuak': 'united states',
-        'soudan': 'sudan',
-        'airija': 'ireland',
-        '.': 'unknown',
-        'bw': 'botswana',
-        'equatorial guinea': 'united states',
-        'кипър': 'cyprus',
-        'camboya': 'cambodia',
-        'ss': 'south sudan',
-        'gu': 'guam',
-        'ai': 'anguilla',
-        'meksiko': 'mexico',
-        'saint vincent and the grenadines': 'saint vincent and the grenadines',
-        'китайская народная республика': 'china',
-        'オーストラリア': 'australia',
-        'γερμανία': 'germany',
-        'stato di palestina': 'palestine',
-        'prepared for siwin foods edmonton alberta t6b 3v2': 'canada',
-        'sierra-leone': 'sierra leone',
-        'maldive': 'maldives',
-        'pg': 'united states',
-        'united states of america': 'united states',
-        'monako': 'monaco',
-        'finlanda': 'finland',
-        'česká republika': 'czech republic',
-        'mn': 'mongolia',
-        'ευρωπαϊκή ένωση': 'europe',
-        'greenland': 'denmark',
-        'er': 'eritrea',
-        'обединени арабски емирства': 'united arab emirates',
-        'ルクセンブルク': 'luxembourg',
-        'アイルランド': 'ireland',
-        'ニュージーランド': 'new zealand',
-        'severní makedonie': 'north macedonia',
-        'ليتوانيا': 'lithuania',
-        'cipar': 'cyprus',
-        'sm': 'san marino',
-        'tunézia': 'tunisia',
-        'repubblica dominicana': 'dominican republic',
-        'colômbia': 'colombia',
-        'aw': 'aruba',
-        'sao tomé and príncipe': 'sao tome and principe',
-        'যুক্তরাজ্য': 'united kingdom',
-        'comoros': 'comoros',
-        'germa': 'germany',
-        'moldawien': 'moldova',
-        'малта': 'malta',
-        'hellas': 'greece',
-        'ug': 'uganda',
-        'ニューカレドニア': 'australia',
-        'aland-islands': 'aland islands',
-        'vi': 'united states virgin islands',
-        'rw': 'rwanda',
-        'sardinia': 'italy',
-        'японія': 'japan',
-        'mannin': 'isle of man',
-        'reeriaght unnaneysit': 'united kingdom',
-        'republica mexicana': 'mexico',
-        'republika południowej afryki': 'south africa',
-        'georgien': 'georgia',
-        '南アフリカ共和国': 'south africa',
-        'espagnol': 'spanish',
-        'ye': 'yemen',
-        'vatican city': 'vatican city',
-        'indonesien': 'indonesia',
-        'kn': 'saint kitts and nevis',
-        'bo': 'bolivia',
-        'en: españa': 'spain',
-        'северна македонија': 'north macedonia',
-        'албанија': 'albania',
-        'sy': 'syria',
-        'im': 'isle of man',
-        'beyaz rusya': 'belarus',
-        'nowa zelandia': 'new zealand',
-        'المجر': 'hungary',
-        'norga': 'norway',
-        'tjeckien': 'czech republic',
-        'eeuu': 'united states',
-        'birmania': 'myanmar',
-        'македонија': 'north macedonia',
-        'sd': 'sudan',
-        'ливан': 'lebanon',
-        'tasty foods αβγε': 'greece',
-        'камерун': 'cameroon',
-        'монгол улс': 'mongolia',
-        'mp': 'northern mariana islands',
-        'so': 'somalia',
-        'русия': 'russia',
-        '::': 'unknown',
-        'イラク': 'iraq',
-        'macedonia de nord': 'north macedonia',
-        'líbia': 'libya',
-        'japani': 'japan',
-        'vg': 'british virgin islands',
-        'ag': 'antigua and barbuda',
-        '中華人民共和国': 'people\'s republic of china',
-        'turkiye': 'turkey',
-        'ประเทศญี่ปุ่น': 'japan',
-        'indian subcontinent': 'indian subcontinent',
-        'エルサルバドル': 'el salvador',
-        'emirati arabi uniti': 'united arab emirates',
-        'saint-marin': 'san marino',
-        'british virgin islands': 'british virgin islands',
-        'tjekkiet': 'czech republic',
-        '意大利': 'italy',
-        'tonga': 'tonga',
-        'obala bjelokosti': 'ivory coast',
-        'wietnam': 'vietnam',
-        'jamaïque': 'jamaica',
-        'turks and caicos islands': 'turks and caicos islands',
-        'moçambique': 'mozambique',
-        'cc': 'cocos (keeling) islands',
-        'filipiny': 'philippines',
-        'kurdistan irakien': 'iraqi kurdistan',
-        'va': 'vatican city',
-        'servië': 'serbia',
-        '沙特阿拉伯': 'saudi arabia',
-        'zw': 'zimbabwe',
-        'mondo': 'world',
-        'macedonia del nord': 'north macedonia',
-        'sl': 'sierra leone',
-        'moldavië': 'moldova',
-        'нидерланды': 'netherlands',
-        'kp': 'north korea',
-        'iirimaa': 'ireland',
-        'egitto': 'egypt',
-        'islanti': 'iceland',
-        'na stàitean aonaichte': 'united states',
-        'bz': 'belize',
-        'belice': 'belize',
-        'bi': 'burundi',
-        'bellingham wa usa': 'united states',
-        'as': 'american samoa',
-        'الاردن': 'jordan',
-        'dm': 'dominica',
-        'ken': 'kenya',
-        'アラブ首長国連邦': 'united arab emirates',
-        'nyl': 'unknown',
-        'samoa': 'samoa',
-        'wit-rusland': 'belarus',
-        'txekia': 'czech republic',
-        'luxenburgo': 'luxembourg',
-        'индия': 'india',
-        'brazil france': 'france',
-        'dél-korea': 'south korea',
-        'bermudas': 'bermuda',
-        'īrija': 'ireland',
-        'coquitlam bc': 'canada',
-        'salwador': 'el salvador',
-        'amerika syarikat': 'united states',
-        'جميع البلدان': 'all countries',
-        'киргизия': 'kyrgyzstan',
-        'kuba': 'cuba',
-        'bih': 'bosnia and herzegovina',
-        'аржентина': 'argentina',
-        'молдова': 'moldova',
-        'indie': 'india',
-        'omán': 'oman',
-        'sudán del sur': 'south sudan',
-        'украйна': 'ukraine',
-        'дания': 'denmark',
-        'جنوب أفريقيا': 'south africa',
-        'japonsko': 'japan',
-        'армения': 'armenia',
-        'gm': 'gambia',
-        'fiyi': 'fiji',
-        'st': 'são tomé and príncipe',
-        'slov': 'unknown',
-        'šveice': 'switzerland',
-        'デンマーク': 'denmark',
-        'albanië': 'albania',
-        'tc': 'turks and caicos islands',
-        'الهند': 'india',
-        'maldivas': 'maldives',
-        'შვეიცარია': 'switzerland',
-        'ශ් රී ලංකාව': 'sri lanka',
-        'roemenie': 'romania',
-        'russian federation': 'russia',
-        'jordánsko': 'jordan',
-        'ভুটান': 'bhutan',
-        'ভারত': 'india',
-        'নেপাল': 'nepal',
-        'মার্কিন যুক্তরাষ্ট্র': 'united states',
-        'mw': 'malawi',
-        'y deyrnas unedig': 'united kingdom',
-        'ck': 'cook islands',
-        'монголия': 'mongolia',
-        'territorios palestinos': 'palestine',
-        'giappone': 'japan',
-        'ประเทศซาอุดีอาระเบีย': 'saudi arabia',
-        'éthiopie': 'ethiopia',
-        'эстония': 'estonia',
-        'польша': 'poland',
-        'kıbrıs cumhuriyeti': 'cyprus',
-        'vc': 'saint vincent and the grenadines',
-        'ireland & uk': 'united kingdom',
-        'yhdistyneet arabiemiirikunnat': 'united arab emirates',
-        'chint': 'unknown',
-        'малайзия': 'malaysia',
-        'egipt': 'egypt',
-        'malásia': 'malaysia',
-        'u.s. minor outlying islands': 'united states',
-        'leedu': 'lithuania',
-        'gruusia': 'georgia',
-        'république serbe de bosnie': 'serbia',
-        'япония': 'japan',
-        'romani': 'romania',
-        'afganistán': 'afghanistan',
-        'the-bahamas': 'bahamas',
-        'filippinene': 'philippines',
-        'ôsterreich': 'austria',
-        'spojené kráľovstvo': 'united kingdom',
-        'west africa': 'west africa',
-        'الأراضي الفلسطينية': 'palestine',
-        'νότια αφρική': 'south africa',
-        'tanzanie': 'tanzania',
-        'ประเทศมาเลเซีย': 'malaysia',
-        'jordanië': 'jordan',
-        'vatican': 'vatican city',
-        'sb': 'solomon islands',
-        'sz': 'eswatini',
-        'armenië': 'armenia',
-        'territori palestinesi': 'palestine',
-        'ประเทศฟิลิปปินส์': 'philippines',
-        'bg::bulgaria': 'bulgaria',
-        'läti': 'latvia',
-        'letland': 'latvia',
-        'велика британія': 'ukraine',
-        'тунис': 'tunisia',
-        'bosnië en herzegovina': 'bosnia and herzegovina',
-        'central america': 'central america',
-        'france 🇫🇷': 'france',
-        'urugwaj': 'uruguay',
-        'cocoa horizons': 'unknown',
-        'arab saudi': 'saudi arabia',
-        'british-indian-ocean-territory': 'british indian ocean territory',
-        'ruanda': 'rwanda',
-        'färöer': 'faroe islands',
-        'ijsland': 'iceland',
-        'færøerne': 'faroe islands',
-        'belanda': 'netherlands',
-        'korea selatan': 'south korea',
-        'nouvelle caledonie': 'australia',
-        'northern ireland': 'united kingdom',
-        'wales': 'united kingdom',
-        'antigua-and-barbuda': 'antigua and barbuda',
-        'ouganda': 'uganda',
-        'kroatija': 'croatia',
-        'etiopía': 'ethiopia',
-        'saint-kitts-and-nevis': 'saint kitts and nevis',
-        'nouvelle-aquitaine': 'france',
-        'virazeil': 'france',
-        'quebec': 'canada',
-        'the netherlands': 'netherlands',
-        'japonia': 'japan',
-        'word': 'unknown',
-        'aus': 'australia',
-        'беларусь': 'belarus',
-        'made in the u k (ni)': 'united kingdom',
-        'wa usa': 'united states',
-        'baden': 'germany',
-        'ouzbékistan': 'uzbekistan',
-        'dr congo': 'democratic republic of the congo',
-        'ariège': 'france',
-        'imported by mccormick canada': 'canada',
-        'on canada n6a 4z2': 'canada',
-        'vancouver canada': 'canada',
-        'vancouver bc canada': 'canada',
-        'product of usa. packed in canada. imported by: strong international trading inc. richmond bc | www.siti.ca': 'canada',
-        'rakúsko': 'austria',
-        'norwa': 'norway',
-        '马来西亚': 'malaysia',
-        'natural calm canada 5 idleswift dr. thornhill on l4j 1k6': 'canada',
-        'マダガスカル': 'madagascar',
-        'santo domingo': 'dominican republic',
-        'hoa kỳ': 'united states',
-        'svalbard et jan mayen': 'norway',
-        'europa': 'europe',
-        'corsica': 'france',
-        'الدمام': 'damam',
-        'dubai': 'united arab emirates',
-        'asia': 'asia',
-        'brasill': 'brazil',
-        'sicile': 'sicily',
-        'surrey bc canada': 'canada',
-        'italien': 'italy',
-        'germany': 'germany',
-        'france': 'france',
-        'united states': 'united states',
-        'irlande': 'ireland',
-        'united kingdom': 'united kingdom',
-        'états-unis': 'united states',
-        'canada': 'canada',
-        'suisse': 'switzerland',
-        'schweiz': 'switzerland',
-        'spain': 'spain',
-        'deutschland': 'germany',
-        'slovenia': 'slovenia',
-        'frankreich': 'france',
-        'netherlands': 'netherlands',
-        'switzerland': 'switzerland',
-        'de': 'germany',
-        'italy': 'italy',
-        'romania': 'romania',
-        'españa': 'spain',
-        'australia': 'australia',
-        'world': 'world',
-        'guadeloupe': 'reunion',
-        'república dominicana': 'dominican republic',
-        'estados unidos': 'united states',
-        'nederland': 'netherlands',
-        'bolivia': 'bolivia',
-        'méxico': 'mexico',
-        'new zealand': 'new zealand',
-        'sweden': 'sweden',
-        'alemania': 'germany',
-        'italia': 'italy',
-        'antarctic': 'antarctica',
-        'royaume-uni': 'united kingdom',
-        'belgique': 'belgium',
-        'pays-bas': 'netherlands',
-        'suède': 'sweden',
-        'denemark': 'denmark',
-        'norvège': 'norway',
-        'espagne': 'spain',
-        'pologne': 'poland',
-        'none': np.nan,
-        'inde': 'india',
-        'autriche': 'austria',
-        'espagne': 'spain',
-        'united-kingdom': 'united kingdom',
-        'hongrie': 'hungary',
-        'république tchèque': 'czech republic',
-        'france': 'france',
-        'united-states': 'united states',
-        'république tchèque': 'czech republic',
-        'united-kingdom': 'united kingdom',
-        'thailande': 'thailand',
-        'états-unis': 'united states',
-        'egypte': 'egypt',
-        'états-unis': 'united states',
-        'territoires palestiniens': 'palestine',
-        'irlande': 'ireland',
-        'états-unis': 'united states',
-        'japon': 'japan',
-        'canada': 'canada',
-        'réunion': 'france',
-        'monde': 'world',
-        'france': 'france',
-        'croatie': 'croatia',
-        'irlande': 'ireland',
-        'allemagne': 'germany',
-        'états-unis': 'united states',
-        'suisse': 'switzerland',
-        'taiwan': 'taiwan',
-        'belgique': 'belgium',
-        'luxembourg': 'luxembourg',
-        'argentine': 'argentina',
-        'maroc': 'morocco',
-        'brésil': 'brazil',
-        'belgique': 'belgium',
-        'allemagne': 'germany',
-        'france': 'france',
-        'guatemala': 'guatemala',
-        'australie': 'australia',
-        'mexique': 'mexico',
-        'arabie saoudite': 'saudi arabia',
-        'arabie saoudite': 'saudi arabia',
-        'émirats arabes unis': 'united arab emirates',
-        'irak': 'iraq',
-        'koweït': 'kuwait',
-        'émirats arabes unis': 'united arab emirates',
-        'roumanie': 'romania',
-        'costa rica': 'costa rica',
-        'moldavie': 'moldova',
-        'martinique': 'france',
-        'new caledonia': 'australia',
-        'singapore': 'singapore',
-        'sverige': 'sweden',
-        'usa': 'united states',
-        'polynésie française': 'french polynesia',
-        'french polynesia': 'french polynesia',
-        'at': 'austria',
-        'suiza': 'switzerland',
-        'mexique': 'mexico',
-        'ch': 'switzerland',
-        'panamá': 'panama',
-        'nouvelle-calédonie': 'france',
-        'panama': 'panama',
-        'brazil': 'brazil',
-        'australien': 'australia',
-        'kanada': 'canada',
-        'russia': 'russia',
-        'vereinigtes königreich': 'united kingdom',
-        'países bajos': 'netherlands',
-        'norway': 'norway',
-        'reino unido': 'united kingdom',
-        'monde': 'world',
-        'yhdysvallat': 'united states',
-        'suomi': 'finland',
-        'made in canada from domestic and imported ingredients.': 'canada',
-        'regno unito': 'united kingdom',
-        'finland': 'finland',
-        'ประเทศฝรั่งเศส': 'france',
-        'สหราชอาณาจักร': 'united kingdom',
-        '法国': 'france',
-        '香港': 'hong kong',
-        'hong kong': 'hong kong',
-        'maurice': 'mauritius',
-        'ประเทศไทย (thai)': 'thailand',
-        '中华人民共和国': 'china',
-        'liban': 'lebanon',
-        'philippines': 'philippines',
-        'niederlande': 'netherlands',
-        'belgien': 'belgium',
-        'belgio': 'belgium',
-        'germania': 'germany',
-        'belgia': 'belgium',
-        'sveitsi': 'switzerland',
-        'saksa': 'germany',
-        'ranska': 'france',
-        'espanja': 'spain',
-        'yhdistynyt kuningaskunta': 'united kingdom',
-        'spagna': 'spain',
-        'malaysia': 'malaysia',
-        'guyana': 'guyana',
-        'hungary': 'hungary',
-        'mundo': 'world',
-        'canadá': 'canada',
-        'barbados': 'barbados',
-        '中華民國': 'taiwan',
-        'mexiko': 'mexico',
-        'saint kitts and nevis': 'saint kitts and nevis',
-        'us': 'united states',
-        'haïti': 'haiti',
-        'el salvador': 'el salvador',
-        'china': 'china',
-        'bahreïn': 'bahrain',
-        'italie': 'italy',
-        'serbia': 'serbia',
-        'フランス': 'france',
-        'colombia': 'colombia',
-        'réunion': 'france',
-        'lebanon': 'lebanon',
-        'oman': 'oman',
-        'corée du sud': 'south korea',
-        'trinidad and tobago': 'trinidad and tobago',
-        'sénégal': 'senegal',
-        'γαλλία': 'france',
-        'ελλάδα': 'greece',
-        'greece': 'greece',
-        'niemcy': 'germany',
-        'cuba': 'cuba',
-        'portugal': 'portugal',
-        'kuwait': 'kuwait',
-        'österreich': 'austria',
-        'französisch-polynesien': 'french polynesia',
-        'israël': 'israel',
-        'israel': 'israel',
-        'puerto rico': 'puerto rico',
-        'the bahamas': 'bahamas',
-        'en': 'united kingdom',
-        'polen': 'poland',
-        'schweden': 'sweden',
-        'aruba': 'aruba',
-        'polinesia francesa': 'french polynesia',
-        '美国': 'united states',
-        'uk': 'united kingdom',
-        'angola': 'angola',
-        'bolivie': 'bolivia',
-        'frança': 'france',
-        'maroc': 'morocco',
-        'アメリカ合衆国': 'united states',
-        'noruega': 'norway',
-        'dominican republic': 'dominican republic',
-        'wielka brytania': 'united kingdom',
-        'guinée': 'united states',
-        'jordan': 'jordan',
-        'burkina faso': 'burkina faso',
-        'it': 'italy',
-        'vietnam': 'vietnam',
-        'pakistan': 'pakistan',
-        'العراق': 'iraq',
-        'россия': 'russia',
-        'франция': 'france',
-        'българия': 'bulgaria',
-        'algérie': 'algeria',
-        'saint pierre and miquelon': 'saint pierre and miquelon',
-        'كندا': 'canada',
-        'saint-pierre-et-miquelon': 'saint pierre and miquelon',
-        'ascension island': 'ascension island',
-        'côte d\'ivoire': 'ivory coast',
-        'jan mayen': 'norway',
-        'uruguay': 'uruguay',
-        'lb': 'lebanon',
-        'haiti': 'haiti',
-        '加拿大': 'canada',
-        'new-caledonia': 'france',
-        'gb': 'united kingdom',
-        'england': 'united kingdom',
-        'svizzera': 'switzerland',
-        'bélgica': 'belgium',
-        'russland': 'russia',
-        'mauritius': 'mauritius',
-        'indonésie': 'indonesia',
-        'arménie': 'armenia',
-        '瑞士': 'switzerland',
-        'autriche': 'austria',
-        'grecia': 'greece',
-        'grèce': 'greece',
-        'india': 'india',
-        'poland': 'poland',
-        'curaçao': 'curaçao',
-        'perancis': 'france',
-        'indonesia': 'indonesia',
-        'selandia baru': 'new zealand',
-        'swiss': 'switzerland',
-        'finnland': 'finland',
-        'polska': 'poland',
-        'südkorea': 'south korea',
-        'south africa': 'south africa',
-        'ecuador': 'ecuador',
-        'chile': 'chile',
-        'perú': 'peru',
-        'honduras': 'honduras',
-        'nicaragua': 'nicaragua',
-        'turkey': 'turkey',
-        'arabie saoudite': 'saudi arabia',
-        'spojené státy americké': 'united states',
-        'meksyk': 'mexico',
-        'émirats arabes unis': 'united arab emirates',
-        'croatia': 'croatia',
-        'cambodia': 'cambodia',
-        'neukaledonien': 'france',
-        'republik china': 'china',
-        'spojené království': 'united kingdom',
-        'guernsey': 'guernsey',
-        'mauricio': 'mauritius',
-        'singapour': 'singapore',
-        'european union': 'europe',
-        'jamaica': 'jamaica',
-        'denmark': 'denmark',
-        'luxemburg': 'luxembourg',
-        'hawaii': 'united states',
-        'german democratic republic': 'germany', 
-        'corea del sur': 'south korea',
-        'tunisie': 'tunisia',
-        'soviet union': 'russia', 
-        'algeria': 'algeria',
-        'jordanie': 'jordan',
-        'ประเทศสวิตเซอร์แลนด์': 'switzerland',
-        'fr  €': 'france', 
-        'hongkong': 'hong kong',
-        'verenigde staten van amerika': 'united states',
-        'ηνωμένο βασίλειο': 'united kingdom',
-        'république démocratique du congo': 'democratic republic of the congo',
-        'tunísia': 'tunisia',
-        'togo': 'togo',
-        'qatar': 'qatar',
-        'dinamarca': 'denmark',
-        'guyane': 'french guiana',
-        'union européenne': 'europe',
-        'bulgaria': 'bulgaria',
-        'zjednoczone królestwo': 'united kingdom',
-        'somalía': 'somalia',
-        'unión europea': 'europe',
-        'líbano': 'lebanon',
-        'belgië': 'belgium',
-        'peru': 'peru',
-        'luxemburgo': 'luxembourg',
-        'zwitserland': 'switzerland',
-        'jordanien': 'jordan',
-        'تونس': 'tunisia',
-        'république tchèque': 'czech republic',
-        'românia': 'romania',
-        'saint-pierre und miquelon': 'saint pierre and miquelon',
-        'égypte': 'egypt',
-        'monaco': 'monaco',
-        'cyprus': 'cyprus',
-        'الجزائر': 'algeria',
-        'vezuela': 'venezuela',
-        'finlande': 'finland',
-        '日本': 'japan',
-        'afrique du sud': 'south africa',
-        'cayman islands': 'cayman islands',
-        'الإمارات العربية المتحدة': 'united arab emirates',
-        'irlanda': 'ireland',
-        'paraguay': 'paraguay',
-        'denemarken': 'denmark',
-        'italië': 'italy',
-        'noorwegen': 'norway',
-        'spanje': 'spain',
-        'zweden': 'sweden',
-        'لبنان': 'lebanon',
-        'فرنسا': 'france',
-        'cameroon': 'cameroon',
-        'mongolia': 'mongolia',
-        'irland': 'ireland',
-        'myanmar': 'myanmar',
-        'marruecos': 'morocco',
-        'भारत': 'india',
-        'senegal': 'senegal',
-        'tchad': 'chad',
-        'suriname': 'suriname',
-        'bulgarie': 'bulgaria',
-        'albania': 'albania',
-        'chili': 'chile',
-        'norwegen': 'norway',
-        'cameroun': 'cameroon',
-        'virgin islands of the united states': 'united states',
-        'japón': 'japan',
-        'الولايات المتحدة': 'united states',
-        'bangladesh': 'bangladesh',
-        'australië': 'australia',
-        'nieuw-zeeland': 'new zealand',
-        'slowakije': 'slovakia',
-        'dominica': 'dominica',
-        'méxico': 'mexico',
-        'suecia': 'sweden',
-        'бельгия': 'belgium',
-        'nigeria': 'nigeria',
-        'mađarska': 'hungary',
-        'italija': 'italy',
-        'poljska': 'poland',
-        'japon': 'japan',
-        'বাংলাদেশ': 'bangladesh',
-        'włochy': 'italy',
-        'hiszpania': 'spain',
-        'szwajcaria': 'switzerland',
-        'frankrike': 'france',
-        'lotyšsko': 'latvia',
-        'litva': 'lithuania',
-        'polsko': 'poland',
-        'djibouti': 'djibouti',
-        'dänemark': 'denmark',
-        'tyskland': 'germany',
-        'finlândia': 'finland',
-        'espanha': 'spain',
-        'suécia': 'sweden',
-        'lithuania': 'lithuania',
-        'suíça': 'switzerland',
-        'south korea': 'south korea',
-        'švedska': 'sweden',
-        'německo': 'germany',
-        'islande': 'iceland',
-        'grécia': 'greece',
-        'itália': 'italy',
-        'polónia': 'poland',
-        'hongrie': 'hungary',
-        'serbie': 'serbia',
-        'союз советских социалистических республик': 'ussr',
-        'brésil': 'brazil',
-        'ukraine': 'ukraine',
-        'ísland': 'iceland',
-        'türkiye': 'turkey',
-        'madagascar': 'madagascar',
-        'macau': 'macau',
-        'franța': 'france',
-        'україна': 'ukraine',
-        'latvia': 'latvia',
-        'estonia': 'estonia',
-        'германия': 'germany',
-        'швейцария': 'switzerland',
-        'duitsland': 'germany',
-        'südafrika': 'south africa',
-        'bulharsko': 'bulgaria',
-        'czech-republic': 'czech republic',
-        'nizozemsko': 'netherlands',
-        'austrija': 'austria',
-        'alemanha': 'germany',
-        'áustria': 'austria',
-        'némorszag': 'hungary',
-        'kroatien': 'croatia',
-        'csehország': 'czech republic',
-        'lengyelország': 'poland',
-        'svédország': 'sweden',
-        'rumania': 'romania',
-        'ungarn': 'hungary',
-        'países baixos': 'netherlands',
-        'австрия': 'austria',
-        'финландия': 'finland',
-        'швеция': 'sweden',
-        'bulgarien': 'bulgaria',
-        'tschechien': 'czech republic',
-        'slowakei': 'slovakia',
-        'slowenien': 'slovenia',
-        'lituania': 'lithuania',
-        'испания': 'spain',
-        'república checa': 'czech republic',
-        'marrocos': 'morocco',
-        'полша': 'poland',
-        'румъния': 'romania',
-        'сърбия': 'serbia',
-        'хърватия': 'croatia',
-        'ungheria': 'hungary',
-        'storbritannien': 'united kingdom',
-        'rumänien': 'romania',
-        'finlandia': 'finland',
-        'polonia': 'poland',
-        'италия': 'italy',
-        'украина': 'ukraine',
-        'белгия': 'belgium',
-        'griechenland': 'greece',
-        'alankomaat': 'netherlands',
-        'olaszország': 'hungary',
-        'románia': 'romania',
-        'danmark': 'denmark',
-        'amerikai egyesült államok': 'united states',
-        'ruotsi': 'finland',
-        'tanska': 'denmark',
-        'paesi bassi': 'netherlands',
-        'france switzerland germany': 'france',
-        'nederländerna': 'sweden',
-        'унгария': 'hungary',
-        'nizozemska': 'netherlands',
-        'španjolska': 'spain',
-        'ujedinjeno kraljevstvo': 'united kingdom',
-        'espanya': 'spain',
-        'regne unit': 'united kingdom',
-        'norwegia': 'norway',
-        'hongarije': 'hungary',
-        'češka': 'czech republic',
-        'slovačka': 'slovakia',
-        'lu': 'luxembourg',
-        'república da irlanda': 'ireland',
-        'švédsko': 'sweden',
-        'rakousko': 'austria',
-        'serbien': 'serbia',
-        'czechy': 'czech republic',
-        'litwa': 'lithuania',
-        'holandia': 'netherlands',
-        'słowacja': 'slovakia',
-        'itálie': 'italy',
-        'prancūzija': 'france',
-        'vokietija': 'germany',
-        'šveicarija': 'switzerland',
-        'lietuva': 'lithuania',
-        'slovensko': 'slovakia',
-        'croácia': 'croatia',
-        'sérvia': 'serbia',
-        'eslováquia': 'slovakia',
-        'eslovénia': 'slovenia',
-        'birleşik krallık': 'united kingdom',
-        'slovakia': 'slovakia',
-        'republik zypern': 'cyprus',
-        'bułgaria': 'bulgaria',
-        'eslovenia': 'slovenia',
-        'bulgária': 'bulgaria',
-        'hungria': 'hungary',
-        'roménia': 'romania',
-        'puola': 'poland',
-        'slovenija': 'slovenia',
-        'srbija': 'serbia',
-        'bugarska': 'bulgaria',
-        'svezia': 'sweden',
-        'nouvelle-zélande': 'new zealand',
-        'görögország': 'greece',
-        'belgicko': 'belgium',
-        'francúzsko': 'france',
-        'nemecko': 'germany',
-        'rusko': 'russia',
-        'croatie': 'croatia',
-        'croacia': 'croatia',
-        'hungría': 'hungary',
-        'švýcarsko': 'switzerland',
-        'dania': 'denmark',
-        'grecja': 'greece',
-        'szwecja': 'sweden',
-        'albanien': 'albania',
-        'estonija': 'estonia',
-        'latvija': 'latvia',
-        'švajčiarsko': 'switzerland',
-        'oostenrijk': 'austria',
-        'united kingdom & ireland': 'united kingdom',
-        'eslovaquia': 'slovakia',
-        'słowenia': 'slovenia',
-        'francija': 'france',
-        'moldova': 'moldova',
-        'malta': 'malta',
-        'съединени американски щати': 'united states',
-        'обединено кралство великобритания и северна ирландия': 'united kingdom',
-        'slovénie': 'slovenia',
-        'rumunsko': 'romania',
-        'tsjechië': 'czech republic',
-        'slovacchia': 'slovakia',
-        'slovaquie': 'slovakia',
-        'łotwa': 'latvia',
-        'lituânia': 'lithuania',
-        'maďarsko': 'hungary',
-        'španělsko': 'spain',
-        'gabon': 'gabon',
-        'španielsko': 'spain',
-        'belgija': 'belgium',
-        'grčka': 'greece',
-        'србија': 'serbia',
-        'ie': 'ireland',
-        'frankrig': 'denmark',
-        'rumunjska': 'romania',
-        'portogallo': 'portugal',
-        'إيطاليا': 'italy',
-        'чехия': 'czech republic',
-        'republika srpska': 'bosnia and herzegovina',
-        'cn': 'china',
-        'chine': 'china',
-        'austrália': 'australia',
-        'iran': 'iran',
-        'algerien': 'algeria',
-        'nederlân': 'netherlands',
-        'pérou': 'peru',
-        'švica': 'switzerland',
-        'スペイン': 'spain',
-        'kína': 'china',
-        'ausztria': 'austria',
-        'bèlgica': 'belgium',
-        'belgie': 'belgium',
-        'austrálie': 'australia',
-        '대한민국': 'south korea',
-        'french guiana': 'french guiana',
-        're': 'reunion',
-        'af': 'afghanistan',
-        'argelia': 'algeria',
-        'argentine': 'argentina',
-        'colombie': 'colombia',
-        'russie': 'russia',
-        'mali': 'mali',
-        'martinica': 'martinique',
-        'reunión': 'reunion',
-        'reunion': 'reunion',
-        'jp': 'japan',
-        'guadalupe': 'reunion',
-        'cote-d-ivoire': 'ivory coast',
-        'казахстан': 'kazakhstan',
-        'afghanistan': 'afghanistan',
-        'saint-martin': 'saint martin',
-        'marocco': 'morocco',
-        'biélorussie': 'belarus',
-        'mq': 'martinique',
-        'kazakhstan': 'kazakhstan',
-        'marokko': 'morocco',
-        'tunisia': 'tunisia',
-        'république du congo': 'republic of the congo',
-        'maroko': 'morocco',
-        'mayotte': 'mayotte',
-        'estonie': 'estonia',
-        'french-polynesia': 'french polynesia',
-        'thaïlande': 'thailand',
-        'австралия': 'australia',
-        'мароко': 'morocco',
-        'нова зеландия': 'new zealand',
-        'estónia': 'estonia',
-        'andorra': 'andorra',
-        'nova zelândia': 'new zealand',
-        'rússia': 'russia',
-        'tailandia': 'thailand',
-        'ประเทศออสเตรเลีย': 'australia',
-        'ประเทศออสเตรีย': 'austria',
-        'ประเทศเบลเยียม': 'belgium',
-        'ประเทศเยอรมนี': 'germany',
-        'ประเทศอิตาลี': 'italy',
-        'ประเทศเลบานอน': 'lebanon',
-        'ประเทศโมร็อกโก': 'morocco',
-        'ประเทศโรมาเนีย': 'romania',
-        'ประเทศสเปน': 'spain',
-        'åland islands': 'finland',
-        'bielorussia': 'belarus',
-        'frakland': 'france',
-        '#value!': np.nan,
-        'nl': 'netherlands',
-        'koeweit': 'kuwait',
-        'dom tom': 'france',
-        'алжир': 'algeria',
-        'reunião': 'reunion',
-        'dom-tom': 'france',
-        'ประเทศรัสเซีย': 'russia',
-        'สหรัฐอเมริกา': 'united states',
-        'sg': 'singapore',
-        'svájc': 'switzerland',
-        'латвия': 'latvia',
-        'грузия': 'georgia',
-        'nueva caledonia': 'australia',
-        'ru': 'russia',
-        'seychelles': 'seychelles',
-        'costa de marfil': 'ivory coast',
-        'sjedinjene američke države': 'united states',
-        'danska': 'denmark',
-        'rusija': 'russia',
-        'burkina-faso': 'burkina faso',
-        'norge': 'norway',
-        'li': 'liechtenstein',
-        'реюнион': 'reunion',
-        'lussemburgo': 'luxembourg',
-        'vanuatu': 'vanuatu',
-        'roemenië': 'romania',
-        'rumunia': 'romania',
-        'ma': 'morocco',
-        'viêt nam': 'vietnam',
-        'albanie': 'albania',
-        'argélia': 'algeria',
-        'pas': np.nan,
-        'kh': 'cambodia',
-        'الأردن': 'jordan',
-        'mf': 'saint martin',
-        'french-guiana': 'french guiana',
-        'mongolie': 'mongolia',
-        'gp': 'reunion',
-        'französisch-guayana': 'french guiana',
-        'nuova caledonia': 'australia',
-        'france la réunion': 'reunion',
-        'сенегал': 'senegal',
-        'cambodge': 'cambodia',
-        'jersey': 'jersey',
-        'france 🇨🇵🇫🇷': 'france',
-        'gf': 'french guiana',
-        'angleterre': 'england',
-        'andorre': 'andorra',
-        'irak': 'iraq',
-        'emirats arabes unis': 'united arab emirates',
-        'democratic republic of the congo': 'democratic republic of the congo',
-        'bulgarije': 'bulgaria',
-        'griekenland': 'greece',
-        'république dominicaine': 'dominican republic',
-        'spania': 'spain',
-        'nc': 'australia',
-        'ucrania': 'ukraine',
-        'welt': 'world',
-        'liechtenstein': 'liechtenstein',
-        'estland': 'estonia',
-        'hollande': 'netherlands',
-        'turquie': 'turkey',
-        'mauritanie': 'mauritania',
-        'iceland': 'iceland',
-        'сингапур': 'singapore',
-        'szerbia': 'serbia',
-        'srbsko': 'serbia',
-        'georgia': 'georgia',
-        'ungaria': 'hungary',
-        'avstrija': 'austria',
-        'hrvaška': 'croatia',
-        'republika srbska': 'bosnia and herzegovina',
-        'bosna in hercegovina': 'bosnia and herzegovina',
-        'črna gora': 'montenegro',
-        'bosna i hercegovina': 'bosnia and herzegovina',
-        'sjeverna makedonija': 'north macedonia',
-        'albanija': 'albania',
-        'saudijska arabija': 'saudi arabia',
-        'republic of macedonia': 'north macedonia',
-        'bosnia and herzegovina': 'bosnia and herzegovina',
-        'montenegro': 'montenegro',
-        'nordmazedonien': 'north macedonia',
-        'szlovákia': 'slovakia',
-        'француска': 'france',
-        'босна и херцеговина': 'bosnia and herzegovina',
-        'crna gora': 'montenegro',
-        'црна гора': 'montenegro',
-        'nya kaledonien': 'australia',
-        'singapur': 'singapore',
-        'русија': 'russia',
-        'prantsusmaa': 'france',
-        'hispaania': 'spain',
-        'eesti': 'estonia',
-        'saksamaa': 'germany',
-        'dánsko': 'denmark',
-        'chińska republika ludowa': 'china',
-        'нидерландия': 'netherlands',
-        'estija': 'estonia',
-        'suomija': 'finland',
-        'rumunija': 'romania',
-        'švedija': 'sweden',
-        'jungtinė karalystė': 'united kingdom',
-        'chipre': 'cyprus',
-        'κύπρος': 'cyprus',
-        'белоруссия': 'belarus',
-        'bělorusko': 'belarus',
-        'argentinien': 'argentina',
-        'saudi-arabien': 'saudi arabia',
-        'イギリス': 'united kingdom',
-        'bahrain': 'bahrain',
-        'deutsche demokratische republik': 'east germany',
-        'немачка': 'germany',
-        'німеччина': 'germany',
-        'польща': 'poland',
-        'węgry': 'hungary',
-        'north macedonia': 'north macedonia',
-        'swaziland': 'eswatini',
-        'elveția': 'switzerland',
-        'macédoine du nord': 'north macedonia',
-        'east germany': 'germany',
-        'chypre': 'cyprus',
-        'بلجيكا': 'belgium',
-        'ألمانيا': 'germany',
-        'island': 'iceland',
-        'alemanya': 'germany',
-        'ليبيا': 'libya',
-        'росія': 'russia',
-        'unkari': 'hungary',
-        'lucembursko': 'luxembourg',
-        'chorvatsko': 'croatia',
-        'rusland': 'russia',
-        'no': 'norway',
-        'danimarca': 'denmark',
-        'kosovo': 'kosovo',
-        'bolivien': 'bolivia',
-        'deut': 'germany',
-        'rusia': 'russia',
-        'belarus': 'belarus',
-        'kyrgyzstan': 'kyrgyzstan',
-        'tajikistan': 'tajikistan',
-        'uzbekistan': 'uzbekistan',
-        'armenia': 'armenia',
-        'азербайджан': 'azerbaijan',
-        'azerbaijan': 'azerbaijan',
-        'australija': 'australia',
-        'lettonie': 'latvia',
-        'lettland': 'latvia',
-        'fransa': 'france',
-        'aserbaidschan': 'azerbaijan',
-        'lituanie': 'lithuania',
-        'jungtinės amerikos valstijos': 'united states',
-        'sri lanka': 'sri lanka',
-        'เขตบริหารพิเศษฮ่องกง': 'hong kong',
-        'นิวแคลิโดเนีย': 'australia',
-        'neuseeland': 'new zealand',
-        'таджикистан': 'tajikistan',
-        'франція': 'france',
-        'латвія': 'latvia',
-        'ucrânia': 'ukraine',
-        'ucraina': 'ukraine',
-        'republica moldova': 'moldova',
-        'moldavie': 'moldova',
-        'géorgie': 'georgia',
-        'საქართველო': 'georgia',
-        'hong-kong': 'hong kong',
-        'قطر': 'qatar',
-        '中華民国': 'taiwan',
-        '澳门': 'macau',
-        'mozambique': 'mozambique',
-        'arabia saudita': 'saudi arabia',
-        'ישראל': 'israel',
-        'irlandia': 'ireland',
-        'zjednoczone emiraty arabskie': 'united arab emirates',
-        'norja': 'norway',
-        'المملكة المتحدة': 'united kingdom',
-        'المغرب': 'morocco',
-        'republic of ireland': 'ireland',
-        'europäische union': 'europe',
-        'franciaország': 'france', 
-        'spanien': 'spain', 
-        'česko': 'czech republic', 
-        'francie': 'france', 
-        'nagy-britannia': 'united kingdom', 
-        'magyarország': 'hungary', 
-        'frankrijk': 'france', 
-        'verenigd koninkrijk': 'united kingdom', 
-        'vereinigte staaten von amerika': 'united states', 
-        'la réunion': 'reunion', 
-        'svijet': 'world', 
-        'francuska': 'france', 
-        'hrvatska': 'croatia', 
-        'irska': 'ireland', 
-        'njemačka': 'europe', 
-        'sjedinjene-američke-države': 'united states', 
-        'švicarska': 'switzerland', 
-        "stati uniti d'america": 'united states', 
-        'saint kitts and nevis': 'united states', 
-        'el salvador': 'salvador', 
-        'emiratos árabes unidos': 'united arab emirates', 
-        'francja': 'france', 
-        'stany zjednoczone': 'united states', 
-        'brasil': 'brazil', 
-        'guernsey': 'united kingdom', 
-        'french guiana': 'united states', 
-        'saint pierre and miquelon': 'united states', 
-        'trinidad and tobago': 'united states',
-        'mŕxico': 'mexico', 
-        'latvia': 'lithuania', 
-        'ussr': 'russia', 
-        'macau': 'china', 
-        'németország': 'germany', 
-        'litauen': 'lithuania', 
-        'saint martin': 'reunion', 
-        'guadeloupe': 'reunion', 
-        'republic of the congo': 'democratic republic of the congo', 
-        'mayotte': 'reunion', 
-        'new caledonia': 'australia', 
-        'seychelles': 'reunion', 
-        'liechtenstein': 'switzerland',
-        'france - la réunion': 'reunion', 
-        'jersey': 'united kingdom', 
-        'england': 'united kingdom', 
-        'madagascar': 'reunion', 
-        'east germany': 'germany', 
-        'bangladesh': 'india', 
-        'francia  españa': 'france', 
-        'france  spain': 'france', 
-        'palestinian territories': 'palestine', 
-        'europäische union': 'europe', 
-        'soviet union': 'russia', 
-        'republic of ireland': 'ireland', 
-        'middle east:': 'romania',
-        'saint': 'united states', 
-        'papua new guinea': 'united states',
-        'канада': 'canada', 
-        'south america': 'peru',
-        'zimbabwe': 'reunion', 
-        'america': 'united states',
-        'product of usa. packed in canada.  imported by: strong international trading inc. richmond bc | www.siti.ca': 'united states', 
-        'natural calm canada 5 idleswift dr.  thornhill on  l4j 1k6': 'canada', 
-    }
-    countries_to_num = [
+COUNTRIES_TO_NUM = [
     {"id": 1, "country": "afghanistan"},
     {"id": 2, "country": "albania"},
     {"id": 3, "country": "algeria"},
@@ -2123,39 +2108,118 @@ def countries_processing(df, values_to_replace):
     {"id": 193, "country": "yemen"},
     {"id": 194, "country": "zambia"},
     {"id": 195, "country": "zimbabwe"}
-    ]
-    df['countries'] = df['countries'].replace(values_to_replace, np.nan)
-    df['countries'] = df['countries'].apply(lambda x: x.split(', ') if isinstance(x, str) else ([] if pd.isna(x) else x))
-    df['countries'] = df['countries'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
-    df['countries'] = df['countries'].str.lower()
-    df['countries'] = df['countries'].apply(clean_abrev)
-    df['countries'] = df['countries'].replace(country_mapping)
-    country_counts = df['countries'].value_counts(normalize=True)
-    rare_countries = country_counts[country_counts < 0.001].index
-    def replace_rare_countries(countries):
-        if isinstance(countries, str):
-            countries_list = [c.strip() for c in countries.split(',')]
-            updated_countries = [c if c not in rare_countries else np.nan for c in countries_list]
-            return ', '.join(filter(lambda x: x is not np.nan, updated_countries)) if updated_countries else np.nan
-        return np.nan
-    df['countries'] = df['countries'].apply(replace_rare_countries)
-    df['countries'] = df['countries'].apply(lambda x: 'world' if ',' in x else x)
-    df['countries'] = df['countries'].replace(values_to_replace, np.nan)
-    country_to_id = {entry["country"]: entry["id"] for entry in countries_to_num}
-    df['countries'] = df['countries'].map(country_to_id).fillna(np.nan)
+]
+COUNTRY_TO_ID = {entry["country"]: entry["id"] for entry in COUNTRIES_TO_NUM}
+
+# grades a -> e (ecoscore, nutriscore) et groupes pnns, vocabulaires partagés de encoders.py
+GRADE_MAP = {grade: code for code, grade in enumerate(GRADES)}
+PNNS_1_MAP = {group: code for code, group in enumerate(PNNS_1_GROUPS)}
+
+# jsonl 02 unique, ou shards laissés par 01_keep_usefull_columns.py (keep_shards)
+def input_files(jsonl_02):
+    if os.path.exists(jsonl_02):
+        return [jsonl_02]
+    return list_shards(jsonl_02)
+
+def delete_file(file_path):
+    if keep_intermediates():
+        print(f"file kept for orchestrator: {file_path}")
+    elif os.path.exists(file_path):
+        os.remove(file_path)
+        print(f"file deleted: {file_path}")
+    else:
+        print(f"ERROR, does not exists: {file_path}")
+
+def rename_columns_processing(df): 
+    df.rename(columns={'pnns_groups_1': 'pnns_1'}, inplace=True)
+    df.rename(columns={'ingredients_tags': 'ingredients_temp'}, inplace=True)
+    df.rename(columns={'product_name': 'name'}, inplace=True)
+    df.rename(columns={'categories_tags': 'categories_temp'}, inplace=True)
+    df.rename(columns={'food_groups_tags': 'food_group'}, inplace=True)
+    df.rename(columns={'nova_group': 'nova'}, inplace=True)
+    df.rename(columns={'ingredients_from_or_that_may_be_from_palm_oil_n': 'palm_oil'}, inplace=True)
+    df.rename(columns={'nutrient_levels_tags': 'nutrient_level'}, inplace=True)
+    df.rename(columns={'additives_old_n': 'additives'}, inplace=True)
+    df.rename(columns={'_keywords': 'keywords'}, inplace=True)
+    df.rename(columns={'packaging_tags': 'packaging'}, inplace=True)
+    df.rename(columns={'compared_to_category': 'main_category'}, inplace=True)
+    return df
+
+# codes iso alpha-2 (Collecte-datas/countries-en.csv) -> nom anglais, pour les codes restant
+# après suppression du préfixe de langue ('en:sn' -> 'sn') et absents de COUNTRY_MAPPING
+ISO_COUNTRIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Collecte-datas', 'countries-en.csv')
+LANGUAGE_PREFIX = re.compile(r'\b\w{2}:\b')
+
+def load_iso_countries(csv_path):
+    iso_countries = {}
+    if not os.path.exists(csv_path):
+        return iso_countries
+    with open(csv_path, 'r', encoding='utf-8') as file:
+        for row in csv.reader(file):
+            code, name = row[2].lower(), row[5].lower()
+            name = COUNTRY_MAPPING.get(name, name)
+            if code not in COUNTRY_MAPPING and name in COUNTRY_TO_ID:
+                iso_countries[code] = name
+    return iso_countries
+
+ISO_COUNTRIES = load_iso_countries(ISO_COUNTRIES_PATH)
+# mémoïsation entre les morceaux: texte brut -> pays normalisé, pays normalisé -> liste des pays
+NORMALIZED_COUNTRIES = {}
+COUNTRY_PARTS = {}
+
+def normalize_country(countries):
+    normalized = NORMALIZED_COUNTRIES.get(countries)
+    if normalized is None:
+        normalized, prefixes = LANGUAGE_PREFIX.subn('', countries.lower())
+        normalized = normalized.strip()
+        if prefixes and normalized not in COUNTRY_MAPPING:
+            normalized = ISO_COUNTRIES.get(normalized, normalized)
+        normalized = COUNTRY_MAPPING.get(normalized, normalized)
+        NORMALIZED_COUNTRIES[countries] = normalized
+    return normalized
+
+# valeur brute -> pays normalisé ('' pour les valeurs manquantes ou à remplacer)
+def normalize_country_value(value, replaced):
+    if isinstance(value, list):
+        value = ', '.join(value)
+    if not isinstance(value, str):
+        return '' if pd.isna(value) else np.nan
+    return '' if value in replaced else normalize_country(value)
+
+def rare_values(counts, threshold=0.001):
+    total = sum(counts.values())
+    return {value for value, count in counts.items() if count / total < threshold}
+
+# pays normalisés puis identifiant numérique; les pays rares (fréquence relative < 0.001 sur tout
+# le fichier si rare_countries est fourni, sinon dans le morceau) sont retirés, plusieurs pays
+# restants -> 'world'
+def country_ids(countries, values_to_replace, rare_countries=None):
+    replaced = {value for value in values_to_replace if isinstance(value, str)}
+    normalized = map_unique(countries, lambda uniques: uniques.map(lambda value: normalize_country_value(value, replaced)))
+    if rare_countries is None:
+        rare_countries = rare_values(normalized.value_counts().to_dict())
+    def to_id(normalized):
+        if not isinstance(normalized, str):
+            return np.nan
+        parts = COUNTRY_PARTS.get(normalized)
+        if parts is None:
+            parts = COUNTRY_PARTS[normalized] = [c.strip() for c in normalized.split(',')]
+        kept = ', '.join(c for c in parts if c not in rare_countries)
+        if ',' in kept:
+            kept = 'world'
+        return np.nan if kept in replaced else COUNTRY_TO_ID.get(kept, np.nan)
+    return map_unique(normalized, lambda uniques: uniques.map(to_id).astype(float))
+
+def countries_processing(df, values_to_replace, rare_countries=None): 
+    df['countries'] = country_ids(df['countries'], values_to_replace, rare_countries)
     return df
 
 def ecoscore_tags_processing(df, values_to_replace): 
     df['ecoscore_tags'] = df['ecoscore_tags'].replace(values_to_replace, np.nan) 
     df['ecoscore_tags'] = df['ecoscore_tags'].astype(str)
     df['ecoscore_tags'] = df['ecoscore_tags'].str.lower() 
-    ecoscore_grad_map = {'a': 0,
-                        'b': 1,
-                        'c': 2,
-                        'd': 3,
-                        'e': 4,}
     df['ecoscore_tags'] = df['ecoscore_tags'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
-    df['ecoscore_tags'] = df['ecoscore_tags'].replace(ecoscore_grad_map, regex=True)
+    df['ecoscore_tags'] = df['ecoscore_tags'].replace(GRADE_MAP, regex=True)
     df['ecoscore_tags'] = pd.to_numeric(df['ecoscore_tags'], errors='coerce')
     return df
 
@@ -2169,19 +2233,8 @@ def pnns_1_processing(df, values_to_replace):
     df['pnns_1'] = df['pnns_1'].replace(values_to_replace, np.nan) 
     df['pnns_1'] = df['pnns_1'].astype(str)
     df['pnns_1'] = df['pnns_1'].str.lower() 
-    ecoscore_grad_map = {'sugary snacks': 0,
-                        'fat and sauces': 1,
-                        'composite foods': 2,
-                            'fruits and vegetables': 3,
-                            'milk and dairy products': 4, 
-                            'cereals and potatoes': 5, 
-                            'fish meat eggs': 6, 
-                            'beverages': 7, 
-                            'alcoholic beverages': 8, 
-                            'salty snacks': 9, 
-                            'sugary-snacks': 10}
     df['pnns_1'] = df['pnns_1'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
-    df['pnns_1'] = df['pnns_1'].replace(ecoscore_grad_map, regex=True)
+    df['pnns_1'] = df['pnns_1'].replace(PNNS_1_MAP, regex=True)
     df['pnns_1'] = pd.to_numeric(df['pnns_1'], errors='coerce')
     df['pnns_1'] = df['pnns_1'].replace(values_to_replace, np.nan) 
     return df
@@ -2272,16 +2325,20 @@ def nutriscore_tags_processing(df, values_to_replace):
     df['nutriscore_tags'] = df['nutriscore_tags'].replace(values_to_replace, np.nan) 
     df['nutriscore_tags'] = df['nutriscore_tags'].astype(str)
     df['nutriscore_tags'] = df['nutriscore_tags'].str.lower() 
-    ecoscore_grad_map = {'a': 0,
-                        'b': 1,
-                        'c': 2,
-                        'd': 3,
-                        'e': 4,}
     df['nutriscore_tags'] = df['nutriscore_tags'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
-    df['nutriscore_tags'] = df['nutriscore_tags'].replace(ecoscore_grad_map, regex=True)
+    df['nutriscore_tags'] = df['nutriscore_tags'].replace(GRADE_MAP, regex=True)
     df['nutriscore_tags'] = pd.to_numeric(df['nutriscore_tags'], errors='coerce')
     return df
 
+# encodage catégoriel (categorical_encoding): recherche exacte dans le vocabulaire, colonnes Int8;
+# le replace regex ci-dessus code la valeur entière dès qu'une clé y apparaît ('nan' et
+# 'not-applicable' -> grade a, 'alcoholic beverages' -> beverages), une valeur inconnue reste <NA> ici
+def categorical_processing(df):
+    df['pnns_1'] = encode_categories(df['pnns_1'], PNNS_1_GROUPS)
+    df['ecoscore_tags'] = encode_grades(df['ecoscore_tags'])
+    df['nutriscore_tags'] = encode_grades(df['nutriscore_tags'])
+    return df
+
 def ecoscore_data_processing(df, values_to_replace):
     df['ecoscore_data'] = df['ecoscore_data'].replace(values_to_replace, 'empty') 
     df['ecoscore_data'] = df['ecoscore_data'].astype(str)
@@ -2290,6 +2347,92 @@ def ecoscore_data_processing(df, values_to_replace):
     df['ecoscore_data'] = df['ecoscore_data'].replace(values_to_replace, 'empty') 
     return df
 
+# ecoscore_data structuré: le dict est parcouru une seule fois au lieu d'être converti en chaîne,
+# valeurs numériques en colonnes typées et texte résiduel compact (noms, matériaux, origines, labels)
+# score/grade/scores/grades/previous_data/status écartés: ce sont les étiquettes à prédire
+ECOSCORE_DATA_NUMERIC = {'ecoscore_co2_total': ('agribalyse', 'co2_total'),
+                         'ecoscore_co2_agriculture': ('agribalyse', 'co2_agriculture'),
+                         'ecoscore_co2_processing': ('agribalyse', 'co2_processing'),
+                         'ecoscore_co2_packaging': ('agribalyse', 'co2_packaging'),
+                         'ecoscore_co2_transportation': ('agribalyse', 'co2_transportation'),
+                         'ecoscore_co2_distribution': ('agribalyse', 'co2_distribution'),
+                         'ecoscore_co2_consumption': ('agribalyse', 'co2_consumption'),
+                         'ecoscore_ef_total': ('agribalyse', 'ef_total'),
+                         'ecoscore_dqr': ('agribalyse', 'dqr'),
+                         'ecoscore_is_beverage': ('agribalyse', 'is_beverage'),
+                         'ecoscore_packaging_value': ('adjustments', 'packaging', 'value'),
+                         'ecoscore_non_recyclable_materials': ('adjustments', 'packaging', 'non_recyclable_and_non_biodegradable_materials'),
+                         'ecoscore_origins_value': ('adjustments', 'origins_of_ingredients', 'value'),
+                         'ecoscore_epi_value': ('adjustments', 'origins_of_ingredients', 'epi_value'),
+                         'ecoscore_transportation_value': ('adjustments', 'origins_of_ingredients', 'transportation_value'),
+                         'ecoscore_production_system_value': ('adjustments', 'production_system', 'value'),
+                         'ecoscore_threatened_species_value': ('adjustments', 'threatened_species', 'value')}
+
+def nested_value(data, path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+def to_number(value):
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+# tag sans préfixe de langue ('en:plastic' -> 'plastic')
+def tag_name(tag):
+    return str(tag).split(':', 1)[-1]
+
+def ecoscore_data_residue(data):
+    words = []
+    agribalyse = data.get('agribalyse')
+    if isinstance(agribalyse, dict) and agribalyse.get('name_en'):
+        words.append(str(agribalyse['name_en']))
+    adjustments = data.get('adjustments')
+    if not isinstance(adjustments, dict):
+        adjustments = {}
+    packagings = nested_value(adjustments, ('packaging', 'packagings'))
+    for packaging in packagings if isinstance(packagings, list) else []:
+        if isinstance(packaging, dict):
+            words.extend(tag_name(packaging[key]) for key in ('material', 'shape') if packaging.get(key))
+    origins = nested_value(adjustments, ('origins_of_ingredients', 'aggregated_origins'))
+    for origin in origins if isinstance(origins, list) else []:
+        if isinstance(origin, dict) and origin.get('origin'):
+            words.append(tag_name(origin['origin']))
+    labels = nested_value(adjustments, ('production_system', 'labels'))
+    if isinstance(labels, list):
+        words.extend(tag_name(label) for label in labels)
+    ingredient = nested_value(adjustments, ('threatened_species', 'ingredient'))
+    if ingredient:
+        words.append(tag_name(ingredient))
+    for adjustment in adjustments.values():
+        if isinstance(adjustment, dict) and adjustment.get('warning'):
+            words.append(str(adjustment['warning']))
+    missing = data.get('missing')
+    if isinstance(missing, dict) and missing:
+        words.append('missing')
+        words.extend(missing)
+    return ' '.join(words) if words else 'empty'
+
+# remplace le dict par son texte résiduel (normalisé ensuite comme le texte complet) et ajoute
+# les colonnes numériques juste après ecoscore_data; une valeur qui n'est pas un dict reste inchangée
+def ecoscore_data_structured(df):
+    values = df['ecoscore_data'].tolist()
+    numbers = [[to_number(nested_value(value, path)) for path in ECOSCORE_DATA_NUMERIC.values()]
+               if isinstance(value, dict) else [np.nan] * len(ECOSCORE_DATA_NUMERIC)
+               for value in values]
+    df['ecoscore_data'] = pd.Series([ecoscore_data_residue(value) if isinstance(value, dict) else value for value in values],
+                                    index=df.index, dtype=object)
+    numeric = pd.DataFrame(numbers, columns=list(ECOSCORE_DATA_NUMERIC), index=df.index, dtype=float)
+    position = df.columns.get_loc('ecoscore_data') + 1
+    for offset, column in enumerate(numeric.columns):
+        df.insert(position + offset, column, numeric[column])
+    return df
+
 def stores_processing(df, values_to_replace):
     df['stores'] = df['stores'].replace(values_to_replace, 'empty') 
     df['stores'] = df['stores'].astype(str)
@@ -2303,36 +2446,644 @@ def delete_useless_lines(df, values_to_replace):
     df = df[~((df['food_group'] == 'empty') & (df['ecoscore_data'] == 'empty'))]
     return df
 
-def process_chunk(chunk, values_to_replace):
+def process_chunk(chunk, values_to_replace, rare_countries=None, ecoscore_data_mode='text', categorical_encoding=False):
     df = chunk.copy()
     rename_columns_processing(df)
+    if ecoscore_data_mode == 'structured':
+        ecoscore_data_structured(df)
+    if categorical_encoding:
+        categorical_processing(df)
+    else:
+        pnns_1_processing(df, values_to_replace)
+        ecoscore_tags_processing(df, values_to_replace)
+        nutriscore_tags_processing(df, values_to_replace)
     ecoscore_score_processing(df, values_to_replace)
-    pnns_1_processing(df, values_to_replace)
     ingredients_processing(df, values_to_replace)
-    ecoscore_tags_processing(df, values_to_replace)
     categories_processing(df, values_to_replace)
     name_processing(df, values_to_replace)
-    countries_processing(df, values_to_replace)
+    countries_processing(df, values_to_replace, rare_countries)
     ecoscore_data_processing(df, values_to_replace)
     food_groups_processing(df, values_to_replace)
     nutrient_level_processing(df, values_to_replace)
     stores_processing(df, values_to_replace)
     main_category_processing(df, values_to_replace)
-    nutriscore_tags_processing(df, values_to_replace)
     keyword_processing(df, values_to_replace)
     packaging_tags_processing(df, values_to_replace)
     delete_useless_lines(df, values_to_replace)
     return df
 
-# lecture et traitement du fichier jsonl en morceaux
-def browse_file(estimated_chunks, jsonl_02, jsonl_03, chunk_size, values_to_replace):
-    chunk_iter = 0
-    with open(jsonl_02, 'r') as infile, open(jsonl_03, 'w') as outfile:
-        for chunk in pd.read_json(infile, lines=True, chunksize=chunk_size):
-            chunk_iter +=1
-            processed_chunk = process_chunk(chunk, values_to_replace)
-            processed_chunk.to_json(outfile, orient='records', lines=True)
-            print(f"-----------------------------------------------------------> progress: {(chunk_iter * 100) / estimated_chunks} %")            
+###############################################################################
+# MOTEUR VECTORISÉ ############################################################
+###############################################################################
+# mêmes transformations que process_chunk, avec une sortie identique octet pour octet:
+# accesseur str / noyau de text_normalization.py / clip à la place des apply et regex ligne à ligne, et calcul une seule fois
+# par valeur distincte pour les colonnes hashables (pays, groupes, magasins, grades)
+
+# codes des valeurs distinctes (le type fait partie de la clé: 1 et 1.0 restent distincts)
+def unique_codes(values):
+    index = {}
+    codes = np.fromiter((index.setdefault((value.__class__, value), len(index)) for value in values),
+                        dtype=np.intp, count=len(values))
+    return codes, [value for _, value in index]
+
+# transform appliqué aux valeurs distinctes puis redéployé sur toutes les lignes
+def map_unique(series, transform):
+    try:
+        codes, uniques = unique_codes(series.to_numpy())
+    except TypeError: # listes, dict
+        return transform(series)
+    result = transform(pd.Series(uniques, dtype=series.dtype, name=series.name))
+    return pd.Series(result.to_numpy()[codes], index=series.index, name=series.name)
+
+def ecoscore_score_vectorized(df, values_to_replace, column='ecoscore_score', lower=0, upper=100):
+    score = df[column].replace(values_to_replace, np.nan)
+    if pd.api.types.is_float_dtype(score.dtype):
+        clipped = score.clip(lower, upper) + 0.0 # -0.0 -> 0.0 comme max(0, x)
+        # max(0, min(x, 100)) renvoie un int hors de ]0, 100]: colonne entière si aucune autre valeur
+        if len(score) and score.notna().all() and ((score > upper) | (score <= lower)).all():
+            clipped = clipped.astype('int64')
+        df[column] = clipped
+    elif pd.api.types.is_integer_dtype(score.dtype):
+        df[column] = score.clip(lower, upper)
+    else:
+        df[column] = score.apply(lambda x: max(lower, min(x, upper)) if not pd.isna(x) else x)
+    return df
+
+def pnns_1_vectorized(df, values_to_replace, column='pnns_1'):
+    def pnns_1_values(pnns_1):
+        pnns_1 = pnns_1.replace(values_to_replace, np.nan).astype(str).str.lower()
+        pnns_1 = pd.to_numeric(pnns_1.replace(PNNS_1_MAP, regex=True), errors='coerce')
+        return pnns_1.replace(values_to_replace, np.nan)
+    df[column] = map_unique(df[column], pnns_1_values)
+    return df
+
+# grades a -> e: première lettre trouvée dans la chaîne (replace regex), sinon nombre ou NaN
+def grade_vectorized(df, column, values_to_replace):
+    grades = df[column].replace(values_to_replace, np.nan).astype(str).str.lower()
+    df[column] = map_unique(grades, lambda grade: pd.to_numeric(grade.replace(GRADE_MAP, regex=True), errors='coerce'))
+    return df
+
+# noyau commun des colonnes de tags, directement sur les listes: chaque tag distinct est nettoyé
+# une seule fois (cache partagé entre les morceaux, vidé au-delà de TAG_CACHE_SIZE entrées) et
+# les éléments obtenus sont internés; clean renvoie None pour un tag à ignorer
+TAG_CACHE_SIZE = 200000
+SPLIT_TAG = object()
+
+def tag_kernel(clean):
+    cache = {}
+    def fill(tags):
+        if len(cache) >= TAG_CACHE_SIZE:
+            cache.clear()
+        for tag in tags:
+            if tag not in cache:
+                item = clean(tag)
+                cache[tag] = sys.intern(item) if isinstance(item, str) else item
+    def tag_items(tags):
+        try:
+            return [cache[tag] for tag in tags]
+        except KeyError:
+            # éléments non textuels convertis comme le map(str, x) de process_chunk
+            if not all(isinstance(tag, str) for tag in tags):
+                tags = [str(tag) for tag in tags]
+            fill(tags)
+            return [cache[tag] for tag in tags]
+    return tag_items
+
+# valeurs à remplacer -> 'empty', ponctuation -> espace
+def tags_result(text, replaced):
+    return 'empty' if text in replaced else normalize_text(text, lower=False)
+
+# ingrédients, catégories: éléments 'en:' sans préfixe, séparés par ', '; un tag contenant ', '
+# (SPLIT_TAG) ou une liste commençant par '[' / finissant par ']' serait découpée autrement par le
+# join / strip('[]') / split(', ') de process_chunk, qui est alors repris tel quel
+def en_tag(tag):
+    if ', ' in tag:
+        return SPLIT_TAG
+    return tag.split(':')[-1] if tag.startswith('en:') else None
+
+en_tag_items = tag_kernel(en_tag)
+
+def en_tags_text(tags):
+    if tags.__class__ is not list or not tags:
+        return ''
+    items = en_tag_items(tags)
+    if SPLIT_TAG in items or str(tags[0]).startswith('[') or str(tags[-1]).endswith(']'):
+        tags = ', '.join(map(str, tags)).strip('[]').split(', ')
+        return ', '.join(tag.split(':')[-1] for tag in tags if tag.startswith('en:'))
+    if None in items:
+        items = [item for item in items if item is not None]
+    return ', '.join(items)
+
+def extract_en_tags(tags, values_to_replace):
+    replaced = {value for value in values_to_replace if isinstance(value, str)}
+    return tags.map(lambda tags: tags_result(en_tags_text(tags), replaced))
+
+def ingredients_vectorized(df, values_to_replace):
+    df['ingredients'] = extract_en_tags(df['ingredients_temp'], values_to_replace)
+    df.drop(columns=['ingredients_temp'], inplace=True)
+    return df
+
+def categories_vectorized(df, values_to_replace):
+    df['categories'] = extract_en_tags(df['categories_temp'], values_to_replace)
+    df.drop(columns=['categories_temp'], inplace=True)
+    return df
+
+# seule la mise en minuscules de name_processing atteint la sortie (filtre non réassigné)
+def name_vectorized(df, values_to_replace, column='name'):
+    df[column] = df[column].astype(str).str.lower()
+    return df
+
+# ecoscore_data et stores: replace, str, minuscules, ponctuation en un seul passage du noyau de
+# normalisation pour les deux colonnes (puis replace final pour ecoscore_data seulement)
+# (kept: colonnes dont les valeurs de values_to_replace sont gardées, seules les valeurs manquantes -> 'empty')
+def free_text_vectorized(df, values_to_replace, columns=('ecoscore_data', 'stores'), rechecked=('ecoscore_data',),
+                         kept=()):
+    replaced = {value for value in values_to_replace if isinstance(value, str)}
+    for column in columns:
+        if column in kept:
+            df[column] = df[column].where(df[column].notna(), 'empty').astype(str)
+        else:
+            df[column] = df[column].replace(values_to_replace, 'empty').astype(str)
+    normalize_columns(df, list(columns), lower=True)
+    for column in rechecked:
+        df[column] = df[column].mask(df[column].isin(replaced), 'empty')
+    return df
+
+# texte des tags: préfixe de langue retiré, virgules supprimées, ponctuation -> espace
+def tags_text(text, values_to_replace, prefix=None, regex=False):
+    if prefix is not None:
+        text = text.str.replace(prefix, ' ', regex=regex)
+    text = text.str.replace(',', '', regex=False).replace(values_to_replace, 'empty')
+    return text.map(lambda text: normalize_text(text, lower=False))
+
+# autres listes: préfixe de langue remplacé par un espace, virgules supprimées, séparés par ' '
+# (équivalent au join(', ') puis replace de process_chunk, aucun motif ne chevauche ', ')
+LANGUAGE_PREFIX_SPACES = re.compile(r'\b\w{2}:\s*')
+TAG_KERNELS = {'en:': tag_kernel(lambda tag: tag.replace('en:', ' ').replace(',', '')),
+               'language': tag_kernel(lambda tag: LANGUAGE_PREFIX_SPACES.sub(' ', tag).replace(',', '')),
+               None: tag_kernel(lambda tag: tag.replace(',', ''))}
+
+# une chaîne est traitée caractère par caractère et une valeur manquante devient 'empty'
+# (replace puis join(map(str, x)) de process_chunk)
+def joined_tags_vectorized(df, column, values_to_replace, prefix=None):
+    replaced = {value for value in values_to_replace if isinstance(value, str)}
+    tag_items = TAG_KERNELS[prefix]
+    def tags_value(tags):
+        if tags.__class__ is not list:
+            if isinstance(tags, str):
+                tags = 'empty' if tags in replaced else tags
+            elif pd.isna(tags):
+                tags = 'empty'
+            else:
+                return 'empty'
+        return tags_result(' '.join(tag_items(tags)), replaced)
+    df[column] = df[column].map(tags_value)
+    return df
+
+def main_category_vectorized(df, values_to_replace, column='main_category', prefix='en:'):
+    regex = prefix == 'language'
+    if regex:
+        prefix = LANGUAGE_PREFIX_SPACES
+    df[column] = map_unique(df[column], lambda text: tags_text(text.replace(values_to_replace, 'empty'),
+                                                               values_to_replace, prefix, regex))
+    return df
+
+def process_chunk_vectorized(chunk, values_to_replace, rare_countries=None, ecoscore_data_mode='text',
+                             categorical_encoding=False):
+    df = chunk.copy()
+    rename_columns_processing(df)
+    if ecoscore_data_mode == 'structured':
+        ecoscore_data_structured(df)
+    if categorical_encoding:
+        categorical_processing(df)
+    else:
+        pnns_1_vectorized(df, values_to_replace)
+        grade_vectorized(df, 'ecoscore_tags', values_to_replace)
+        grade_vectorized(df, 'nutriscore_tags', values_to_replace)
+    ecoscore_score_vectorized(df, values_to_replace)
+    ingredients_vectorized(df, values_to_replace)
+    categories_vectorized(df, values_to_replace)
+    name_vectorized(df, values_to_replace)
+    countries_processing(df, values_to_replace, rare_countries)
+    free_text_vectorized(df, values_to_replace)
+    joined_tags_vectorized(df, 'food_group', values_to_replace, 'en:')
+    joined_tags_vectorized(df, 'nutrient_level', values_to_replace, 'en:')
+    main_category_vectorized(df, values_to_replace)
+    joined_tags_vectorized(df, 'keywords', values_to_replace)
+    joined_tags_vectorized(df, 'packaging', values_to_replace, 'language')
+    # comme process_chunk: le filtrage de delete_useless_lines n'est pas réassigné, aucune ligne retirée
+    return df
+
+###############################################################################
+# PLAN DÉCLARATIF #############################################################
+###############################################################################
+# spécification par colonne (column_spec de config.json, DEFAULT_COLUMN_SPEC à défaut) compilée
+# en un plan d'opérateurs exécuté par le moteur 'planned', sortie identique au moteur vectorisé
+# pour la spécification par défaut:
+#   column         nom en sortie
+#   source         colonne du jsonl 02 renommée en column (par défaut column)
+#   normalization  lower | text | tags | tag_text | en_tags | clip, absent: valeur gardée
+#   prefix         préfixe retiré des tags (tags, tag_text): 'en:', 'language' (tout préfixe xx:), absent: aucun
+#   null_tokens    text: valeurs de values_to_replace -> 'empty' avant normalisation (true, défaut),
+#                  et aussi après (normalized); false: valeurs gardées, seules les manquantes -> 'empty'
+#   encoding       grade | pnns_1 | country: codes numériques (catégoriels si categorical_encoding)
+#   clip           [min, max] de normalization = clip
+# chaque colonne est traitée une seule fois, toutes les colonnes text en un passage commun du noyau
+# de normalisation; en_tags crée la colonne en fin de tableau et retire la source (ordre de process_chunk)
+DEFAULT_COLUMN_SPEC = [{'column': 'pnns_1', 'source': 'pnns_groups_1', 'encoding': 'pnns_1'},
+                       {'column': 'ecoscore_tags', 'encoding': 'grade'},
+                       {'column': 'nutriscore_tags', 'encoding': 'grade'},
+                       {'column': 'ecoscore_score', 'normalization': 'clip', 'clip': [0, 100]},
+                       {'column': 'ingredients', 'source': 'ingredients_tags', 'normalization': 'en_tags'},
+                       {'column': 'categories', 'source': 'categories_tags', 'normalization': 'en_tags'},
+                       {'column': 'name', 'source': 'product_name', 'normalization': 'lower'},
+                       {'column': 'countries', 'encoding': 'country'},
+                       {'column': 'ecoscore_data', 'normalization': 'text', 'null_tokens': 'normalized'},
+                       {'column': 'stores', 'normalization': 'text'},
+                       {'column': 'food_group', 'source': 'food_groups_tags', 'normalization': 'tags', 'prefix': 'en:'},
+                       {'column': 'nova', 'source': 'nova_group'},
+                       {'column': 'palm_oil', 'source': 'ingredients_from_or_that_may_be_from_palm_oil_n'},
+                       {'column': 'nutrient_level', 'source': 'nutrient_levels_tags', 'normalization': 'tags', 'prefix': 'en:'},
+                       {'column': 'additives', 'source': 'additives_old_n'},
+                       {'column': 'main_category', 'source': 'compared_to_category', 'normalization': 'tag_text', 'prefix': 'en:'},
+                       {'column': 'keywords', 'source': '_keywords', 'normalization': 'tags'},
+                       {'column': 'packaging', 'source': 'packaging_tags', 'normalization': 'tags', 'prefix': 'language'}]
+NORMALIZATIONS = [None, 'lower', 'text', 'tags', 'tag_text', 'en_tags', 'clip']
+ENCODINGS = [None, 'grade', 'pnns_1', 'country']
+PREFIXES = [None, 'en:', 'language']
+NULL_TOKENS = [True, False, 'normalized']
+PLANS = {}
+
+def en_tags_operator(source, column):
+    def operator(df, values_to_replace, rare_countries):
+        df[column] = extract_en_tags(df[source], values_to_replace)
+        if source != column:
+            df.drop(columns=[source], inplace=True)
+    return operator
+
+def normalization_operator(entry, column):
+    normalization = entry.get('normalization')
+    prefix = entry.get('prefix')
+    lower, upper = entry.get('clip', [0, 100])
+    def operator(df, values_to_replace, rare_countries):
+        if normalization == 'lower':
+            name_vectorized(df, values_to_replace, column)
+        elif normalization == 'tags':
+            joined_tags_vectorized(df, column, values_to_replace, prefix)
+        elif normalization == 'tag_text':
+            main_category_vectorized(df, values_to_replace, column, prefix)
+        elif normalization == 'clip':
+            ecoscore_score_vectorized(df, values_to_replace, column, lower, upper)
+    return operator
+
+def encoding_operator(encoding, column, categorical_encoding):
+    def operator(df, values_to_replace, rare_countries):
+        if encoding == 'country':
+            df[column] = country_ids(df[column], values_to_replace, rare_countries)
+        elif categorical_encoding:
+            df[column] = encode_categories(df[column], PNNS_1_GROUPS) if encoding == 'pnns_1' else encode_grades(df[column])
+        elif encoding == 'pnns_1':
+            pnns_1_vectorized(df, values_to_replace, column)
+        else:
+            grade_vectorized(df, column, values_to_replace)
+    return operator
+
+# None et booléens comparés par identité (1 et 0 ne valent pas true et false)
+def known_spec_value(value, known):
+    return any(value == option if isinstance(option, str) else value is option for option in known)
+
+# spécification -> (renommages, opérateurs dans l'ordre de la spécification)
+def compile_plan(spec, categorical_encoding=False):
+    renames, operators = {}, []
+    text_columns, rechecked, kept = [], [], []
+    def text_operator(df, values_to_replace, rare_countries):
+        free_text_vectorized(df, values_to_replace, text_columns, rechecked, kept)
+    for entry in spec:
+        column = entry['column']
+        source = entry.get('source', column)
+        normalization, encoding = entry.get('normalization'), entry.get('encoding')
+        if normalization not in NORMALIZATIONS or encoding not in ENCODINGS:
+            raise ValueError(f"ERROR, unknown normalization or encoding in column spec: {entry}")
+        if not known_spec_value(entry.get('prefix'), PREFIXES):
+            raise ValueError(f"ERROR, unknown prefix in column spec, expected one of {PREFIXES}: {entry}")
+        null_tokens = entry.get('null_tokens', True)
+        if not known_spec_value(null_tokens, NULL_TOKENS):
+            raise ValueError(f"ERROR, unknown null_tokens in column spec, expected one of {NULL_TOKENS}: {entry}")
+        if normalization == 'en_tags':
+            operators.append(en_tags_operator(source, column))
+        else:
+            if source != column:
+                renames[source] = column
+            if normalization == 'text':
+                # colonnes text regroupées dans un seul opérateur, placé à la première d'entre elles
+                if not text_columns:
+                    operators.append(text_operator)
+                text_columns.append(column)
+                if null_tokens == 'normalized':
+                    rechecked.append(column)
+                elif null_tokens is False:
+                    kept.append(column)
+            elif normalization is not None:
+                operators.append(normalization_operator(entry, column))
+        if encoding is not None:
+            operators.append(encoding_operator(encoding, column, categorical_encoding))
+    return renames, operators
+
+def column_plan(categorical_encoding=False):
+    plan = PLANS.get(categorical_encoding)
+    if plan is None:
+        plan = PLANS[categorical_encoding] = compile_plan(get_param('column_spec', DEFAULT_COLUMN_SPEC), categorical_encoding)
+    return plan
+
+def process_chunk_planned(chunk, values_to_replace, rare_countries=None, ecoscore_data_mode='text',
+                          categorical_encoding=False):
+    renames, operators = column_plan(categorical_encoding)
+    df = chunk.copy()
+    df.rename(columns=renames, inplace=True)
+    if ecoscore_data_mode == 'structured':
+        ecoscore_data_structured(df)
+    for operator in operators:
+        operator(df, values_to_replace, rare_countries)
+    return df
+
+PROCESS_CHUNK_ENGINES = {'legacy': process_chunk,
+                         'vectorized': process_chunk_vectorized,
+                         'planned': process_chunk_planned}
+
+###############################################################################
+# VOCABULAIRES ################################################################
+###############################################################################
+# identifiants des éléments de stores, packaging, main_category, food_group et keywords (vocabularies.py),
+# pris sur les colonnes brutes du jsonl 02 indépendamment du moteur: éléments de la liste de tags (de la
+# chaîne séparée par des virgules pour stores et main_category) en minuscules, préfixe de langue retiré,
+# ponctuation -> espace; valeurs manquantes ou à remplacer ignorées
+VOCABULARY_SOURCES = {'stores': 'stores',
+                      'packaging': 'packaging_tags',
+                      'main_category': 'compared_to_category',
+                      'food_group': 'food_groups_tags',
+                      'keywords': '_keywords'}
+TOKEN_CACHE = {}
+
+def vocabulary_token(item):
+    token = TOKEN_CACHE.get(item)
+    if token is None:
+        if len(TOKEN_CACHE) >= TAG_CACHE_SIZE:
+            TOKEN_CACHE.clear()
+        token = TAG_LANGUAGE_PREFIX.sub('', item.strip().lower())
+        token = TOKEN_CACHE[item] = sys.intern(' '.join(normalize_text(token, lower=False).split()))
+    return token
+
+def vocabulary_tokens(value, replaced):
+    if isinstance(value, str):
+        value = value.split(',')
+    elif not isinstance(value, list):
+        return []
+    tokens = []
+    for item in value:
+        if isinstance(item, str) and item.strip() not in replaced:
+            token = vocabulary_token(item)
+            if token and token not in replaced:
+                tokens.append(token)
+    return tokens
+
+# vocabulaires propres à un morceau brut (calculés dans le processus du pool en parallèle):
+# {colonne: (Vocabulary du morceau, listes d'identifiants locaux indexées comme le morceau)}
+def chunk_vocabularies(chunk, values_to_replace):
+    replaced = {value for value in values_to_replace if isinstance(value, str)}
+    local = {}
+    for column, source in VOCABULARY_SOURCES.items():
+        values = chunk[source].tolist() if source in chunk.columns else [None] * len(chunk)
+        vocabulary = Vocabulary()
+        ids = vocabulary.encode(vocabulary_tokens(value, replaced) for value in values)
+        local[column] = (vocabulary, pd.Series(ids, index=chunk.index, dtype=object))
+    return local
+
+# vocabulaires des morceaux fusionnés dans les vocabulaires persistants dans l'ordre d'écriture, pour
+# les seules lignes écrites (mêmes identifiants quel que soit nb_workers), colonne <colonne>_ids insérée
+# après la colonne texte (vocabulary_mode = alongside) ou à sa place (ids); occurrences comptées
+def attach_vocabulary_ids(df, local, vocabularies, vocabulary_mode):
+    for column, (vocabulary, ids) in local.items():
+        id_lists = vocabularies[column].merge(vocabulary, ids.reindex(df.index))
+        vocabularies[column].count(id_lists)
+        position = df.columns.get_loc(column) + 1 if column in df.columns else len(df.columns)
+        df.insert(position, column + '_ids', pd.Series(id_lists, index=df.index, dtype=object))
+        if vocabulary_mode == 'ids' and column in df.columns:
+            df.drop(columns=[column], inplace=True)
+    return df
+
+def vocabulary_path(data_path, file_id):
+    return data_path + file_id + '_vocabularies.json'
+
+# morceau brut décodé, traité puis sérialisé en jsonl dans le processus du pool (le DataFrame
+# est renvoyé tel quel pour une sortie parquet, ou avec les vocabulaires du morceau, les
+# identifiants définitifs n'étant connus qu'à la fusion)
+def process_raw_chunk(task):
+    (raw_chunk, values_to_replace, engine, rare_countries, ecoscore_data_mode, categorical_encoding, vocabulary_mode,
+     prune, deduplicate, as_text) = task
+    start = time.perf_counter()
+    chunk = chunk_frame(raw_chunk, dtype={'code': str})
+    rows_in = len(chunk)
+    pruned = collections.Counter()
+    if prune:
+        chunk = row_filters.prune_frame(chunk, pruned)
+    keys = dedup.row_keys(chunk) if deduplicate else None
+    local = chunk_vocabularies(chunk, values_to_replace) if vocabulary_mode != 'off' else None
+    processed_chunk = PROCESS_CHUNK_ENGINES[engine](chunk, values_to_replace, rare_countries, ecoscore_data_mode,
+                                                    categorical_encoding)
+    rows_out = len(processed_chunk)
+    if as_text:
+        processed_chunk = processed_chunk.to_json(orient='records', lines=True)
+    return processed_chunk, local, pruned, keys, rows_in, rows_out, time.perf_counter() - start
+
+# traitement en parallèle: au plus 2 morceaux en attente par processus (mémoire bornée à
+# ~2 x nb_workers x chunk_size), résultats écrits dans l'ordre de lecture; la progression
+# affichée est la position de lecture du morceau écrit; renvoie le nombre de lignes lues
+# les clés de dédoublonnage sont calculées par le pool mais vérifiées dans l'ordre d'écriture (seen):
+# les doublons sont traités par le pool puis écartés avant l'écriture
+def browse_file_parallel(progress, jsonl_02, jsonl_03, chunk_size, values_to_replace, engine, nb_workers,
+                         rare_countries=None, ecoscore_data_mode='text', categorical_encoding=False,
+                         vocabularies=None, vocabulary_mode='off', prune=False, pruned=None, seen=None,
+                         duplicates=None):
+    as_text = not is_parquet(jsonl_03) and vocabularies is None
+    max_in_flight = 2 * nb_workers
+    pending = collections.deque()
+    rows = 0
+    def write_next(writer):
+        nonlocal rows
+        result, position = pending.popleft()
+        processed_chunk, local, chunk_pruned, keys, rows_in, rows_out, seconds = result.get()
+        rows += rows_in
+        if prune:
+            pruned.update(chunk_pruned)
+        if keys is not None:
+            kept = dedup.keep_mask(seen.check(keys), duplicates)
+            if not all(kept):
+                if as_text:
+                    lines = processed_chunk.splitlines(keepends=True)
+                    processed_chunk = ''.join(line for line, keep in zip(lines, kept) if keep)
+                else:
+                    processed_chunk = processed_chunk[kept]
+                rows_out = sum(kept)
+        if local is not None:
+            attach_vocabulary_ids(processed_chunk, local, vocabularies, vocabulary_mode)
+        if as_text:
+            writer.write_lines([processed_chunk])
+        else:
+            writer.write_frame(processed_chunk)
+        telemetry.record_chunk(seconds, rows_in)
+        telemetry.add_rows_out(rows_out)
+        progress.report(position)
+    with open_writer(jsonl_03) as writer, multiprocessing.Pool(nb_workers) as pool:
+        for input_file in input_files(jsonl_02):
+            for raw_chunk in read_raw_chunks(input_file, chunk_size, raw=True, progress=progress):
+                task = (raw_chunk, values_to_replace, engine, rare_countries, ecoscore_data_mode, categorical_encoding,
+                        vocabulary_mode, prune, seen is not None, as_text)
+                pending.append((pool.apply_async(process_raw_chunk, (task,)), progress.done))
+                if len(pending) >= max_in_flight:
+                    write_next(writer)
+        while pending:
+            write_next(writer)
+    return rows
+
+# premier passage: nombre d'occurrences exact de chaque pays normalisé sur tout le fichier
+# (quelques dizaines de milliers de valeurs distinctes au plus), seule la colonne countries est décodée
+# (lignes inutiles écartées comme au traitement si prune); seen: clés de dédoublonnage propres au
+# comptage, les doublons écartés au traitement ne sont pas comptés (lignes alors décodées en entier,
+# l'empreinte du contenu portant sur toutes les colonnes)
+def count_countries(jsonl_02, chunk_size, values_to_replace, prune=False, seen=None):
+    replaced = {value for value in values_to_replace if isinstance(value, str)}
+    raw_counts = collections.Counter()
+    columns = ['countries'] + (row_filters.FILTER_COLUMNS if prune else [])
+    for input_file in input_files(jsonl_02):
+        if seen is not None:
+            for chunk in read_chunks(input_file, chunk_size, dtype={'code': str}, raw=True):
+                if prune:
+                    chunk = row_filters.prune_frame(chunk, collections.Counter())
+                chunk = chunk[dedup.keep_mask(seen.check(dedup.row_keys(chunk)), collections.Counter())]
+                raw_counts.update(', '.join(value) if isinstance(value, list) else value for value in chunk['countries'])
+            continue
+        if is_parquet(input_file):
+            for chunk in read_chunks(input_file, chunk_size, columns=columns):
+                if prune:
+                    chunk = row_filters.prune_frame(chunk, collections.Counter())
+                raw_counts.update(', '.join(value) if isinstance(value, list) else value for value in chunk['countries'])
+            continue
+        extract, _ = keep_usefull_columns.get_json_codec(get_param('json_backend', 'json'), columns)
+        with open(input_file, 'r', encoding='utf-8') as infile:
+            for line in infile:
+                record = extract(line)
+                if prune and row_filters.record_prune_reason(record) is not None:
+                    continue
+                value = record['countries']
+                raw_counts[', '.join(value) if isinstance(value, list) else value] += 1
+    counts = collections.Counter()
+    for value, count in raw_counts.items():
+        normalized = normalize_country_value(value, replaced)
+        if isinstance(normalized, str):
+            counts[normalized] += count
+    return counts
+
+# nombres d'occurrences des pays du dernier traitement complet, conservés à côté des vocabulaires:
+# l'ingestion delta reprend le seuil des pays rares des produits déjà en base
+def country_counts_path(data_path, file_id):
+    return data_path + file_id + '_country_counts.json'
+
+def load_country_counts(file_path):
+    if file_path is None or not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return collections.Counter(json.load(file))
+
+def save_country_counts(counts, file_path):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(dict(counts), file, ensure_ascii=False)
+
+# pays rares sur tout le fichier; delta (reset_counts faux): seuil du traitement complet enregistré
+# dans country_counts_file, les pays absents du traitement complet étant rares
+def global_rare_countries(jsonl_02, chunk_size, values_to_replace, prune, country_counts_file, reset_counts, seen=None):
+    counts = count_countries(jsonl_02, chunk_size, values_to_replace, prune, seen)
+    if reset_counts:
+        if country_counts_file is not None:
+            save_country_counts(counts, country_counts_file)
+        return rare_values(counts)
+    full_counts = load_country_counts(country_counts_file)
+    if full_counts is None:
+        print(f"warning, no country counts of a full run, rare countries of this file only: {country_counts_file}")
+        return rare_values(counts)
+    return rare_values(full_counts) | (set(counts) - set(full_counts))
+
+# lecture et traitement du fichier jsonl en morceaux; vocabulary_file: vocabulaires persistants
+# (vocabulary_mode), repris s'il existe puis mis à jour, occurrences recomptées sauf si reset_counts est faux;
+# country_counts_file: occurrences des pays (global_rare_countries), enregistrées ou reprises de même
+def browse_file(jsonl_02, jsonl_03, chunk_size, values_to_replace, vocabulary_file=None, reset_counts=True,
+                country_counts_file=None):
+    engine = get_param('preprocessing_engine', 'legacy')
+    nb_workers = int(get_param('nb_workers', 1))
+    ecoscore_data_mode = get_param('ecoscore_data_mode', 'text')
+    categorical_encoding = get_param('categorical_encoding', False)
+    if engine == 'planned':
+        # spécification vérifiée avant le traitement, pas dans les processus du pool
+        column_plan(categorical_encoding)
+    prune = get_param('prune_useless_lines', False)
+    pruned = collections.Counter()
+    seen = None
+    duplicates = collections.Counter()
+    if get_param('dedup_products', False):
+        seen = dedup.SeenKeys(jsonl_03 + '.seen.sqlite', int(get_param('dedup_memory_keys', 2000000)))
+    vocabulary_mode = get_param('vocabulary_mode', 'off') if vocabulary_file is not None else 'off'
+    vocabularies = None
+    if vocabulary_mode != 'off':
+        vocabularies = load_vocabularies(vocabulary_file)
+        if reset_counts:
+            for vocabulary in vocabularies.values():
+                vocabulary.reset_counts()
+    rare_countries = None
+    if get_param('global_rare_countries', False):
+        print("counting countries over the whole file for the rare countries threshold")
+        counted = None
+        if seen is not None:
+            counted = dedup.SeenKeys(jsonl_03 + '.counted.sqlite', int(get_param('dedup_memory_keys', 2000000)))
+        rare_countries = global_rare_countries(jsonl_02, chunk_size, values_to_replace, prune, country_counts_file,
+                                               reset_counts, counted)
+        if counted is not None:
+            counted.close()
+        print(f"{len(rare_countries)} rare countries")
+    progress = Progress(input_files(jsonl_02))
+    if nb_workers > 1:
+        print(f"processing chunks with {nb_workers} workers")
+        rows = browse_file_parallel(progress, jsonl_02, jsonl_03, chunk_size, values_to_replace, engine, nb_workers,
+                                    rare_countries, ecoscore_data_mode, categorical_encoding, vocabularies,
+                                    vocabulary_mode, prune, pruned, seen, duplicates)
+    else:
+        process = PROCESS_CHUNK_ENGINES[engine]
+        rows = 0
+        with open_writer(jsonl_03) as writer:
+            for input_file in input_files(jsonl_02):
+                chunks = read_chunks(input_file, chunk_size, dtype={'code': str}, raw=True, progress=progress)
+                for chunk in telemetry.track_chunks(chunks):
+                    rows += len(chunk)
+                    if prune:
+                        chunk = row_filters.prune_frame(chunk, pruned)
+                    if seen is not None:
+                        chunk = chunk[dedup.keep_mask(seen.check(dedup.row_keys(chunk)), duplicates)]
+                    local = chunk_vocabularies(chunk, values_to_replace) if vocabularies is not None else None
+                    processed_chunk = process(chunk, values_to_replace, rare_countries, ecoscore_data_mode, categorical_encoding)
+                    if local is not None:
+                        attach_vocabulary_ids(processed_chunk, local, vocabularies, vocabulary_mode)
+                    writer.write_frame(processed_chunk)
+                    telemetry.add_rows_out(len(processed_chunk))
+                    progress.report()
+    if prune:
+        telemetry.add_rows_pruned(pruned)
+        row_filters.report('02 decoding', pruned, rows)
+    if seen is not None:
+        seen.close()
+        telemetry.add_rows_pruned(duplicates)
+        dedup.report('02 decoding', duplicates, rows - sum(pruned.values()))
+    if vocabularies is not None:
+        save_vocabularies(vocabularies, vocabulary_file)
+        print("vocabularies saved: " + ', '.join(f"{column} {len(vocabulary)}" for column, vocabulary in vocabularies.items())
+              + f" tokens, {vocabulary_file}")
 
 
 
@@ -2341,25 +3092,17 @@ def browse_file(estimated_chunks, jsonl_02, jsonl_03, chunk_size, values_to_repl
 ###############################################################################
 def main(chunk_size, file_id, data_path):
     chunk_size = int(chunk_size)
-    jsonl_02 = data_path + file_id + '_openfoodfacts_02.jsonl' 
-    jsonl_03 = data_path + file_id + '_openfoodfacts_03.jsonl' 
-    values_to_replace = ["unknown", 
-                         "Unknown", 
-                         "None", 
-                         "none", 
-                         "", 
-                         "not-applicable",
-                         "nan",
-                         "NaN",
-                         "0",
-                         "e m p t y", 
-                         np.nan]
-    print("estimating necessary chunk number")
-    estimated_chunks = count_chunks(jsonl_02, chunk_size)
+    jsonl_02 = data_path + file_id + '_openfoodfacts_02' + extension()
+    jsonl_03 = data_path + file_id + '_openfoodfacts_03' + extension()
+    values_to_replace = VALUES_TO_REPLACE
+    telemetry.start_stage('02_columns_preprocessing', file_id, input_files(jsonl_02))
     print("browse throw jsonl 02 file to process columns")
-    browse_file(estimated_chunks, jsonl_02, jsonl_03, chunk_size, values_to_replace)
+    browse_file(jsonl_02, jsonl_03, chunk_size, values_to_replace, vocabulary_path(data_path, file_id),
+                country_counts_file=country_counts_path(data_path, file_id))
+    telemetry.end_stage([jsonl_03])
     print("deleting file jsonl 02")
-    delete_file(jsonl_02)
+    for input_file in input_files(jsonl_02):
+        delete_file(input_file)
 
 if __name__ == "__main__":
     chunk_size = sys.argv[1]
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-import jsonlines
 import os
 import warnings
 from datetime import datetime 
@@ -9,57 +8,24 @@ import re
 import random
 import sys
 import math
+import collections
+from pipeline_config import get_param, keep_intermediates
+import telemetry
+from intermediate_io import open_writer, iter_record_chunks, extension, data_size, is_parquet
+from progress import Progress
 
 pd.set_option('display.max_rows', 50)
 warnings.filterwarnings("ignore", category=pd.errors.DtypeWarning)
 
 def delete_file(file_path):
-    if os.path.exists(file_path):
+    if keep_intermediates():
+        print(f"file kept for orchestrator: {file_path}")
+    elif os.path.exists(file_path):
         os.remove(file_path)
         print(f"file deleted: {file_path}")
     else:
         print(f"ERROR, does not exists: {file_path}")
 
-def line_count(jsonl_03, type):
-    count = 0
-    with open(jsonl_03, 'r', encoding='utf-8') as file:
-        for line in file:
-            if (type == 0): # sans écoscore score 
-                try:
-                    obj = json.loads(line)
-                    if 'ecoscore_score' in obj:
-                        value = obj['ecoscore_score']
-                        #if isinstance(value, (int, float)) and value == 999:
-                        if value is None or (isinstance(value, (int, float)) and np.isnan(value)):
-                            count += 1
-                except json.JSONDecodeError:
-                    print("Erreur de décodage JSON dans la ligne suivante :")
-                    print(line)
-                    continue
-            elif (type == 1): # compte toutes les lignes 
-                try:
-                    obj = json.loads(line)
-                    if 'ecoscore_score' in obj:
-                        value = obj['ecoscore_score']
-                        if value is None or np.isnan(value) or (isinstance(value, (int, float)) and 0 <= value <= 100):
-                            count += 1
-                except json.JSONDecodeError:
-                    print("Erreur de décodage JSON dans la ligne suivante :")
-                    print(line)
-                    continue
-            elif (type == 2): # lignes avec écoscore score 
-                try:
-                    obj = json.loads(line)
-                    if 'ecoscore_score' in obj:
-                        value = obj['ecoscore_score']
-                        if isinstance(value, (int, float)) and not math.isnan(value) and not None:
-                            count += 1
-                except json.JSONDecodeError:
-                    print("Erreur de décodage JSON dans la ligne suivante :")
-                    print(line)
-                    continue
-    return count
-
 def validation(total_iter, ok_iter, ko_iter, valid_ko_iter, test_ko_iter, train_ko_iter, valid_ok_iter, test_ok_iter, train_ok_iter): 
     ok_check, ko_check, count_check = False, False, False
     # count
@@ -96,73 +62,235 @@ def validation(total_iter, ok_iter, ko_iter, valid_ko_iter, test_ko_iter, train_
         ok_check = False 
     return ok_check, ko_check, count_check
 
-def line_repartitor(jsonl_03, train, test, valid, train_nb_line_ko, train_nb_line_ok, test_nb_line_ko, test_nb_line_ok, valid_nb_line_ko, valid_nb_line_ok):
-    with jsonlines.open(train, mode='w') as train_writer, \
-        jsonlines.open(test, mode='w') as test_writer, \
-        jsonlines.open(valid, mode='w') as valid_writer:
+# classe d'une ligne pour la répartition: ko sans écoscore score, ok sinon; préfixée à la ligne
+# dans les seaux (avec le numéro de sa classe ecoscore_tags) pour répartir sans décoder à nouveau le json
+KO, OK = 'k', 'o'
+
+def line_class(obj):
+    ecoscore_score = obj.get('ecoscore_score', float('nan'))
+    return KO if (ecoscore_score is np.nan or ecoscore_score is None) else OK
+
+# comptages nécessaires à la répartition, relevés au passage de dispersion: lignes avec écoscore
+# score, sans écoscore score, total (score manquant ou dans [0, 100]), lignes par classe ecoscore_tags
+# et par (classe ko/ok, numéro de classe ecoscore_tags) pour le contrôle de répartition par classe
+class SplitCounts:
+    def __init__(self):
+        self.valid = 0
+        self.invalid = 0
+        self.total = 0
+        self.classes = collections.Counter()
+        self.class_ids = {}
+        self.class_kinds = collections.Counter()
+
+    # numéro de la classe ecoscore_tags de la ligne (NaN et None confondus)
+    def add(self, obj):
+        tags = obj.get('ecoscore_tags')
+        if isinstance(tags, float) and np.isnan(tags):
+            tags = None
+        self.classes[tags] += 1
+        class_id = self.class_ids.setdefault(tags, len(self.class_ids))
+        self.class_kinds[(line_class(obj), class_id)] += 1
+        self.count_score(obj)
+        return class_id
+
+    def count_score(self, obj):
+        if 'ecoscore_score' not in obj:
+            return
+        value = obj['ecoscore_score']
+        if value is None or (isinstance(value, (int, float)) and np.isnan(value)): # sans écoscore score
+            self.invalid += 1
+            self.total += 1
+        elif isinstance(value, (int, float)): # lignes avec écoscore score
+            self.valid += 1
+            if 0 <= value <= 100:
+                self.total += 1
+
+# paquet de lignes jsonl, ou d'enregistrements déjà décodés en parquet (décodés une seule fois pour
+# jsonl_04 et les trois fichiers)
+def write_batch(writer, items):
+    if is_parquet(writer.file_path):
+        writer.write_records(items)
+    else:
+        writer.write_lines(items)
+
+# répartition par classe ecoscore_tags: lignes de chaque classe écrites dans chaque fichier comparées à
+# l'attendu d'après les quotas ko/ok (lignes mélangées: tirage au hasard), écart toléré de 3 écarts-types
+# plus une ligne; quotas: {fichier: {KO: nombre de lignes, OK: nombre de lignes}}
+def class_validation(counts, class_lines, quotas):
+    class_check = True
+    kind_totals = collections.Counter()
+    for (kind, _), count in counts.class_kinds.items():
+        kind_totals[kind] += count
+    for split, split_quotas in quotas.items():
+        rates = {kind: min(1, quota / kind_totals[kind]) if kind_totals[kind] else 0 for kind, quota in split_quotas.items()}
+        for tags, class_id in counts.class_ids.items():
+            expected = sum(counts.class_kinds[(kind, class_id)] * rate for kind, rate in rates.items())
+            variance = sum(counts.class_kinds[(kind, class_id)] * rate * (1 - rate) for kind, rate in rates.items())
+            written = class_lines[split][class_id]
+            if abs(written - expected) > 3 * math.sqrt(variance) + 1:
+                print(f"ERROR, {split} repartition of ecoscore_tags class {tags} invalid: {written} lines, {expected:.1f} expected")
+                class_check = False
+    if class_check:
+        print(f"datasets repartition per ecoscore_tags class valid, {len(counts.class_ids)} classes")
+    return class_check
+
+# répartition des lignes mélangées (classe, numéro de classe ecoscore_tags, ligne) entre train, test et
+# valid, écrites par paquets; counts (SplitCounts): contrôle de la répartition par classe ecoscore_tags
+def line_repartitor(classed_lines, chunk_size, train, test, valid, train_nb_line_ko, train_nb_line_ok, test_nb_line_ko, test_nb_line_ok, valid_nb_line_ko, valid_nb_line_ok, counts=None):
+    with open_writer(train) as train_writer, \
+        open_writer(test) as test_writer, \
+        open_writer(valid) as valid_writer:
         train_ok_iter, train_ko_iter = 0, 0
         test_ok_iter, test_ko_iter = 0, 0
         valid_ok_iter, valid_ko_iter = 0, 0
         total_iter, ok_iter, ko_iter = 0, 0, 0
-        with jsonlines.open(jsonl_03, mode='r') as reader:
-            for obj in reader:
-                ecoscore_score = obj.get('ecoscore_score', float('nan'))
+        class_lines = {'train': collections.Counter(), 'test': collections.Counter(), 'valid': collections.Counter()}
+        for batch in classed_lines:
+            train_lines, test_lines, valid_lines = [], [], []
+            for kind, class_id, line in batch:
                 total_iter+=1
-                if (ecoscore_score is np.nan or ecoscore_score is None):
+                if kind == KO:
                     if (valid_ko_iter < valid_nb_line_ko):
-                        valid_writer.write(obj)
+                        valid_lines.append(line)
                         valid_ko_iter+=1
+                        class_lines['valid'][class_id]+=1
                     elif (test_ko_iter < test_nb_line_ko):
-                        test_writer.write(obj)
+                        test_lines.append(line)
                         test_ko_iter+=1
+                        class_lines['test'][class_id]+=1
                     elif (train_ko_iter < train_nb_line_ko):
-                        train_writer.write(obj)
-                        train_ko_iter+=1    
+                        train_lines.append(line)
+                        train_ko_iter+=1
+                        class_lines['train'][class_id]+=1
                     ko_iter+=1
-                elif(ecoscore_score is not np.nan or ecoscore_score is not None):                    
+                else:
                     if (valid_ok_iter < valid_nb_line_ok):
-                        valid_writer.write(obj)
+                        valid_lines.append(line)
                         valid_ok_iter+=1
+                        class_lines['valid'][class_id]+=1
                     elif (test_ok_iter < test_nb_line_ok):
-                        test_writer.write(obj)
+                        test_lines.append(line)
                         test_ok_iter+=1
+                        class_lines['test'][class_id]+=1
                     elif (train_ok_iter < train_nb_line_ok):
-                        train_writer.write(obj)
-                        train_ok_iter+=1    
+                        train_lines.append(line)
+                        train_ok_iter+=1
+                        class_lines['train'][class_id]+=1
                     ok_iter+=1
+            write_batch(train_writer, train_lines)
+            write_batch(test_writer, test_lines)
+            write_batch(valid_writer, valid_lines)
+        telemetry.add_rows_out(train_ok_iter + train_ko_iter + test_ok_iter + test_ko_iter + valid_ok_iter + valid_ko_iter)
         ok_check, ko_check, count_check = validation(total_iter, ok_iter, ko_iter, valid_ko_iter, test_ko_iter, train_ko_iter, valid_ok_iter, test_ok_iter, train_ok_iter)
         print(f"ok_check: {ok_check}, ko_check: {ko_check}, count_check: {count_check}")
+        if counts is not None:
+            quotas = {'train': {KO: train_nb_line_ko, OK: train_nb_line_ok}, 'test': {KO: test_nb_line_ko, OK: test_nb_line_ok},
+                      'valid': {KO: valid_nb_line_ko, OK: valid_nb_line_ok}}
+            class_check = class_validation(counts, class_lines, quotas)
+            print(f"class_check: {class_check}")
+
+# mélange externe en deux passes, mémoire bornée quelle que soit la taille du fichier: chaque ligne
+# est envoyée dans un des nb_buckets fichiers seaux tiré au hasard, puis chaque seau (de l'ordre de
+# shuffle_memory_mb) est mélangé en mémoire et écrit à la suite; shuffle_seed fixe les tirages
+# (même résultat pour la même entrée et le même nombre de seaux)
+def bucket_paths(jsonl_03, nb_buckets):
+    return [f"{jsonl_03}.bucket{i:03d}" for i in range(nb_buckets)]
+
+# nombre de seaux ouverts en même temps plafonné (shuffle_max_buckets et limite de fichiers ouverts
+# du système, ulimit -n, moins une marge): au-delà, les seaux trop gros sont redispersés au mélange
+def max_buckets():
+    limit = int(get_param('shuffle_max_buckets', 256))
+    try:
+        import resource
+        soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+        if soft_limit != resource.RLIM_INFINITY:
+            limit = min(limit, soft_limit - 64)
+    except ImportError: # pas de module resource sous windows
+        pass
+    return max(2, limit)
+
+def nb_buckets(size, memory_bytes, limit):
+    needed = max(1, math.ceil(size / memory_bytes))
+    if needed > limit:
+        print(f"shuffle needs {needed} buckets, capped to {limit}: buckets larger than shuffle_memory_mb are shuffled recursively")
+    return min(needed, limit)
 
-def read_in_chunks(file_path, chunk_size):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        chunk = []
-        for line in f:
-            chunk.append(json.loads(line))
-            if len(chunk) >= chunk_size:
-                yield chunk
-                chunk = []
-        if chunk:
-            yield chunk
-            
-def shuffle_jsonl(jsonl_02, jsonl_03, chunk_size):
-    temp_file = jsonl_03 + '.temp'
-    with open(temp_file, 'w', encoding='utf-8') as temp_f:
-        for chunk in read_in_chunks(jsonl_02, chunk_size):
-            random.shuffle(chunk)
+# premier passage, seul décodage du json de l'étape: dispersion dans les seaux (lignes préfixées par
+# leur classe) et comptages
+def scatter_buckets(jsonl_02, buckets, rng, chunk_size):
+    counts = SplitCounts()
+    bucket_files = [open(bucket, 'w', encoding='utf-8') for bucket in buckets]
+    try:
+        progress = Progress([jsonl_02])
+        for chunk in telemetry.track_chunks(iter_record_chunks(jsonl_02, chunk_size, progress=progress)):
             for obj in chunk:
-                temp_f.write(json.dumps(obj) + '\n')
-    with open(temp_file, 'r', encoding='utf-8') as temp_f:
-        lines = temp_f.readlines()
-        random.shuffle(lines)
-    with open(jsonl_03, 'w', encoding='utf-8') as f:
-        f.writelines(lines)
-    os.remove(temp_file)
+                class_id = counts.add(obj)
+                bucket_files[rng.randrange(len(buckets))].write(f"{line_class(obj)}{class_id} {json.dumps(obj)}\n")
+            progress.report()
+    finally:
+        for bucket_file in bucket_files:
+            bucket_file.close()
+    return counts
+
+# lignes d'un seau mélangées, par paquets tenant en mémoire: un seau plus gros que shuffle_memory_mb
+# (nombre de seaux plafonné) est redispersé tel quel dans des sous-seaux mélangés à leur tour
+# (profondeur bornée: un seau d'une seule ligne énorme finit mélangé en mémoire)
+def shuffled_bucket(bucket, rng, memory_bytes, limit, depth=0):
+    size = os.path.getsize(bucket)
+    if size <= memory_bytes or depth >= 8:
+        with open(bucket, 'r', encoding='utf-8') as bucket_file:
+            lines = bucket_file.readlines()
+        os.remove(bucket)
+        rng.shuffle(lines)
+        yield lines
+        return
+    sub_buckets = bucket_paths(bucket, max(2, nb_buckets(size, memory_bytes, limit)))
+    sub_files = [open(sub_bucket, 'w', encoding='utf-8') for sub_bucket in sub_buckets]
+    try:
+        with open(bucket, 'r', encoding='utf-8') as bucket_file:
+            for line in bucket_file:
+                sub_files[rng.randrange(len(sub_buckets))].write(line)
+    finally:
+        for sub_file in sub_files:
+            sub_file.close()
+    os.remove(bucket)
+    for sub_bucket in sub_buckets:
+        yield from shuffled_bucket(sub_bucket, rng, memory_bytes, limit, depth + 1)
+
+# second passage: seaux mélangés un par un, écrits à la suite dans jsonl_03 et renvoyés par paquets
+# de (classe, numéro de classe ecoscore_tags, ligne) pour la répartition (en parquet, ligne décodée une
+# fois pour toutes les écritures)
+def split_bucket_line(line, parquet):
+    separator = line.index(' ')
+    text = line[separator + 1:]
+    return line[0], int(line[1:separator]), json.loads(text) if parquet else text
+
+def gather_buckets(buckets, jsonl_03, rng, chunk_size, memory_bytes, limit):
+    progress = Progress(buckets)
+    parquet = is_parquet(jsonl_03)
+    with open_writer(jsonl_03) as writer:
+        for bucket in buckets:
+            for lines in shuffled_bucket(bucket, rng, memory_bytes, limit):
+                for i in range(0, len(lines), chunk_size):
+                    batch = [split_bucket_line(line, parquet) for line in lines[i:i + chunk_size]]
+                    write_batch(writer, [item for _, _, item in batch])
+                    yield batch
+                progress.advance(sum(len(line) for line in lines))
+                del lines
+                progress.report()
 
 def split_jsonl_file(jsonl_03, train, test, valid, jsonl_04, chunk_size):
-    shuffle_jsonl(jsonl_03, jsonl_04, chunk_size) # mélanger toutes les lignes aléatoirement dans jsonl_02
-    valid_ecoscore_count = line_count(jsonl_04, type = 2) # compter le nombre de lignes avec écoscore 
-    invalid_ecoscore_count = line_count(jsonl_04, type = 0) # compter le nombre de lignes autres (sans écoscore)
-    line_count_number = line_count(jsonl_04, type = 1) # compter le nombre de lignes total
+    # mélanger toutes les lignes aléatoirement dans jsonl_04
+    rng = random.Random(get_param('shuffle_seed', None))
+    memory_bytes = int(get_param('shuffle_memory_mb', 1024)) * 1024 * 1024
+    limit = max_buckets()
+    buckets = bucket_paths(jsonl_04, nb_buckets(data_size(jsonl_03), memory_bytes, limit))
+    print(f"shuffling with {len(buckets)} buckets")
+    # compter le nombre de lignes avec écoscore, autres (sans écoscore) et total pendant la dispersion
+    counts = scatter_buckets(jsonl_03, buckets, rng, chunk_size)
+    valid_ecoscore_count, invalid_ecoscore_count = counts.valid, counts.invalid
+    print(f"lines with ecoscore: {valid_ecoscore_count}, without: {invalid_ecoscore_count}, total: {counts.total}")
+    print(f"lines per ecoscore_tags class: {dict(sorted(counts.classes.items(), key=lambda item: str(item[0])))}")
     # compter le nombre de lignes pour chaque fichier 
     train_nb_line_ko = math.floor((invalid_ecoscore_count * 80) / 100) # train ecoscore ko
     train_nb_line_ok = math.floor((valid_ecoscore_count * 84.9) / 100) # train ecoscore ok
@@ -170,8 +298,8 @@ def split_jsonl_file(jsonl_03, train, test, valid, jsonl_04, chunk_size):
     test_nb_line_ok = math.floor((valid_ecoscore_count * 15) / 100) # test ecoscore ok
     valid_nb_line_ko = math.floor((invalid_ecoscore_count * 0) / 100) # valid ecoscore ko
     valid_nb_line_ok = math.floor((valid_ecoscore_count * 0.1) / 100) # valid ecoscore ok 
-    # répartir les lignes entre les fichiers
-    line_repartitor(jsonl_04, train, test, valid, train_nb_line_ko, train_nb_line_ok, test_nb_line_ko, test_nb_line_ok, valid_nb_line_ko, valid_nb_line_ok)
+    # répartir les lignes entre les fichiers au fil du mélange des seaux
+    line_repartitor(gather_buckets(buckets, jsonl_04, rng, chunk_size, memory_bytes, limit), chunk_size, train, test, valid, train_nb_line_ko, train_nb_line_ok, test_nb_line_ko, test_nb_line_ok, valid_nb_line_ko, valid_nb_line_ok, counts)
 
 
 
@@ -180,13 +308,15 @@ def split_jsonl_file(jsonl_03, train, test, valid, jsonl_04, chunk_size):
 ###############################################################################
 def main(chunk_size, file_id, data_path):
     chunk_size = int(chunk_size)
-    jsonl_03 = data_path + file_id + '_openfoodfacts_03.jsonl' 
-    jsonl_04 = data_path + file_id + '_openfoodfacts_04.jsonl' 
-    train = data_path + file_id + "_train" + ".jsonl"
-    test = data_path + file_id + "_test" + ".jsonl"
-    valid = data_path + file_id + "_valid" + ".jsonl"
+    jsonl_03 = data_path + file_id + '_openfoodfacts_03' + extension()
+    jsonl_04 = data_path + file_id + '_openfoodfacts_04' + extension()
+    train = data_path + file_id + "_train" + extension()
+    test = data_path + file_id + "_test" + extension()
+    valid = data_path + file_id + "_valid" + extension()
+    telemetry.start_stage('03_split_dataset', file_id, [jsonl_03])
     print("start spliting dataset")
     split_jsonl_file(jsonl_03, train, test, valid, jsonl_04, chunk_size)
+    telemetry.end_stage([train, test, valid, jsonl_04])
     print("deleting file jsonl 03")
     delete_file(jsonl_03)
 
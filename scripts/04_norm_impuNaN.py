@@ -5,20 +5,19 @@ import warnings
 import json
 import re
 import sys
+from pipeline_config import keep_intermediates
+import telemetry
+from intermediate_io import open_writer, read_chunks, extension
+from progress import Progress
 
 pd.set_option('display.max_rows', 100)
 warnings.filterwarnings("ignore", category=pd.errors.DtypeWarning)
 pd.set_option('future.no_silent_downcasting', True)
 
-def count_chunks(file_path, chunk_size):
-    with open(file_path, 'r') as file:
-        line_count = sum(1 for _ in file)
-    estimated_chunks = (line_count + chunk_size - 1) // chunk_size
-    print(f"total chunk estimated: {estimated_chunks}")
-    return estimated_chunks
-
 def delete_file(file_path):
-    if os.path.exists(file_path):
+    if keep_intermediates():
+        print(f"file kept for orchestrator: {file_path}")
+    elif os.path.exists(file_path):
         os.remove(file_path)
         print(f"file deleted: {file_path}")
     else:
@@ -95,14 +94,14 @@ def process_chunk_test_train(chunk, median_countries, median_pnns_1, median_nova
     return df
 
 # lecture et traitement du fichier jsonl en morceaux train test
-def browse_file_test_train(estimated_chunks, input_file, output_file, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives):
-    chunk_iter = 0
-    with open(input_file, 'r') as infile, open(output_file, 'w') as outfile:
-        for chunk in pd.read_json(infile, lines=True, chunksize=chunk_size):
-            chunk_iter +=1
+def browse_file_test_train(input_file, output_file, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives):
+    progress = Progress([input_file])
+    with open_writer(output_file) as writer:
+        for chunk in telemetry.track_chunks(read_chunks(input_file, chunk_size, progress=progress)):
             processed_chunk = process_chunk_test_train(chunk, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives)
-            processed_chunk.to_json(outfile, orient='records', lines=True)
-            print(f"-----------------------------------------------------------> progress: {(chunk_iter * 100) / estimated_chunks} %")            
+            writer.write_frame(processed_chunk)
+            telemetry.add_rows_out(len(processed_chunk))
+            progress.report()
 
 def process_chunk_valid(chunk, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives):
     df = chunk.copy()
@@ -115,19 +114,20 @@ def process_chunk_valid(chunk, median_countries, median_pnns_1, median_nova, med
     return df
 
 # lecture et traitement du fichier jsonl en morceaux valid
-def browse_file_valid(estimated_chunks, input_file, output_file, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives):
-    chunk_iter = 0
-    with open(input_file, 'r') as infile, open(output_file, 'w') as outfile:
-        for chunk in pd.read_json(infile, lines=True, chunksize=chunk_size):
-            chunk_iter +=1
+def browse_file_valid(input_file, output_file, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives):
+    progress = Progress([input_file])
+    with open_writer(output_file) as writer:
+        for chunk in telemetry.track_chunks(read_chunks(input_file, chunk_size, progress=progress)):
             processed_chunk = process_chunk_valid(chunk, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives)
-            processed_chunk.to_json(outfile, orient='records', lines=True)
-            print(f"-----------------------------------------------------------> progress: {(chunk_iter * 100) / estimated_chunks} %")       
+            writer.write_frame(processed_chunk)
+            telemetry.add_rows_out(len(processed_chunk))
+            progress.report()
 
 # utilise fichier de validation pour calculer mediane ecoscore 
+# (en parquet seule la colonne demandée est lue)
 def calculate_global_median(file_path, column_name, chunksize):
     all_values = []
-    for chunk in pd.read_json(file_path, lines=True, chunksize=chunksize):
+    for chunk in read_chunks(file_path, chunksize, columns=[column_name]):
         if column_name in chunk.columns:
             all_values.extend(chunk[column_name].dropna().tolist())
     if all_values:
@@ -143,7 +143,10 @@ def calculate_global_median(file_path, column_name, chunksize):
 ###############################################################################
 def main(chunk_size, file_id, data_path):
     chunk_size = int(chunk_size)
-    train = data_path + file_id + '_train.jsonl' 
+    train = data_path + file_id + '_train' + extension()
+    test = data_path + file_id + '_test' + extension()
+    valid = data_path + file_id + '_valid' + extension()
+    telemetry.start_stage('04_norm_impuNaN', file_id, [train, test, valid])
     median_pnns_1 = calculate_global_median(train, 'pnns_1', chunk_size)
     print(f"median in train file for pnns_1: {median_pnns_1}")
     median_countries = calculate_global_median(train, 'countries', chunk_size)
@@ -158,28 +161,21 @@ def main(chunk_size, file_id, data_path):
     print(f"median in train file for additives: {median_additives}")
 
     print("TRAIN")
-    train_01 = data_path + file_id + '_train_01.jsonl' 
-    print("estimating necessary chunk number train")
-    estimated_chunks_train = count_chunks(train, chunk_size)
+    train_01 = data_path + file_id + '_train_01' + extension()
     print("browse throw train file to process columns")
-    browse_file_test_train(estimated_chunks_train, train, train_01, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives)
+    browse_file_test_train(train, train_01, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives)
 
     print("TEST")
-    test = data_path + file_id + '_test.jsonl' 
-    test_01 = data_path + file_id + '_test_01.jsonl' 
-    print("estimating necessary chunk number test")
-    estimated_chunks_test = count_chunks(test, chunk_size)
+    test_01 = data_path + file_id + '_test_01' + extension()
     print("browse throw test file to process columns")
-    browse_file_test_train(estimated_chunks_test, test, test_01, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives)
+    browse_file_test_train(test, test_01, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives)
 
     print("VALIDATION")
-    valid = data_path + file_id + '_valid.jsonl' 
-    valid_01 = data_path + file_id + '_valid_01.jsonl' 
-    print("estimating necessary chunk number valid")
-    estimated_chunks_valid = count_chunks(valid, chunk_size)
+    valid_01 = data_path + file_id + '_valid_01' + extension()
     print("browse throw valid file to process columns")
-    browse_file_valid(estimated_chunks_valid, valid, valid_01, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives)
-    
+    browse_file_valid(valid, valid_01, chunk_size, median_countries, median_pnns_1, median_nova, median_palm_oil, median_nutriscore_tags, median_additives)
+    telemetry.end_stage([train_01, test_01, valid_01])
+
     print("deleting file jsonl train 00")
     delete_file(train)
     print("deleting file jsonl test 00")
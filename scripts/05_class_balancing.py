@@ -2,17 +2,13 @@ import pandas as pd
 import json
 import sys
 import os
+from pipeline_config import keep_intermediates
+import telemetry
+from intermediate_io import iter_record_chunks, extension
 
 
 def load_jsonl_data_in_batches(filepath, batch_size):
-    batch = []
-    with open(filepath, 'r') as f:
-        for i, line in enumerate(f):
-            batch.append(json.loads(line))
-            if (i + 1) % batch_size == 0:
-                yield pd.DataFrame(batch)
-                batch = []
-    if batch:
+    for batch in iter_record_chunks(filepath, batch_size):
         yield pd.DataFrame(batch)
 
 def balance_classes_in_batch(df, target_column):
@@ -33,10 +29,11 @@ def process_file_in_batches(input_path, output_path, batch_size, target_column):
     with open(output_path, 'w'):
         pass
     all_balanced_df = []
-    for batch_df in load_jsonl_data_in_batches(input_path, batch_size):
+    for batch_df in telemetry.track_chunks(load_jsonl_data_in_batches(input_path, batch_size)):
         balanced_df = balance_classes_in_batch(batch_df, target_column)
         all_balanced_df.append(balanced_df)
         save_jsonl_data(balanced_df, output_path)
+        telemetry.add_rows_out(len(balanced_df))
     return pd.concat(all_balanced_df, ignore_index=True)
 
 def display_class_counts(df, filename, target_column):
@@ -44,7 +41,9 @@ def display_class_counts(df, filename, target_column):
     print(df[target_column].value_counts())
 
 def delete_file(file_path):
-    if os.path.exists(file_path):
+    if keep_intermediates():
+        print(f"file kept for orchestrator: {file_path}")
+    elif os.path.exists(file_path):
         os.remove(file_path)
         print(f"file deleted: {file_path}")
     else:
@@ -57,10 +56,12 @@ def delete_file(file_path):
 ###############################################################################
 def main(chunk_size, file_id, data_path):
     batch_size = int(chunk_size)
-    train_data_path = data_path + file_id + "_train_01.jsonl"
-    test_data_path = data_path + file_id + "_test_01.jsonl"
-    valid_data_path = data_path + file_id + "_valid_01.jsonl"
+    train_data_path = data_path + file_id + "_train_01" + extension()
+    test_data_path = data_path + file_id + "_test_01" + extension()
+    valid_data_path = data_path + file_id + "_valid_01" + extension()
     target_column = 'ecoscore_tags'
+    outputs = [data_path + file_id + name for name in ["_train_02.jsonl", "_test_02.jsonl", "_valid_02.jsonl"]]
+    telemetry.start_stage('05_class_balancing', file_id, [train_data_path, test_data_path, valid_data_path])
 
     train_balanced_df = process_file_in_batches(train_data_path, data_path + file_id + "_train_02.jsonl", batch_size, target_column)
     test_balanced_df = process_file_in_batches(test_data_path, data_path + file_id + "_test_02.jsonl", batch_size, target_column)
@@ -69,6 +70,7 @@ def main(chunk_size, file_id, data_path):
     display_class_counts(train_balanced_df, "_train_02.jsonl", target_column)
     display_class_counts(test_balanced_df, "_test_02.jsonl", target_column)
     display_class_counts(valid_balanced_df, "_valid_02.jsonl", target_column)   
+    telemetry.end_stage(outputs)
     
     print(f"deleting {train_data_path}")
     delete_file(train_data_path)
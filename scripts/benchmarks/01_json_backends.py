@@ -0,0 +1,48 @@
+import os
+import json
+import time
+import importlib
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+keep_usefull_columns = importlib.import_module('01_keep_usefull_columns')
+
+
+# implémentation d'origine: décodage complet de chaque ligne puis json.dumps
+def current_filter(lines, columns_to_keep, jsonl_02):
+    with open(jsonl_02, 'w', encoding='utf-8') as outfile:
+        for line in lines:
+            record = json.loads(line.strip())
+            filtered_record = {key: record.get(key) for key in columns_to_keep}
+            outfile.write(json.dumps(filtered_record) + '\n')
+
+def bench(name, run, nb_lines, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<10} {nb_lines / best:>10.0f} rows/s")
+
+###############################################################################
+# MAIN ########################################################################
+###############################################################################
+def main(jsonl_01, nb_lines, repeat):
+    nb_lines, repeat = int(nb_lines), int(repeat)
+    with keep_usefull_columns.open_input(jsonl_01) as infile:
+        lines = [line for _, line in zip(range(nb_lines), infile)]
+    columns = keep_usefull_columns.COLUMNS_TO_KEEP
+    print(f"{len(lines)} lines from {jsonl_01}")
+    bench('current', lambda: current_filter(lines, columns, os.devnull), len(lines), repeat)
+    for json_backend in ['json', 'orjson', 'simdjson']:
+        if keep_usefull_columns.resolve_json_backend(json_backend) != json_backend:
+            continue
+        bench(json_backend,
+              lambda: keep_usefull_columns.write_filtered_lines(lines, columns, os.devnull, 10000, json_backend),
+              len(lines), repeat)
+
+if __name__ == "__main__":
+    jsonl_01 = sys.argv[1]
+    nb_lines = sys.argv[2] if len(sys.argv) > 2 else 10000
+    repeat = sys.argv[3] if len(sys.argv) > 3 else 3
+    main(jsonl_01, nb_lines, repeat)
@@ -0,0 +1,46 @@
+import os
+import time
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from intermediate_io import read_jsonl_chunks
+
+
+# lecture complète d'un jsonl par pd.read_json puis par pyarrow.json (schéma explicite):
+# temps et colonnes dont le dtype change d'un morceau à l'autre
+def read_all(jsonl_file, chunk_size, json_reader, raw):
+    start = time.perf_counter()
+    dtypes = {}
+    rows = 0
+    for chunk in read_jsonl_chunks(jsonl_file, chunk_size, dtype={'code': str} if raw else True, raw=raw,
+                                   reader=json_reader):
+        rows += len(chunk)
+        for column, dtype in chunk.dtypes.items():
+            dtypes.setdefault(column, set()).add(str(dtype))
+    return time.perf_counter() - start, rows, dtypes
+
+def bench(json_reader, jsonl_file, chunk_size, raw, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        seconds, rows, dtypes = read_all(jsonl_file, chunk_size, json_reader, raw)
+        best = min(best, seconds)
+    unstable = sorted(column for column, types in dtypes.items() if len(types) > 1)
+    print(f"{json_reader:<10} {best * 1000:>10.0f} ms {rows / best:>10.0f} rows/s   columns with changing dtype: {unstable}")
+    return best
+
+###############################################################################
+# MAIN ########################################################################
+###############################################################################
+def main(jsonl_file, chunk_size, repeat, raw):
+    chunk_size, repeat, raw = int(chunk_size), int(repeat), raw == 'raw'
+    print(f"{jsonl_file} ({'raw columns of 01' if raw else 'processed columns'}), chunks of {chunk_size} rows")
+    pandas = bench('pandas', jsonl_file, chunk_size, raw, repeat)
+    arrow = bench('arrow', jsonl_file, chunk_size, raw, repeat)
+    print(f"speedup: {pandas / arrow:.1f}x")
+
+if __name__ == "__main__":
+    jsonl_file = sys.argv[1]
+    chunk_size = sys.argv[2] if len(sys.argv) > 2 else 10000
+    repeat = sys.argv[3] if len(sys.argv) > 3 else 3
+    raw = sys.argv[4] if len(sys.argv) > 4 else 'raw'
+    main(jsonl_file, chunk_size, repeat, raw)
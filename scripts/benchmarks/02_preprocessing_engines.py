@@ -0,0 +1,48 @@
+import os
+import time
+import importlib
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+columns_preprocessing = importlib.import_module('02_columns_preprocessing')
+from intermediate_io import read_chunks
+
+
+def bench(name, process, chunks, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for chunk in chunks:
+            process(chunk, columns_preprocessing.VALUES_TO_REPLACE)
+        best = min(best, time.perf_counter() - start)
+    nb_rows = sum(len(chunk) for chunk in chunks)
+    print(f"{name:<12} {best * 1000 / len(chunks):>10.0f} ms/chunk {nb_rows / best:>10.0f} rows/s")
+    return best
+
+# sorties des deux moteurs comparées en jsonl, comme écrites par browse_file
+def same_output(chunks):
+    for chunk in chunks:
+        legacy = columns_preprocessing.process_chunk(chunk, columns_preprocessing.VALUES_TO_REPLACE)
+        vectorized = columns_preprocessing.process_chunk_vectorized(chunk, columns_preprocessing.VALUES_TO_REPLACE)
+        if legacy.to_json(orient='records', lines=True) != vectorized.to_json(orient='records', lines=True):
+            return False
+    return True
+
+###############################################################################
+# MAIN ########################################################################
+###############################################################################
+def main(jsonl_02, chunk_size, nb_chunks, repeat):
+    chunk_size, nb_chunks, repeat = int(chunk_size), int(nb_chunks), int(repeat)
+    chunks = [chunk for _, chunk in zip(range(nb_chunks), read_chunks(jsonl_02, chunk_size, dtype={'code': str}, raw=True))]
+    print(f"{len(chunks)} chunks of {chunk_size} rows from {jsonl_02}")
+    print(f"identical output: {same_output(chunks)}")
+    legacy = bench('legacy', columns_preprocessing.process_chunk, chunks, repeat)
+    vectorized = bench('vectorized', columns_preprocessing.process_chunk_vectorized, chunks, repeat)
+    print(f"speedup: {legacy / vectorized:.1f}x")
+
+if __name__ == "__main__":
+    jsonl_02 = sys.argv[1]
+    chunk_size = sys.argv[2] if len(sys.argv) > 2 else 10000
+    nb_chunks = sys.argv[3] if len(sys.argv) > 3 else 1
+    repeat = sys.argv[4] if len(sys.argv) > 4 else 3
+    main(jsonl_02, chunk_size, nb_chunks, repeat)
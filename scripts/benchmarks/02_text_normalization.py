@@ -0,0 +1,52 @@
+import os
+import time
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from intermediate_io import read_chunks
+from text_normalization import PUNCTUATION_PATTERN, normalize_columns
+
+
+# colonnes texte du jsonl 02 telles qu'elles arrivent à la normalisation (listes jointes par ', ')
+TEXT_COLUMNS = ['product_name', 'ingredients_tags', 'categories_tags', 'food_groups_tags', 'nutrient_levels_tags',
+                'compared_to_category', 'packaging_tags', '_keywords', 'stores', 'ecoscore_data']
+
+def text_frame(chunk):
+    df = chunk[[column for column in TEXT_COLUMNS if column in chunk.columns]].copy()
+    for column in df.columns:
+        df[column] = df[column].map(lambda x: ', '.join(map(str, x)) if isinstance(x, list) else str(x))
+    return df
+
+# implémentation d'origine: str.lower puis regex, une colonne après l'autre
+def current_chain(df):
+    for column in df.columns:
+        df[column] = df[column].str.lower().str.replace(PUNCTUATION_PATTERN, ' ', regex=True)
+    return df
+
+def bench(name, run, df, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        copy = df.copy()
+        start = time.perf_counter()
+        result = run(copy)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<10} {best * 1000:>10.0f} ms {len(df) / best:>10.0f} rows/s")
+    return best, result
+
+###############################################################################
+# MAIN ########################################################################
+###############################################################################
+def main(jsonl_02, chunk_size, repeat):
+    chunk_size, repeat = int(chunk_size), int(repeat)
+    df = text_frame(next(read_chunks(jsonl_02, chunk_size, raw=True)))
+    print(f"{len(df)} rows, {len(df.columns)} text columns from {jsonl_02}")
+    current, expected = bench('current', current_chain, df, repeat)
+    kernel, result = bench('kernel', lambda copy: normalize_columns(copy, list(copy.columns)), df, repeat)
+    print(f"identical output: {result.equals(expected)}")
+    print(f"speedup: {current / kernel:.1f}x")
+
+if __name__ == "__main__":
+    jsonl_02 = sys.argv[1]
+    chunk_size = sys.argv[2] if len(sys.argv) > 2 else 10000
+    repeat = sys.argv[3] if len(sys.argv) > 3 else 3
+    main(jsonl_02, chunk_size, repeat)
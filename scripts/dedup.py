@@ -0,0 +1,125 @@
+import os
+import json
+import math
+import sqlite3
+import hashlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# dédoublonnage en flux des produits (au décodage de 02): une ligne est écartée si son code produit
+# ou l'empreinte de ses autres colonnes normalisées a déjà été vu sur une ligne gardée (la première
+# occurrence est conservée); clés de 64 bits en mémoire jusqu'à max_memory_keys, puis déversées
+# dans une base sqlite temporaire (même principe que la base produits de delta_ingestion.py); en
+# ingestion delta, les clés vues partent de zéro à chaque delta (doublons au sein du delta seulement)
+DEDUP_REASONS = ['duplicate_code', 'duplicate_content']
+SQLITE_MAX_VARIABLES = 500
+
+def hash_key(prefix, data):
+    digest = hashlib.blake2b(prefix + data, digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+# valeur normalisée pour l'empreinte: texte sans casse ni espaces de bord, tags triés, nombres en
+# flottants (1 et 1.0 identiques), valeurs manquantes -> None; dict gardés tels quels
+def normalized_value(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, list):
+        return sorted(str(item).strip().lower() for item in value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+def dumps_sorted(values):
+    if orjson is not None:
+        try:
+            return orjson.dumps(values, option=orjson.OPT_SORT_KEYS)
+        except TypeError: # grands entiers, clés non textuelles
+            pass
+    return json.dumps(values, sort_keys=True, default=str).encode('utf-8')
+
+def code_key(code):
+    if code is None or (isinstance(code, float) and math.isnan(code)):
+        return None
+    code = str(code).strip()
+    return hash_key(b'code:', code.encode('utf-8')) if code else None
+
+def content_key(values):
+    return hash_key(b'content:', dumps_sorted([normalized_value(value) for value in values]))
+
+# (clé du code, clé du contenu) de chaque ligne d'un morceau brut
+def row_keys(df):
+    features = [column for column in df.columns if column != 'code']
+    codes = df['code'].tolist() if 'code' in df.columns else [None] * len(df)
+    columns = [df[column].tolist() for column in features]
+    return [(code_key(code), content_key(values)) for code, values in zip(codes, zip(*columns))]
+
+class SeenKeys:
+    def __init__(self, spill_path, max_memory_keys=2000000):
+        self.spill_path = spill_path
+        self.max_memory_keys = max_memory_keys
+        self.memory = set()
+        self.store = None
+
+    def spilled(self, keys):
+        if self.store is None or not keys:
+            return set()
+        keys = list(keys)
+        found = set()
+        for i in range(0, len(keys), SQLITE_MAX_VARIABLES):
+            batch = keys[i:i + SQLITE_MAX_VARIABLES]
+            query = f"SELECT key FROM seen WHERE key IN ({','.join('?' * len(batch))})"
+            found.update(key for (key,) in self.store.execute(query, batch))
+        return found
+
+    def spill(self):
+        if self.store is None:
+            if os.path.exists(self.spill_path):
+                os.remove(self.spill_path)
+            self.store = sqlite3.connect(self.spill_path)
+            self.store.execute("PRAGMA journal_mode = OFF")
+            self.store.execute("PRAGMA synchronous = OFF")
+            self.store.execute("CREATE TABLE seen (key INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self.store.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((key,) for key in self.memory))
+        self.store.commit()
+        self.memory = set()
+
+    # raison de rejet de chaque ligne (None si gardée), dans l'ordre; les clés des lignes gardées
+    # sont ajoutées au fur et à mesure (doublons internes au morceau compris)
+    def check(self, keys):
+        candidates = {key for pair in keys for key in pair if key is not None and key not in self.memory}
+        seen = self.spilled(candidates)
+        reasons = []
+        for code, content in keys:
+            if code is not None and (code in self.memory or code in seen):
+                reasons.append('duplicate_code')
+            elif content in self.memory or content in seen:
+                reasons.append('duplicate_content')
+            else:
+                reasons.append(None)
+                if code is not None:
+                    self.memory.add(code)
+                self.memory.add(content)
+        if len(self.memory) >= self.max_memory_keys:
+            self.spill()
+        return reasons
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+            os.remove(self.spill_path)
+
+# masque des lignes gardées, raisons de rejet comptées dans counts
+def keep_mask(reasons, counts):
+    counts.update(reason for reason in reasons if reason is not None)
+    return [reason is None for reason in reasons]
+
+def report(point, counts, rows):
+    removed = sum(counts.values())
+    details = ', '.join(f"{reason} {counts.get(reason, 0)}" for reason in DEDUP_REASONS)
+    print(f"duplicates removed at {point}: {removed} / {rows} ({details})")
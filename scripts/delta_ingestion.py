@@ -0,0 +1,152 @@
+import os
+import json
+import sqlite3
+import importlib
+import sys
+from pipeline_config import get_param
+import telemetry
+from intermediate_io import open_writer, iter_record_chunks, extension
+from vocabularies import load_vocabularies, save_vocabularies
+
+collect_data = importlib.import_module('00_collect_data')
+keep_usefull_columns = importlib.import_module('01_keep_usefull_columns')
+columns_preprocessing = importlib.import_module('02_columns_preprocessing')
+
+
+# base locale des produits déjà traités (sortie de 02), indexée par code produit
+def open_store(store_path):
+    store = sqlite3.connect(store_path)
+    store.execute("CREATE TABLE IF NOT EXISTS products (code TEXT PRIMARY KEY, record TEXT)")
+    return store
+
+def upsert_records(store, jsonl_03, chunk_size):
+    count = 0
+    for chunk in iter_record_chunks(jsonl_03, chunk_size):
+        rows = [(str(record['code']), json.dumps(record)) for record in chunk]
+        store.executemany("INSERT OR REPLACE INTO products VALUES (?, ?)", rows)
+        count += len(rows)
+    store.commit()
+    return count
+
+# codes présents dans le delta: anciennes versions supprimées avant réinsertion
+# (un produit écarté par le traitement ne doit pas rester dans la base)
+def delete_touched_codes(store, jsonl_02, chunk_size):
+    count = 0
+    for chunk in iter_record_chunks(jsonl_02, chunk_size):
+        store.executemany("DELETE FROM products WHERE code = ?", [(str(record['code']),) for record in chunk])
+        count += len(chunk)
+    store.commit()
+    return count
+
+# occurrences des vocabulaires recomptées sur les produits de la base (identifiants <colonne>_ids):
+# un produit remplacé par le delta n'est compté qu'une fois, avec ses nouveaux tags
+def recount_vocabularies(store, vocabulary_file):
+    vocabularies = load_vocabularies(vocabulary_file)
+    for vocabulary in vocabularies.values():
+        vocabulary.reset_counts()
+    for (record,) in store.execute("SELECT record FROM products"):
+        record = json.loads(record)
+        for column, vocabulary in vocabularies.items():
+            ids = record.get(column + '_ids')
+            if isinstance(ids, list):
+                vocabulary.count([ids])
+    save_vocabularies(vocabularies, vocabulary_file)
+
+def export_store(store, jsonl_03):
+    with open_writer(jsonl_03) as writer:
+        for (record,) in store.execute("SELECT record FROM products"):
+            writer.write_record(json.loads(record))
+
+# initialise la base avec le jsonl 03 d'un traitement complet
+def seed_store(store_path, jsonl_03, chunk_size):
+    store = open_store(store_path)
+    store.execute("DELETE FROM products")
+    count = upsert_records(store, jsonl_03, chunk_size)
+    store.close()
+    print(f"product store seeded: {count} products, {store_path}")
+    return count
+
+# applique un fichier delta (produits nouveaux/modifiés) puis régénère le jsonl 03
+def apply_delta(store_path, delta_file, data_path, file_id, chunk_size):
+    if not os.path.exists(store_path):
+        print(f"ERROR, product store does not exists, run a full ingestion first: {store_path}")
+        sys.exit(1)
+    if delta_file.startswith('http'):
+        delta_gz = data_path + file_id + '_delta_00.jsonl.gz'
+        if os.path.exists(delta_gz):
+            os.remove(delta_gz)
+        print(f"downloading delta file: {delta_file}")
+        collect_data.download_file(delta_file, delta_gz, chunk_size)
+        delta_file = delta_gz
+    delta_02 = data_path + file_id + '_delta_02' + extension()
+    delta_03 = data_path + file_id + '_delta_03' + extension()
+    jsonl_03 = data_path + file_id + '_openfoodfacts_03' + extension()
+    # pas de filtrage des lignes inutiles à la projection: tous les codes touchés doivent être
+    # supprimés de la base, le filtrage a lieu au décodage de 02
+    print("keep usefull columns of touched products")
+    keep_usefull_columns.jsonl_filtered_creator(delta_file, keep_usefull_columns.COLUMNS_TO_KEEP, delta_02, chunk_size,
+                                                get_param('json_backend', 'json'))
+    print("process columns of touched products")
+    # vocabulaires du traitement complet étendus: identifiants des produits déjà en base inchangés;
+    # pays rares selon les occurrences du traitement complet; dédoublonnage (dedup_products) limité
+    # aux lignes du delta: les clés de contenu sont calculées sur les colonnes brutes, absentes de la
+    # base, et un code déjà en base est une mise à jour, pas un doublon (remplacé par l'upsert)
+    columns_preprocessing.browse_file(delta_02, delta_03, chunk_size, columns_preprocessing.VALUES_TO_REPLACE,
+                                      columns_preprocessing.vocabulary_path(data_path, file_id), reset_counts=False,
+                                      country_counts_file=columns_preprocessing.country_counts_path(data_path, file_id))
+    store = open_store(store_path)
+    touched = delete_touched_codes(store, delta_02, chunk_size)
+    updated = upsert_records(store, delta_03, chunk_size)
+    print(f"delta applied: {touched} products touched, {updated} products updated")
+    vocabulary_file = columns_preprocessing.vocabulary_path(data_path, file_id)
+    if get_param('vocabulary_mode', 'off') != 'off' and os.path.exists(vocabulary_file):
+        print("recounting vocabularies over the product store")
+        recount_vocabularies(store, vocabulary_file)
+    print("regenerating jsonl 03 from product store")
+    export_store(store, jsonl_03)
+    store.close()
+    # fichiers temporaires du delta, supprimés même quand l'orchestrateur garde les intermédiaires
+    for temp_file in [delta_02, delta_03, data_path + file_id + '_delta_00.jsonl.gz']:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+            print(f"file deleted: {temp_file}")
+    return touched, updated
+
+
+###############################################################################
+# MAIN ########################################################################
+###############################################################################
+def main(chunk_size, file_id, data_path, mode, delta_file=None):
+    chunk_size = int(chunk_size)
+    store_path = data_path + file_id + '_product_store.sqlite'
+    jsonl_03 = data_path + file_id + '_openfoodfacts_03' + extension()
+    if mode == 'seed':
+        metrics = telemetry.start_stage('delta_ingestion_seed', file_id, [jsonl_03])
+        print("seeding product store with jsonl 03")
+        metrics.rows_in = metrics.rows_out = seed_store(store_path, jsonl_03, chunk_size)
+        telemetry.end_stage([store_path])
+    elif mode == 'apply':
+        delta_file = delta_file or get_param('delta_file', '')
+        if not delta_file:
+            print("ERROR, no delta file given (argument or delta_file in config.json)")
+            sys.exit(1)
+        if not delta_file.startswith('http') and not os.path.exists(delta_file):
+            print(f"ERROR, delta file does not exists: {delta_file}")
+            sys.exit(1)
+        metrics = telemetry.start_stage('delta_ingestion_apply', file_id,
+                                        [delta_file] if os.path.exists(delta_file) else [])
+        print(f"applying delta file: {delta_file}")
+        # compteurs remplacés par les lignes du delta et les produits mis à jour
+        metrics.rows_in, metrics.rows_out = apply_delta(store_path, delta_file, data_path, file_id, chunk_size)
+        telemetry.end_stage([jsonl_03, store_path])
+    else:
+        print(f"ERROR, unknown mode: {mode}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    chunk_size = sys.argv[1]
+    file_id = sys.argv[2]
+    data_path = sys.argv[3]
+    mode = sys.argv[4]
+    delta_file = sys.argv[5] if len(sys.argv) > 5 else None
+    main(chunk_size, file_id, data_path, mode, delta_file)
@@ -0,0 +1,51 @@
+import re
+import numpy as np
+import pandas as pd
+
+
+# encodage catégoriel commun au prétraitement (02), à l'entraînement et à l'inférence (test_model):
+# vocabulaire fixe, code = position dans le vocabulaire, valeur hors vocabulaire ou manquante -> <NA>
+GRADES = ['a', 'b', 'c', 'd', 'e']
+GRADE_ALIASES = {'a-plus': 'a'}
+PNNS_1_GROUPS = ['sugary snacks',
+                 'fat and sauces',
+                 'composite foods',
+                 'fruits and vegetables',
+                 'milk and dairy products',
+                 'cereals and potatoes',
+                 'fish meat eggs',
+                 'beverages',
+                 'alcoholic beverages',
+                 'salty snacks',
+                 'sugary-snacks']
+LANGUAGE_PREFIX = re.compile(r'^\w{2}:')
+
+# liste de tags ('["en:c"]') -> premier tag, chaîne gardée telle quelle, sinon None
+def first_tag(value):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value if isinstance(value, str) else None
+
+# codes int8 (dtype nullable Int8) d'une série ou liste de valeurs brutes: minuscules, espaces et
+# préfixe de langue retirés puis recherche exacte dans le vocabulaire
+def encode_categories(values, categories, aliases=None):
+    index = values.index if isinstance(values, pd.Series) else None
+    keys = pd.Series([first_tag(value) for value in values], dtype=object)
+    keys = keys.str.strip().str.lower().str.replace(LANGUAGE_PREFIX, '', regex=True)
+    if aliases:
+        keys = keys.replace(aliases)
+    codes = pd.Index(categories).get_indexer(keys)
+    encoded = pd.arrays.IntegerArray(codes.astype(np.int8), codes < 0)
+    return pd.Series(encoded, index=index)
+
+# code (éventuellement flottant, ex. sortie du modèle: arrondi et borné) -> catégorie, None si manquant
+def decode_category(code, categories):
+    if code is None or pd.isna(code):
+        return None
+    return categories[int(min(max(round(float(code)), 0), len(categories) - 1))]
+
+def encode_grades(values):
+    return encode_categories(values, GRADES, GRADE_ALIASES)
+
+def decode_grade(code):
+    return decode_category(code, GRADES)
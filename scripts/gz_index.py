@@ -0,0 +1,93 @@
+import os
+import json
+try:
+    import indexed_gzip
+except ImportError:
+    indexed_gzip = None
+
+
+# index d'accès aléatoire au jsonl.gz: points de reprise du décompresseur (style zran,
+# via indexed_gzip) + offsets décompressés alignés sur les débuts de ligne
+def index_paths(jsonl_gz):
+    return jsonl_gz + '.gzidx', jsonl_gz + '.lines.json'
+
+def archive_signature(jsonl_gz):
+    stat = os.stat(jsonl_gz)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+def build_gz_index(jsonl_gz, spacing, read_size=4 * 1024 * 1024):
+    index_file, lines_file = index_paths(jsonl_gz)
+    line_offsets = [0]
+    position = 0
+    next_checkpoint = spacing
+    searching = False
+    with indexed_gzip.IndexedGzipFile(jsonl_gz, spacing=spacing) as file:
+        while True:
+            block = file.read(read_size)
+            if not block:
+                break
+            # premier début de ligne après chaque multiple de spacing
+            start = 0
+            while True:
+                if not searching and position + len(block) > next_checkpoint:
+                    start = max(start, next_checkpoint - position)
+                    searching = True
+                if not searching:
+                    break
+                newline = block.find(b'\n', start)
+                if newline == -1:
+                    break
+                line_offsets.append(position + newline + 1)
+                start = newline + 1
+                next_checkpoint = position + newline + 1 + spacing
+                searching = False
+            position += len(block)
+        file.export_index(index_file)
+    if line_offsets[-1] != position:
+        line_offsets.append(position)
+    with open(lines_file, 'w') as file:
+        json.dump({'archive': archive_signature(jsonl_gz),
+                   'spacing': spacing,
+                   'line_offsets': line_offsets}, file)
+    print(f"gz index built: {len(line_offsets) - 1} line aligned checkpoints, {index_file}")
+    return line_offsets
+
+# réutilise l'index en cache s'il correspond toujours à l'archive, sinon le reconstruit
+def load_gz_index(jsonl_gz, spacing):
+    if indexed_gzip is None:
+        print("warning, indexed_gzip not installed, gz file can only be read serially")
+        return None
+    index_file, lines_file = index_paths(jsonl_gz)
+    if os.path.exists(index_file) and os.path.exists(lines_file):
+        with open(lines_file, 'r') as file:
+            cached = json.load(file)
+        if cached['archive'] == archive_signature(jsonl_gz) and cached['spacing'] == spacing:
+            print(f"gz index reused: {index_file}")
+            return cached['line_offsets']
+    return build_gz_index(jsonl_gz, spacing)
+
+def delete_gz_index(jsonl_gz):
+    for file_path in index_paths(jsonl_gz):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+# découpe en nb_ranges plages contiguës [début, fin[ alignées sur les lignes
+def gz_ranges(line_offsets, nb_ranges):
+    nb_checkpoints = len(line_offsets) - 1
+    nb_ranges = max(1, min(nb_ranges, nb_checkpoints))
+    bounds = [line_offsets[(i * nb_checkpoints) // nb_ranges] for i in range(nb_ranges)]
+    bounds.append(line_offsets[-1])
+    return [(bounds[i], bounds[i + 1]) for i in range(nb_ranges) if bounds[i] < bounds[i + 1]]
+
+# lignes (bytes) de la plage [start, end[, décompression reprise au point d'index le plus proche
+def read_gz_range(jsonl_gz, start, end):
+    index_file, _ = index_paths(jsonl_gz)
+    with indexed_gzip.IndexedGzipFile(jsonl_gz, index_file=index_file) as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
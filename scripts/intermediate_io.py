@@ -0,0 +1,515 @@
+import io
+import os
+import re
+import gc
+import glob
+import json
+import shutil
+import itertools
+import pandas as pd
+from pipeline_config import get_param
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.json as pa_json
+except ImportError:
+    pa = None
+    if get_param('intermediate_format', 'jsonl') == 'parquet':
+        print("warning, pyarrow not installed, fallback to jsonl intermediates")
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# lecture / écriture des fichiers intermédiaires entre les étapes, en jsonl (texte) ou
+# en parquet (colonnes typées, chaînes encodées par dictionnaire)
+RAW_LIST_COLUMNS = ['ingredients_tags', 'ecoscore_tags', 'categories_tags', 'food_groups_tags',
+                    'nutrient_levels_tags', 'nutriscore_tags', '_keywords', 'packaging_tags']
+RAW_NUMERIC_COLUMNS = ['ecoscore_score', 'nova_group', 'ingredients_from_or_that_may_be_from_palm_oil_n',
+                       'additives_old_n']
+RAW_JSON_COLUMNS = ['ecoscore_data']
+NUMERIC_COLUMNS = ['pnns_1', 'ecoscore_tags', 'ecoscore_score', 'countries', 'nova', 'palm_oil',
+                   'nutriscore_tags', 'additives',
+                   # colonnes de ecoscore_data structuré (02, ecoscore_data_mode = structured)
+                   'ecoscore_co2_total', 'ecoscore_co2_agriculture', 'ecoscore_co2_processing', 'ecoscore_co2_packaging',
+                   'ecoscore_co2_transportation', 'ecoscore_co2_distribution', 'ecoscore_co2_consumption',
+                   'ecoscore_ef_total', 'ecoscore_dqr', 'ecoscore_is_beverage', 'ecoscore_packaging_value',
+                   'ecoscore_non_recyclable_materials', 'ecoscore_origins_value', 'ecoscore_epi_value',
+                   'ecoscore_transportation_value', 'ecoscore_production_system_value',
+                   'ecoscore_threatened_species_value']
+
+# lecture des jsonl: pd.read_json (types déduits morceau par morceau) ou pyarrow.json avec un
+# schéma explicite déduit des noms de colonnes (types identiques d'un morceau à l'autre)
+def json_reader():
+    json_reader = get_param('json_reader', 'pandas')
+    if json_reader == 'arrow' and pa is None:
+        return 'pandas'
+    return json_reader
+
+def intermediate_format():
+    intermediate_format = get_param('intermediate_format', 'jsonl')
+    if intermediate_format == 'parquet' and pa is None:
+        return 'jsonl'
+    return intermediate_format
+
+def extension():
+    return '.parquet' if intermediate_format() == 'parquet' else '.jsonl'
+
+def is_parquet(file_path):
+    return file_path.endswith('.parquet')
+
+# fichier shard n°i d'un intermédiaire: <nom>.partNNN.<extension>
+def shard_path(file_path, i):
+    base, ext = os.path.splitext(file_path)
+    return f"{base}.part{i:03d}{ext}"
+
+def shard_pattern(file_path):
+    base, ext = os.path.splitext(file_path)
+    return base + '.part*' + ext
+
+# shards dans l'ordre des plages (numéro de shard, pas ordre alphabétique: part1000 après part999)
+def list_shards(file_path):
+    base, ext = os.path.splitext(file_path)
+    shards = glob.glob(glob.escape(base) + '.part*' + ext)
+    return sorted(shards, key=lambda shard: int(shard[len(base) + len('.part'):len(shard) - len(ext)]))
+
+# colonnes numériques des sorties traitées: NUMERIC_COLUMNS, corrigé par le column_spec du moteur
+# planned de 02 (colonnes encodées, bornées par clip ou copiées d'une colonne brute numérique)
+def numeric_columns():
+    names = set(NUMERIC_COLUMNS)
+    if get_param('preprocessing_engine', 'legacy') == 'planned':
+        for entry in get_param('column_spec', None) or []:
+            source = entry.get('source', entry['column'])
+            normalization = entry.get('normalization')
+            if entry.get('encoding') or normalization == 'clip' or (normalization is None and source in RAW_NUMERIC_COLUMNS):
+                names.add(entry['column'])
+            else:
+                names.discard(entry['column'])
+    return names
+
+# type arrow d'une colonne d'après son seul nom, jamais d'après les valeurs: colonnes connues du
+# jsonl 02 brut (raw) ou des sorties traitées (ecoscore_tags change de type entre les deux), texte
+# sinon; tous les paquets et tous les shards d'un fichier ont ainsi le même schéma
+def column_type(name, raw=False, numeric=None):
+    if raw:
+        if name in RAW_LIST_COLUMNS:
+            return pa.list_(pa.string())
+        if name in RAW_NUMERIC_COLUMNS:
+            return pa.float64()
+        if name in RAW_JSON_COLUMNS:
+            return 'json'
+        return pa.string()
+    if name.endswith('_ids'):
+        # identifiants des vocabulaires de 02 (vocabulary_mode)
+        return pa.list_(pa.int64())
+    if name in (numeric_columns() if numeric is None else numeric):
+        return pa.float64()
+    return pa.string()
+
+# schéma fixe d'après les noms de colonnes, dict imbriqués gardés en colonnes json (texte json)
+def column_schema(names, raw=False):
+    numeric = numeric_columns()
+    fields, json_names = [], []
+    for name in names:
+        arrow_type = column_type(name, raw, numeric)
+        if arrow_type == 'json':
+            json_names.append(name)
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields, metadata={b'json_columns': json.dumps(json_names).encode()})
+
+def to_float(value):
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def to_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+# une valeur seule dans une colonne de listes (nutriscore_tags: "b") est gardée en liste d'un élément
+def to_text_list(value):
+    if not isinstance(value, list):
+        if value is None or (isinstance(value, float) and value != value):
+            return None
+        return [to_text(value)]
+    return [to_text(item) for item in value]
+
+def coerce_column(name, values, arrow_type, json_columns=()):
+    if name in json_columns:
+        return [None if value is None else json.dumps(value) for value in values]
+    if pa.types.is_list(arrow_type):
+        if pa.types.is_integer(arrow_type.value_type):
+            return [value if isinstance(value, list) else None for value in values]
+        return [to_text_list(value) for value in values]
+    if pa.types.is_floating(arrow_type):
+        return [to_float(value) for value in values]
+    return [to_text(value) for value in values]
+
+class IntermediateWriter:
+    def __init__(self, file_path, dumps=json.dumps, raw=False, buffer_size=10000):
+        self.file_path = file_path
+        self.dumps = dumps
+        self.raw = raw
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.schema = None
+        self.json_columns = []
+        self.writer = None
+        self.file = None if is_parquet(file_path) else open(file_path, 'w', encoding='utf-8')
+
+    # écriture ligne à ligne, regroupée par paquets de buffer_size en parquet
+    def write_record(self, record):
+        if self.file is not None:
+            self.file.write(self.dumps(record) + '\n')
+            return
+        self.buffer.append(record)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        records, self.buffer = self.buffer, []
+        self.write_records(records)
+
+    # lignes jsonl déjà sérialisées
+    def write_lines(self, lines):
+        if self.file is not None:
+            self.file.writelines(lines)
+            return
+        self.write_records([json.loads(line) for line in lines])
+
+    def write_records(self, records):
+        if not records:
+            return
+        if self.file is not None:
+            self.file.writelines(self.dumps(record) + '\n' for record in records)
+            return
+        names = list(self.schema.names) if self.schema is not None else list(records[0].keys())
+        columns = {name: [record.get(name) for record in records] for name in names}
+        self.write_columns(columns)
+
+    def write_frame(self, df):
+        if self.file is not None:
+            df.to_json(self.file, orient='records', lines=True)
+            return
+        if len(df) == 0:
+            return
+        names = list(self.schema.names) if self.schema is not None else list(df.columns)
+        columns = {}
+        for name in names:
+            column = df[name] if name in df.columns else pd.Series([None] * len(df), index=df.index)
+            columns[name] = column.astype(object).where(column.notna(), None).tolist()
+        self.write_columns(columns)
+
+    def write_columns(self, columns):
+        if self.schema is None:
+            # schéma fixé au premier paquet d'après les noms de colonnes; dict imbriqués stockés
+            # en texte json, décodés à la lecture
+            self.schema = column_schema(list(columns), self.raw)
+            self.json_columns = schema_json_columns(self.schema)
+            self.writer = pq.ParquetWriter(self.file_path, self.schema, use_dictionary=True, compression='snappy')
+        arrays = [pa.array(coerce_column(field.name, columns.get(field.name, []), field.type, self.json_columns),
+                           type=field.type)
+                  for field in self.schema]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self.buffer:
+            self.flush()
+        if self.file is not None:
+            self.file.close()
+        elif self.writer is not None:
+            self.writer.close()
+        else:
+            # aucune ligne écrite: fichier parquet vide
+            pq.write_table(pa.table({}), self.file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def open_writer(file_path, dumps=json.dumps, raw=False):
+    return IntermediateWriter(file_path, dumps, raw)
+
+def schema_json_columns(schema):
+    metadata = schema.metadata or {}
+    return json.loads(metadata.get(b'json_columns', b'[]'))
+
+def json_columns(parquet_file):
+    return schema_json_columns(parquet_file.schema_arrow)
+
+# schéma d'un jsonl d'après les clés de sa première ligne (toutes les lignes ont les mêmes clés
+# en sortie de 01 et 02)
+def jsonl_schema(file_path, columns=None, raw=False):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        first_line = file.readline()
+    names = list(json.loads(first_line)) if first_line.strip() else []
+    if columns is not None:
+        names = [name for name in names if name in columns]
+    return column_schema(names, raw)
+
+# entiers de 64 bits ou plus décodés en flottants par orjson (sans erreur): lignes à 19 chiffres de suite
+# laissées à json
+BIG_INTEGER = re.compile(r'\d{19}')
+BIG_INTEGER_BYTES = re.compile(rb'\d{19}')
+
+def has_big_integer(line):
+    return (BIG_INTEGER_BYTES if isinstance(line, bytes) else BIG_INTEGER).search(line) is not None
+
+# orjson si installé (grands entiers non supportés: json en secours)
+def loads(line):
+    if orjson is not None and not has_big_integer(line):
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(line)
+
+# décodage sans ramasse-miettes: les dict imbriqués créés par milliers (aucun cycle) déclenchent
+# sinon des collectes complètes répétées
+def decode_lines(lines):
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return [loads(line) for line in lines]
+    finally:
+        if enabled:
+            gc.enable()
+
+# colonne arrow -> valeurs python (listes, chaînes, None) sans passer par to_pylist, lent sur les
+# chaînes: valeurs à plat converties en une fois puis découpées selon les offsets
+def column_values(column):
+    array = column.combine_chunks()
+    if not pa.types.is_list(array.type):
+        return array.to_numpy(zero_copy_only=False).tolist()
+    flat = array.flatten().to_numpy(zero_copy_only=False).tolist()
+    offsets = array.offsets.to_numpy()
+    offsets = (offsets - offsets[0]).tolist()
+    valid = array.is_valid().to_numpy(zero_copy_only=False).tolist()
+    return [flat[start:end] if is_valid else None for start, end, is_valid in zip(offsets, offsets[1:], valid)]
+
+def is_number(value):
+    return value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+
+# colonne flottante aux valeurs toutes entières et sans manquant -> int64, comme pd.read_json
+# (nova, palm_oil, additives, ecoscore_score...: schéma en float64 pour accepter les valeurs manquantes)
+def read_json_dtype(series):
+    if series.dtype.kind != 'f' or series.empty or series.isna().any():
+        return series
+    try:
+        integers = series.astype('int64')
+    except (TypeError, ValueError, OverflowError):
+        return series
+    return integers if (integers == series).all() else series
+
+# lignes jsonl (bytes) -> DataFrame typé selon le schéma: décodage natif par pyarrow.json, colonnes json
+# décodées à part; un morceau aux types inattendus (valeur seule dans une colonne de listes, texte dans
+# une colonne numérique) est décodé ligne à ligne, les valeurs gardées telles quelles comme pd.read_json
+def lines_frame(lines, schema):
+    decoded_columns = schema_json_columns(schema)
+    parsed_schema = pa.schema([field for field in schema if field.name not in decoded_columns])
+    data = b''.join(lines)
+    records, table = None, None
+    try:
+        read_options = pa_json.ReadOptions(use_threads=False, block_size=max(1 << 20, len(data) + 1))
+        parse_options = pa_json.ParseOptions(explicit_schema=parsed_schema, unexpected_field_behavior='ignore')
+        table = pa_json.read_json(io.BytesIO(data), read_options=read_options, parse_options=parse_options)
+    except pa.ArrowInvalid:
+        records = decode_lines(lines)
+    columns = {}
+    for field in schema:
+        if field.name in decoded_columns or table is None:
+            if records is None:
+                records = decode_lines(lines)
+            values = [record.get(field.name) for record in records]
+            if pa.types.is_floating(field.type) and all(is_number(value) for value in values):
+                columns[field.name] = read_json_dtype(pd.Series(values, dtype=float))
+            else:
+                columns[field.name] = pd.Series(values, dtype=object)
+        elif pa.types.is_floating(field.type):
+            columns[field.name] = read_json_dtype(pd.Series(table.column(field.name).to_numpy(), dtype=float))
+        else:
+            # listes python et None, comme pd.read_json
+            columns[field.name] = pd.Series(column_values(table.column(field.name)), dtype=object)
+    return pd.DataFrame(columns, columns=schema.names)
+
+def decode_batch(batch, decoded_columns):
+    records = batch.to_pylist()
+    for record in records:
+        for name in decoded_columns:
+            if record.get(name) is not None:
+                record[name] = json.loads(record[name])
+    return records
+
+# suivi de progression (progress.Progress) des lecteurs: octets consommés d'un fichier lu en texte,
+# lus sur le fichier binaire sous-jacent (tell() n'est pas disponible pendant l'itération en mode texte)
+def position_tracker(progress, binary_file):
+    position = 0
+    def update():
+        nonlocal position
+        if progress is not None:
+            current = binary_file.tell()
+            progress.advance(current - position)
+            position = current
+    return update
+
+# en parquet: taille du fichier répartie au prorata des lignes de chaque batch
+def parquet_batches(file_path, chunk_size, columns=None, progress=None):
+    parquet_file = pq.ParquetFile(file_path)
+    num_rows = parquet_file.metadata.num_rows
+    file_size = os.path.getsize(file_path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        if progress is not None:
+            progress.advance(file_size * batch.num_rows / num_rows)
+        yield batch
+
+# morceaux de chunk_size lignes sous forme de listes de dict
+def iter_record_chunks(file_path, chunk_size, progress=None):
+    if is_parquet(file_path):
+        decoded_columns = json_columns(pq.ParquetFile(file_path))
+        for batch in parquet_batches(file_path, chunk_size, progress=progress):
+            yield decode_batch(batch, decoded_columns)
+        return
+    chunk = []
+    with open(file_path, 'rb') as binary_file:
+        file = io.TextIOWrapper(binary_file, encoding='utf-8')
+        update_position = position_tracker(progress, binary_file)
+        for line in file:
+            try:
+                chunk.append(json.loads(line))
+            except json.JSONDecodeError:
+                print("Erreur de décodage JSON dans la ligne suivante :")
+                print(line)
+                continue
+            if len(chunk) >= chunk_size:
+                update_position()
+                yield chunk
+                chunk = []
+        update_position()
+    if chunk:
+        yield chunk
+
+def iter_records(file_path, chunk_size=10000):
+    for chunk in iter_record_chunks(file_path, chunk_size):
+        yield from chunk
+
+# morceaux de chunk_size lignes d'un jsonl sous forme de DataFrame, lecteur de json_reader() par défaut
+# raw: colonnes brutes de 01 pour le schéma explicite du lecteur arrow
+def read_jsonl_chunks(file_path, chunk_size, columns=None, dtype=True, raw=False, reader=None, progress=None):
+    if (reader or json_reader()) == 'arrow':
+        schema = jsonl_schema(file_path, columns, raw)
+        with open(file_path, 'rb') as infile:
+            update_position = position_tracker(progress, infile)
+            while True:
+                lines = list(itertools.islice(infile, chunk_size))
+                if not lines:
+                    return
+                update_position()
+                yield lines_frame(lines, schema)
+    with open(file_path, 'rb') as binary_file:
+        infile = io.TextIOWrapper(binary_file, encoding='utf-8')
+        update_position = position_tracker(progress, binary_file)
+        for chunk in pd.read_json(infile, lines=True, chunksize=chunk_size, dtype=dtype):
+            update_position()
+            yield chunk if columns is None else chunk[[c for c in columns if c in chunk.columns]]
+
+# morceaux de chunk_size lignes sous forme de DataFrame, seulement les colonnes demandées en parquet
+# (et en jsonl avec le lecteur arrow)
+def read_chunks(file_path, chunk_size, columns=None, dtype=True, raw=False, progress=None):
+    if not is_parquet(file_path):
+        yield from read_jsonl_chunks(file_path, chunk_size, columns, dtype, raw, progress=progress)
+        return
+    parquet_file = pq.ParquetFile(file_path)
+    if columns is not None:
+        columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+    decoded_columns = json_columns(parquet_file)
+    for batch in parquet_batches(file_path, chunk_size, columns, progress):
+        yield batch_frame(batch, decoded_columns)
+
+def batch_frame(batch, decoded_columns):
+    if decoded_columns or any(pa.types.is_list(field.type) for field in batch.schema):
+        # listes et dict python, comme pd.read_json
+        df = pd.DataFrame(decode_batch(batch, decoded_columns), columns=batch.schema.names)
+    else:
+        df = batch.to_pandas()
+    for field in batch.schema:
+        if pa.types.is_floating(field.type):
+            df[field.name] = read_json_dtype(df[field.name])
+    return df
+
+# morceaux bruts (lignes jsonl, avec leur schéma pour le lecteur arrow, ou batch arrow) peu
+# coûteux à transmettre à un processus, décodés ensuite par chunk_frame dans le processus qui les traite
+def read_raw_chunks(file_path, chunk_size, raw=False, progress=None):
+    if not is_parquet(file_path):
+        schema = jsonl_schema(file_path, raw=raw) if json_reader() == 'arrow' else None
+        with open(file_path, 'rb') as binary_file:
+            infile = binary_file if schema is not None else io.TextIOWrapper(binary_file, encoding='utf-8')
+            update_position = position_tracker(progress, binary_file)
+            while True:
+                lines = list(itertools.islice(infile, chunk_size))
+                if not lines:
+                    return
+                update_position()
+                yield lines if schema is None else (lines, schema)
+    decoded_columns = json_columns(pq.ParquetFile(file_path))
+    for batch in parquet_batches(file_path, chunk_size, progress=progress):
+        yield batch, decoded_columns
+
+def chunk_frame(raw_chunk, dtype=True):
+    if isinstance(raw_chunk, list):
+        return pd.read_json(io.StringIO(''.join(raw_chunk)), lines=True, dtype=dtype)
+    if isinstance(raw_chunk[1], pa.Schema):
+        return lines_frame(*raw_chunk)
+    batch, decoded_columns = raw_chunk
+    return batch_frame(batch, decoded_columns)
+
+# taille des données d'un intermédiaire une fois en jsonl: taille du fichier, ou estimée en parquet
+# (nombre de lignes x taille moyenne des premières lignes sérialisées)
+def data_size(file_path, sample_rows=1000):
+    if not is_parquet(file_path):
+        return os.path.getsize(file_path)
+    num_rows = count_rows(file_path)
+    for records in iter_record_chunks(file_path, sample_rows):
+        return num_rows * sum(len(json.dumps(record)) + 1 for record in records) // len(records)
+    return 0
+
+def count_rows(file_path):
+    if is_parquet(file_path):
+        return pq.ParquetFile(file_path).metadata.num_rows
+    with open(file_path, 'r') as file:
+        return sum(1 for _ in file)
+
+# concaténation des shards dans l'ordre puis suppression
+def concat_files(shards, file_path):
+    if not is_parquet(file_path):
+        with open(file_path, 'wb') as outfile:
+            for shard in shards:
+                with open(shard, 'rb') as infile:
+                    shutil.copyfileobj(infile, outfile)
+                os.remove(shard)
+        return
+    writer = None
+    for shard in shards:
+        parquet_file = pq.ParquetFile(shard)
+        for i in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(i)
+            if writer is None:
+                writer = pq.ParquetWriter(file_path, parquet_file.schema_arrow, use_dictionary=True,
+                                          compression='snappy')
+            writer.write_table(table)
+        os.remove(shard)
+    if writer is not None:
+        writer.close()
+    else:
+        pq.write_table(pa.table({}), file_path)
@@ -24,19 +24,10 @@ data_path="${data_path}${file_id}_data/"
 best_model_path="${best_model_path}${file_id}_${MAX_SEQ_LEN}_${batch_size}_${embed_dim}_${hidden_dim}_${lr}.ci"
 
 {
-  # CREATION DATASET 
-  echo "exec 00_collect_data.py"
-  python 00_collect_data.py "$download_url" "$file_id" "$data_path" "$chunk_size" 
-  echo "exec 01_keep_usefull_columns.py"
-  python 01_keep_usefull_columns.py "$chunk_size" "$file_id" "$data_path" 
-  echo "exec 02_columns_preprocessing.py"
-  python 02_columns_preprocessing.py "$chunk_size" "$file_id" "$data_path" "$scripts_path"
-  echo "exec 03_split_dataset.py"
-  python 03_split_dataset.py "$chunk_size" "$file_id" "$data_path"
-  echo "exec 04_norm_impuNaN.py"
-  python 04_norm_impuNaN.py "$chunk_size" "$file_id" "$data_path"
-  echo "exec 05_class_balancing.py"
-  python 05_class_balancing.py "$chunk_size" "$file_id" "$data_path"
+  # CREATION DATASET
+  # étapes 00 -> 05 (ou delta) lancées par l'orchestrateur, seules les étapes obsolètes sont rejouées
+  echo "exec orchestrator.py"
+  python orchestrator.py "$@"
 
   # ENTRAINEMENT MODELE IA 
   #echo "exec 05_pytorch_pred_score.py"
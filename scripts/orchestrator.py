@@ -0,0 +1,303 @@
+import os
+import ast
+import sys
+import json
+import time
+import hashlib
+import subprocess
+import requests
+from requests.exceptions import RequestException
+from pipeline_config import get_param
+from intermediate_io import extension, list_shards
+from gz_index import delete_gz_index
+
+
+SCRIPTS_PATH = os.path.dirname(os.path.abspath(__file__))
+REMOTE_SIGNATURES = {}
+
+# graphe des étapes 00 -> 05: chaque étape déclare ses fichiers d'entrée et de sortie et les
+# paramètres de config.json qui influent sur son résultat
+def stage_definitions(download_url, file_id, data_path, chunk_size, scripts_path):
+    prefix = data_path + file_id
+    ext = extension()
+    jsonl_gz = prefix + '_openfoodfacts_00.jsonl.gz'
+    jsonl_01 = prefix + '_openfoodfacts_01.jsonl'
+    jsonl_02 = prefix + '_openfoodfacts_02' + ext
+    jsonl_03 = prefix + '_openfoodfacts_03' + ext
+    store = prefix + '_product_store.sqlite'
+    splits = [prefix + name + ext for name in ['_train', '_test', '_valid']]
+    normalized = [prefix + name + '_01' + ext for name in ['_train', '_test', '_valid']]
+    balanced = [prefix + name + '_02.jsonl' for name in ['_train', '_test', '_valid']]
+    fused = get_param('fused_projection', False)
+    raw = jsonl_gz if fused else jsonl_01
+    stages = []
+    if get_param('ingestion_mode', 'full') == 'delta':
+        delta_file = get_param('delta_file', '')
+        stages.append({'name': 'delta_ingestion_apply',
+                       'script': 'delta_ingestion.py',
+                       'args': [chunk_size, file_id, data_path, 'apply', delta_file],
+                       'params': ['delta_file', 'json_backend', 'intermediate_format', 'vocabulary_mode',
+                                  'prune_useless_lines', 'dedup_products', 'global_rare_countries'],
+                       'external': [delta_file] if os.path.exists(delta_file) else [],
+                       'inputs': [],
+                       'outputs': [jsonl_03]})
+    else:
+        stages.append({'name': '00_collect_data',
+                       'script': '00_collect_data.py',
+                       'args': [download_url, file_id, data_path, chunk_size],
+                       'params': ['download_url', 'fused_projection'],
+                       'remote': [download_url],
+                       'inputs': [],
+                       'outputs': [raw] if fused else [raw, jsonl_gz]})
+        stages.append({'name': '01_keep_usefull_columns',
+                       'script': '01_keep_usefull_columns.py',
+                       'args': [chunk_size, file_id, data_path],
+                       'params': ['fused_projection', 'json_backend', 'intermediate_format', 'keep_shards',
+                                  'prune_useless_lines'],
+                       'inputs': [raw],
+                       'outputs': [jsonl_02]})
+        stages.append({'name': '02_columns_preprocessing',
+                       'script': '02_columns_preprocessing.py',
+                       'args': [chunk_size, file_id, data_path, scripts_path],
+                       'params': ['intermediate_format', 'preprocessing_engine', 'global_rare_countries', 'ecoscore_data_mode',
+                                  'categorical_encoding', 'json_reader', 'vocabulary_mode', 'prune_useless_lines',
+                                  'dedup_products', 'column_spec'],
+                       'inputs': [jsonl_02],
+                       'outputs': [jsonl_03]})
+        stages.append({'name': 'delta_ingestion_seed',
+                       'script': 'delta_ingestion.py',
+                       'args': [chunk_size, file_id, data_path, 'seed'],
+                       'params': ['intermediate_format'],
+                       'inputs': [jsonl_03],
+                       'outputs': [store],
+                       'final': True})
+    stages.append({'name': '03_split_dataset',
+                   'script': '03_split_dataset.py',
+                   'args': [chunk_size, file_id, data_path],
+                   'params': ['intermediate_format', 'shuffle_seed', 'shuffle_memory_mb', 'shuffle_max_buckets'],
+                   'inputs': [jsonl_03],
+                   'outputs': splits + [prefix + '_openfoodfacts_04' + ext]})
+    stages.append({'name': '04_norm_impuNaN',
+                   'script': '04_norm_impuNaN.py',
+                   'args': [chunk_size, file_id, data_path],
+                   'params': ['intermediate_format', 'json_reader'],
+                   'inputs': splits,
+                   'outputs': normalized})
+    stages.append({'name': '05_class_balancing',
+                   'script': '05_class_balancing.py',
+                   'args': [chunk_size, file_id, data_path],
+                   'params': ['intermediate_format'],
+                   'inputs': normalized,
+                   'outputs': balanced,
+                   'final': True})
+    return stages
+
+# fichier ou ses shards (sortie de 01 avec keep_shards)
+def existing_files(file_path):
+    if os.path.exists(file_path):
+        return [file_path]
+    return list_shards(file_path)
+
+def file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# signature d'un fichier: nom, taille, date de modification et empreinte du contenu; l'empreinte
+# d'une signature connue (état précédent) est reprise sans relire le fichier si taille et date
+# n'ont pas changé
+def file_signature(file_path, known=()):
+    stat = os.stat(file_path)
+    signature = [os.path.basename(file_path), stat.st_size, stat.st_mtime]
+    for known_signature in known:
+        if known_signature[:3] == signature and len(known_signature) == 4:
+            return known_signature
+    return signature + [file_hash(file_path)]
+
+# signature d'un fichier distant (requête HEAD): ETag, Last-Modified et taille, lue une fois par
+# passage de l'orchestrateur; serveur injoignable: signature du passage précédent (fichier local gardé)
+def remote_signature(url, known=()):
+    if url not in REMOTE_SIGNATURES:
+        try:
+            response = requests.head(url, allow_redirects=True, timeout=30)
+            response.raise_for_status()
+            headers = response.headers
+            REMOTE_SIGNATURES[url] = [url, headers.get('etag'), headers.get('last-modified'), headers.get('content-length')]
+        except RequestException as e:
+            print(f"warning, remote file unreachable, previous signature kept: {url} ({e})")
+            REMOTE_SIGNATURES[url] = next((signature for signature in known if signature[0] == url), [url, None, None, None])
+    return REMOTE_SIGNATURES[url]
+
+# identifiant d'exécution d'une étape: empreinte de l'étape et contenu de ses sorties (nom et
+# empreinte du contenu, pas la date): une sortie régénérée à l'identique ou copiée ne rend pas
+# obsolètes les étapes en aval
+def stage_run_id(fingerprint, signatures):
+    contents = [[signature[0], signature[-1]] for signature in signatures]
+    return hashlib.sha256(json.dumps([fingerprint, contents]).encode()).hexdigest()
+
+def outputs_present(stage):
+    return all(existing_files(output) for output in stage['outputs'])
+
+# modules locaux importés par un script (import, from ... import, importlib.import_module)
+def local_modules(script):
+    with open(os.path.join(SCRIPTS_PATH, script), 'r', encoding='utf-8') as file:
+        tree = ast.parse(file.read())
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.add(node.module)
+        elif isinstance(node, ast.Call) and getattr(node.func, 'attr', None) == 'import_module' \
+                and node.args and isinstance(node.args[0], ast.Constant):
+            names.add(node.args[0].value)
+    return sorted(name + '.py' for name in names if os.path.exists(os.path.join(SCRIPTS_PATH, name + '.py')))
+
+def code_hash(script, seen=None):
+    seen = set() if seen is None else seen
+    if script in seen:
+        return ''
+    seen.add(script)
+    digest = hashlib.sha256()
+    with open(os.path.join(SCRIPTS_PATH, script), 'rb') as file:
+        digest.update(file.read())
+    for module in local_modules(script):
+        digest.update(code_hash(module, seen).encode())
+    return digest.hexdigest()
+
+# empreinte d'une étape: code (script + modules locaux), paramètres, arguments, identifiant
+# d'exécution des étapes productrices de ses entrées et signature des fichiers externes et distants
+def stage_fingerprint(stage, producers, state):
+    digest = hashlib.sha256()
+    digest.update(code_hash(stage['script']).encode())
+    digest.update(json.dumps([stage['args'], {key: get_param(key) for key in stage['params']}]).encode())
+    for input_file in stage['inputs']:
+        producer = producers[input_file]
+        digest.update(state.get(producer['name'], {}).get('run_id', 'never run').encode())
+    for external_file in stage.get('external', []):
+        signature = file_signature(external_file, state.get(stage['name'], {}).get('external', []))
+        digest.update(json.dumps([signature[0], signature[-1]]).encode())
+    for url in stage.get('remote', []):
+        digest.update(json.dumps(remote_signature(url, state.get(stage['name'], {}).get('remote', []))).encode())
+    return digest.hexdigest()
+
+def load_state(state_path):
+    if not os.path.exists(state_path):
+        return {}
+    with open(state_path, 'r') as file:
+        return json.load(file)
+
+def save_state(state_path, state):
+    temp_path = state_path + '.temp'
+    with open(temp_path, 'w') as file:
+        json.dump(state, file, indent=4)
+    os.replace(temp_path, state_path)
+
+def delete_outputs(stage):
+    for output in stage['outputs']:
+        for file_path in existing_files(output):
+            os.remove(file_path)
+            delete_gz_index(file_path)
+            print(f"stale output deleted: {file_path}")
+
+def run_stage(stage, producers, state, state_path):
+    # les entrées supprimées par le budget disque sont régénérées d'abord
+    for input_file in stage['inputs']:
+        if not existing_files(input_file):
+            print(f"missing input {input_file}, rerun {producers[input_file]['name']}")
+            run_stage(producers[input_file], producers, state, state_path)
+    fingerprint = stage_fingerprint(stage, producers, state)
+    delete_outputs(stage)
+    print(f"exec {stage['name']}")
+    start = time.time()
+    env = dict(os.environ, PIPELINE_KEEP_INTERMEDIATES='1')
+    result = subprocess.run([sys.executable, stage['script']] + [str(arg) for arg in stage['args']],
+                            cwd=SCRIPTS_PATH, env=env)
+    if result.returncode != 0:
+        print(f"ERROR, {stage['name']} failed with exit code {result.returncode}")
+        sys.exit(result.returncode)
+    signatures = [file_signature(file_path) for output in stage['outputs'] for file_path in existing_files(output)]
+    state[stage['name']] = {'fingerprint': fingerprint,
+                            'run_id': stage_run_id(fingerprint, signatures),
+                            'outputs': signatures,
+                            'external': [file_signature(file_path) for file_path in stage.get('external', [])],
+                            'remote': [remote_signature(url) for url in stage.get('remote', [])],
+                            'finished': time.strftime("%Y-%m-%d %H:%M:%S"),
+                            'duration': round(time.time() - start, 1)}
+    save_state(state_path, state)
+
+# supprime les intermédiaires les plus anciens tant que le budget disque est dépassé;
+# seuls les fichiers dont tous les consommateurs sont à jour sont candidats
+def enforce_disk_budget(stages, producers, state, disk_budget):
+    if disk_budget is None:
+        return
+    fresh = {stage['name'] for stage in stages
+             if state.get(stage['name'], {}).get('fingerprint') == stage_fingerprint(stage, producers, state)}
+    candidates = []
+    for stage in stages:
+        if stage.get('final'):
+            continue
+        for output in stage['outputs']:
+            consumers = [consumer['name'] for consumer in stages if output in consumer['inputs']]
+            if all(name in fresh for name in consumers):
+                candidates.extend(existing_files(output))
+    total = sum(os.path.getsize(file_path) for file_path in candidates)
+    for file_path in sorted(candidates, key=os.path.getmtime):
+        if total <= disk_budget:
+            break
+        total -= os.path.getsize(file_path)
+        os.remove(file_path)
+        print(f"disk budget exceeded, intermediate deleted: {file_path}")
+        delete_gz_index(file_path)
+
+def run_pipeline(stages, state_path, forced, disk_budget):
+    producers = {output: stage for stage in stages for output in stage['outputs']}
+    state = load_state(state_path)
+    REMOTE_SIGNATURES.clear()
+    forced = set(forced)
+    # nouveau passage tant qu'une étape a tourné: une entrée régénérée plus haut dans le graphe
+    # rend obsolètes des étapes déjà passées
+    while True:
+        executed = False
+        for stage in stages:
+            fingerprint = stage_fingerprint(stage, producers, state)
+            up_to_date = state.get(stage['name'], {}).get('fingerprint') == fingerprint
+            # une étape intermédiaire à jour dont les sorties ont été supprimées n'est relancée
+            # que si une étape en aval en a besoin
+            if stage['name'] not in forced and 'all' not in forced and up_to_date \
+                    and (outputs_present(stage) or not stage.get('final')):
+                print(f"up to date, skip {stage['name']}")
+                continue
+            forced.discard(stage['name'])
+            run_stage(stage, producers, state, state_path)
+            enforce_disk_budget(stages, producers, state, disk_budget)
+            executed = True
+        forced.discard('all')
+        if not executed:
+            break
+
+
+###############################################################################
+# MAIN ########################################################################
+###############################################################################
+def main(forced):
+    download_url = get_param('download_url')
+    file_id = get_param('file_id')
+    scripts_path = get_param('scripts_path')
+    chunk_size = get_param('chunk_size')
+    data_path = get_param('data_path') + file_id + '_data/'
+    disk_budget_gb = get_param('disk_budget_gb')
+    disk_budget = None if disk_budget_gb is None else float(disk_budget_gb) * 1024 ** 3
+    if not os.path.exists(data_path):
+        os.makedirs(data_path)
+        print(f"folder: {data_path} successfully created")
+    stages = stage_definitions(download_url, file_id, data_path, chunk_size, scripts_path)
+    state_path = data_path + file_id + '_pipeline_state.json'
+    run_pipeline(stages, state_path, forced, disk_budget)
+
+if __name__ == "__main__":
+    # étapes à relancer même si elles sont à jour (nom de l'étape ou "all")
+    forced = sys.argv[1:]
+    main(forced)
@@ -0,0 +1,19 @@
+import json
+import os
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+_config = None
+
+# lecture des paramètres optionnels dans config.json (valeur par défaut si absent)
+def get_param(key, default=None):
+    global _config
+    if _config is None:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as file:
+            _config = json.load(file)
+    return _config.get(key, default)
+
+# lancé par orchestrator.py: les fichiers intermédiaires sont conservés, l'orchestrateur
+# les supprime lui-même selon le budget disque
+def keep_intermediates():
+    return os.environ.get('PIPELINE_KEEP_INTERMEDIATES') == '1'
@@ -0,0 +1,48 @@
+import os
+import time
+
+
+# progression d'après la position dans les fichiers lus (octets consommés / taille totale), sans
+# passage préalable pour compter les lignes; débit lissé (moyenne exponentielle sur des fenêtres
+# d'au moins interval secondes, les morceaux écrits par rafales en parallèle) et temps restant
+class Progress:
+    def __init__(self, file_paths, smoothing=0.3, interval=1.0):
+        self.total = sum(os.path.getsize(file_path) for file_path in file_paths if os.path.exists(file_path))
+        self.done = 0
+        self.smoothing = smoothing
+        self.interval = interval
+        self.rate = None
+        self.start_time = self.last_time = time.perf_counter()
+        self.last_done = 0
+
+    # octets consommés par le lecteur (appelé par intermediate_io à chaque morceau)
+    def advance(self, amount):
+        self.done += amount
+
+    # done: position à afficher, par défaut celle du lecteur (en parallèle, celle du morceau écrit)
+    def report(self, done=None):
+        done = self.done if done is None else done
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        if elapsed >= self.interval and done > self.last_done:
+            rate = (done - self.last_done) / elapsed
+            self.rate = rate if self.rate is None else self.smoothing * rate + (1 - self.smoothing) * self.rate
+            self.last_time, self.last_done = now, done
+        rate = self.rate
+        if rate is None and now > self.start_time:
+            # première fenêtre pas encore écoulée: débit moyen depuis le début
+            rate = done / (now - self.start_time)
+        percent = min(100.0, done * 100 / self.total) if self.total else 100.0
+        details = ""
+        if rate:
+            details = f" ({rate / (1024 * 1024):.1f} MB/s, eta {format_duration(max(0, self.total - done) / rate)})"
+        print(f"-----------------------------------------------------------> progress: {percent:.1f} %{details}")
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
@@ -0,0 +1,68 @@
+import collections
+import numpy as np
+
+
+# filtres des lignes inutiles (delete_useless_lines de 02_columns_preprocessing.py) évalués sur les
+# valeurs brutes (colonnes du jsonl 02), dès la projection de 01 puis au décodage des morceaux de 02:
+# une ligne écartée ne passe par aucune transformation (pays, regex, vocabulaires)
+VALUES_TO_REPLACE = ["unknown",
+                     "Unknown",
+                     "None",
+                     "none",
+                     "",
+                     "not-applicable",
+                     "nan",
+                     "NaN",
+                     "0",
+                     "e m p t y",
+                     np.nan]
+PLACEHOLDERS = {value for value in VALUES_TO_REPLACE if isinstance(value, str)}
+FILTER_COLUMNS = ['product_name', 'ingredients_tags', 'ecoscore_data', 'food_groups_tags']
+PRUNE_REASONS = ['name', 'ingredients_and_ecoscore_data', 'food_group_and_ecoscore_data']
+
+# nom manquant ou valeur de remplissage ('Unknown', 'none', '0', ...)
+def missing_text(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return True
+    return str(value).strip().lower() in PLACEHOLDERS
+
+# aucun tag utile (avec le préfixe demandé, hors valeurs de remplissage)
+def missing_tags(tags, prefix=''):
+    if not isinstance(tags, list):
+        return True
+    for tag in tags:
+        if isinstance(tag, str) and tag.startswith(prefix) and tag[len(prefix):].strip() not in PLACEHOLDERS:
+            return False
+    return True
+
+def missing_ecoscore_data(value):
+    return not (isinstance(value, dict) and value)
+
+# première règle de delete_useless_lines vérifiée par la ligne, None si elle est gardée
+def prune_reason(name, ingredients, ecoscore_data, food_groups):
+    if missing_text(name):
+        return 'name'
+    if missing_ecoscore_data(ecoscore_data):
+        if missing_tags(ingredients, 'en:'):
+            return 'ingredients_and_ecoscore_data'
+        if missing_tags(food_groups):
+            return 'food_group_and_ecoscore_data'
+    return None
+
+def record_prune_reason(record):
+    return prune_reason(*(record.get(column) for column in FILTER_COLUMNS))
+
+# morceau brut (colonnes du jsonl 02) sans les lignes inutiles, raisons comptées dans counts
+def prune_frame(df, counts):
+    columns = [df[column].tolist() if column in df.columns else [None] * len(df) for column in FILTER_COLUMNS]
+    reasons = [prune_reason(*values) for values in zip(*columns)]
+    pruned = [reason for reason in reasons if reason is not None]
+    if not pruned:
+        return df
+    counts.update(pruned)
+    return df[[reason is None for reason in reasons]]
+
+def report(point, counts, rows):
+    pruned = sum(counts.values())
+    details = ', '.join(f"{reason} {counts.get(reason, 0)}" for reason in PRUNE_REASONS)
+    print(f"rows pruned at {point}: {pruned} / {rows} ({details})")
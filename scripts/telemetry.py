@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import time
+import resource
+import collections
+from pipeline_config import get_param
+
+
+# mesures de performance d'une étape, ajoutées en une ligne json à <logs_path>/pipeline_metrics.jsonl
+METRICS_FILE = 'pipeline_metrics.jsonl'
+_current = None
+
+def files_size(file_paths):
+    return sum(os.path.getsize(file_path) for file_path in file_paths if os.path.exists(file_path))
+
+# ru_maxrss en Ko sous linux, en octets sous macos
+def peak_rss_mb(who):
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return round(sorted_values[index] * 1000, 2)
+
+class StageMetrics:
+    def __init__(self, stage, file_id, input_files=()):
+        self.stage = stage
+        self.file_id = file_id
+        self.started = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.start_wall = time.perf_counter()
+        self.start_cpu = os.times()
+        # mesuré au départ: les entrées sont supprimées en fin d'étape
+        self.bytes_read = files_size(input_files)
+        self.rows_in = 0
+        self.rows_out = 0
+        # lignes inutiles écartées, par règle (row_filters.py)
+        self.rows_pruned = collections.Counter()
+        self.chunk_latencies = []
+
+    def record_chunk(self, seconds, rows=0):
+        self.chunk_latencies.append(seconds)
+        self.rows_in += rows
+
+    def record(self, output_files=()):
+        wall = time.perf_counter() - self.start_wall
+        end_cpu = os.times()
+        # processus fils compris (pool de 01, workers)
+        cpu = (end_cpu.user - self.start_cpu.user) + (end_cpu.system - self.start_cpu.system) \
+            + (end_cpu.children_user - self.start_cpu.children_user) \
+            + (end_cpu.children_system - self.start_cpu.children_system)
+        latencies = sorted(self.chunk_latencies)
+        return {'file_id': self.file_id,
+                'stage': self.stage,
+                'started': self.started,
+                'wall_s': round(wall, 3),
+                'cpu_s': round(cpu, 3),
+                'peak_rss_mb': peak_rss_mb(resource.RUSAGE_SELF),
+                'peak_rss_children_mb': peak_rss_mb(resource.RUSAGE_CHILDREN),
+                'rows_in': self.rows_in,
+                'rows_out': self.rows_out,
+                'rows_pruned': dict(self.rows_pruned),
+                'rows_per_s': round(self.rows_in / wall, 1) if wall > 0 else None,
+                'bytes_read': self.bytes_read,
+                'bytes_written': files_size(output_files),
+                'chunks': len(latencies),
+                'chunk_latency_ms': {'p50': percentile(latencies, 0.5),
+                                     'p90': percentile(latencies, 0.9),
+                                     'p99': percentile(latencies, 0.99),
+                                     'max': percentile(latencies, 1)}}
+
+def start_stage(stage, file_id, input_files=()):
+    global _current
+    _current = StageMetrics(stage, file_id, input_files)
+    return _current
+
+# itère sur les morceaux en mesurant le temps de traitement de chacun (entre deux next())
+def track_chunks(chunks, count=len):
+    for chunk in chunks:
+        start = time.perf_counter()
+        yield chunk
+        if _current is not None:
+            _current.record_chunk(time.perf_counter() - start, count(chunk))
+
+def record_chunk(seconds, rows=0):
+    if _current is not None:
+        _current.record_chunk(seconds, rows)
+
+def add_rows_out(rows):
+    if _current is not None:
+        _current.rows_out += rows
+
+def add_rows_pruned(counts):
+    if _current is not None:
+        _current.rows_pruned.update(counts)
+
+def end_stage(output_files=()):
+    global _current
+    if _current is None:
+        return None
+    metrics = _current.record(output_files)
+    _current = None
+    logs_path = get_param('logs_path', '')
+    if logs_path and not os.path.exists(logs_path):
+        os.makedirs(logs_path)
+    with open(os.path.join(logs_path, METRICS_FILE), 'a') as file:
+        file.write(json.dumps(metrics) + '\n')
+    print(f"metrics {metrics['stage']}: {metrics['wall_s']} s, {metrics['rows_per_s']} rows/s, "
+          f"peak rss {metrics['peak_rss_mb']} MB")
+    return metrics
+
+# dernière mesure de chaque étape pour un file_id
+def load_metrics(file_id):
+    metrics_path = os.path.join(get_param('logs_path', ''), METRICS_FILE)
+    latest = {}
+    with open(metrics_path, 'r') as file:
+        for line in file:
+            metrics = json.loads(line)
+            if metrics['file_id'] == file_id:
+                latest[metrics['stage']] = metrics
+    return latest
+
+# comparaison de deux exécutions (file_id de référence puis file_id comparé)
+def compare(reference_id, file_id):
+    reference = load_metrics(reference_id)
+    current = load_metrics(file_id)
+    print(f"{'stage':<28}{'wall_s':>26}{'rows/s':>28}{'peak rss MB':>26}")
+    for stage in current:
+        if stage not in reference:
+            continue
+        cells = []
+        for key in ['wall_s', 'rows_per_s', 'peak_rss_mb']:
+            before, after = reference[stage][key], current[stage][key]
+            change = f" ({(after - before) * 100 / before:+.0f}%)" if before and after is not None else ""
+            cells.append(f"{before} -> {after}{change}")
+        print(f"{stage:<28}{cells[0]:>26}{cells[1]:>28}{cells[2]:>26}")
+
+
+if __name__ == "__main__":
+    reference_id = sys.argv[1]
+    file_id = sys.argv[2]
+    compare(reference_id, file_id)
@@ -3,7 +3,13 @@ import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import DataLoader, Dataset
 import json
+import os
+import sys
 from transformers import DistilBertModel, DistilBertTokenizer
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import telemetry
+from pipeline_config import get_param
+from encoders import decode_grade
 
 class EcoScoreDataset(Dataset):
     def __init__(self, data):
@@ -82,6 +88,7 @@ def test_model(model, test_loader, device):
 def save_predictions(data, predictions, output_file):
     for i, pred in enumerate(predictions):
         data[i]['predicted_ecoscore_tags'] = pred
+        data[i]['predicted_ecoscore_grade'] = decode_grade(pred)
     with open(output_file, 'w') as f:
         for item in data:
             f.write(json.dumps(item) + "\n")
@@ -100,7 +107,7 @@ def train(model, train_loader, val_loader, epochs=20, lr=1e-5, save_path="best_m
     for epoch in range(epochs):
         model.train()
         train_loss = 0.0
-        for batch in train_loader:
+        for batch in telemetry.track_chunks(train_loader, count=lambda batch: len(batch[2])):
             optimizer.zero_grad()
             numeric_data, text_data, labels = batch
             
@@ -149,6 +156,7 @@ def load_jsonl(file_path):
     return data
 
 if __name__ == "__main__":
+    telemetry.start_stage('test_model_1.1', get_param('file_id'))
     train_data = load_jsonl("../../data/05_data/05_train_02.jsonl")
     test_data = load_jsonl("../../data/05_data/05_test_02.jsonl")
     valid_data = load_jsonl("../../data/05_data/05_valid_02.jsonl")
@@ -174,3 +182,5 @@ if __name__ == "__main__":
     
     valid_predictions = test_model(model, valid_loader, device)
     save_predictions(valid_data, valid_predictions, "valid_pred_01.jsonl")
+    telemetry.add_rows_out(len(test_predictions) + len(valid_predictions))
+    telemetry.end_stage(["best_model_01.ci", "test_pred_01.jsonl", "valid_pred_01.jsonl"])
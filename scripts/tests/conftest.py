@@ -0,0 +1,91 @@
+import os
+import sys
+import threading
+import importlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+
+SCRIPTS_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, SCRIPTS_PATH)
+
+import pipeline_config
+
+
+# modules des étapes (nom commençant par un chiffre)
+def load_stage(name):
+    return importlib.import_module(name)
+
+# paramètres de config.json remplacés pour le test (valeurs par défaut du code pour les autres clés),
+# mesures des étapes écrites dans le dossier temporaire du test
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    params = {'logs_path': str(tmp_path / 'logs')}
+    monkeypatch.setattr(pipeline_config, '_config', params)
+    return params
+
+# serveur http local avec requêtes range (HEAD, GET bytes=start-end); fail_first: nombre de
+# réponses coupées avant la fin (connexion fermée au milieu du segment) pour tester les reprises
+class RangeServer:
+    def __init__(self, payload, ranges=True, fail_first=0):
+        self.payload = payload
+        self.ranges = ranges
+        self.fail_first = fail_first
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/openfoodfacts-products.jsonl.gz"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def handler(self):
+        server = self
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(server.payload)))
+                if server.ranges:
+                    self.send_header('Accept-Ranges', 'bytes')
+                self.end_headers()
+
+            def do_GET(self):
+                start, end = 0, len(server.payload) - 1
+                requested = self.headers.get('Range')
+                if server.ranges and requested:
+                    first, last = requested.split('=')[1].split('-')
+                    start = int(first)
+                    end = int(last) if last else end
+                body = server.payload[start:end + 1]
+                with server.lock:
+                    server.requests.append((start, end))
+                    truncate = server.fail_first > 0
+                    server.fail_first -= 1
+                self.send_response(206 if server.ranges and requested else 200)
+                self.send_header('Content-Length', str(len(body)))
+                if truncate:
+                    self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.write(body[:len(body) // 2] if truncate else body)
+                if truncate:
+                    self.close_connection = True
+        return Handler
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def range_server():
+    servers = []
+    def start(payload, ranges=True, fail_first=0):
+        server = RangeServer(payload, ranges, fail_first)
+        servers.append(server)
+        return server
+    yield start
+    for server in servers:
+        server.close()
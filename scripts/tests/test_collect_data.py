@@ -0,0 +1,69 @@
+import os
+import json
+from conftest import load_stage
+
+collect_data = load_stage('00_collect_data')
+
+PAYLOAD = bytes(range(256)) * 40 # 10240 octets
+SEGMENT_SIZE = 1000
+
+
+def segments(total_size, segment_size):
+    return [(start, min(start + segment_size, total_size) - 1) for start in range(0, total_size, segment_size)]
+
+def test_segmented_download(tmp_path, range_server):
+    server = range_server(PAYLOAD)
+    jsonl_gz = str(tmp_path / 'x_openfoodfacts_00.jsonl.gz')
+    collect_data.download_file_segmented(server.url, jsonl_gz, 256, 4, SEGMENT_SIZE)
+    with open(jsonl_gz, 'rb') as file:
+        assert file.read() == PAYLOAD
+    assert sorted(server.requests) == segments(len(PAYLOAD), SEGMENT_SIZE)
+    assert not os.path.exists(jsonl_gz + '.manifest.json')
+
+def test_resume_downloads_only_missing_segments(tmp_path, range_server):
+    server = range_server(PAYLOAD)
+    jsonl_gz = str(tmp_path / 'x_openfoodfacts_00.jsonl.gz')
+    all_segments = segments(len(PAYLOAD), SEGMENT_SIZE)
+    done = [0, 1, 2, 5, 9]
+    # téléchargement interrompu: segments terminés écrits, les autres à zéro
+    data = bytearray(len(PAYLOAD))
+    for i in done:
+        start, end = all_segments[i]
+        data[start:end + 1] = PAYLOAD[start:end + 1]
+    with open(jsonl_gz, 'wb') as file:
+        file.write(data)
+    with open(jsonl_gz + '.manifest.json', 'w') as file:
+        json.dump({'url': server.url, 'size': len(PAYLOAD), 'segment_size': SEGMENT_SIZE, 'done': done}, file)
+    collect_data.download_file_segmented(server.url, jsonl_gz, 256, 3, SEGMENT_SIZE)
+    with open(jsonl_gz, 'rb') as file:
+        assert file.read() == PAYLOAD
+    assert sorted(server.requests) == [segment for i, segment in enumerate(all_segments) if i not in done]
+    assert not os.path.exists(jsonl_gz + '.manifest.json')
+
+def test_manifest_of_other_file_restarts_download(tmp_path, range_server):
+    server = range_server(PAYLOAD)
+    jsonl_gz = str(tmp_path / 'x_openfoodfacts_00.jsonl.gz')
+    with open(jsonl_gz, 'wb') as file:
+        file.write(b'\0' * len(PAYLOAD))
+    with open(jsonl_gz + '.manifest.json', 'w') as file:
+        json.dump({'url': server.url, 'size': len(PAYLOAD) + 1, 'segment_size': SEGMENT_SIZE, 'done': [0, 1]}, file)
+    collect_data.download_file_segmented(server.url, jsonl_gz, 256, 2, SEGMENT_SIZE)
+    with open(jsonl_gz, 'rb') as file:
+        assert file.read() == PAYLOAD
+    assert len(server.requests) == len(segments(len(PAYLOAD), SEGMENT_SIZE))
+
+def test_interrupted_segments_are_retried(tmp_path, range_server):
+    server = range_server(PAYLOAD, fail_first=3)
+    jsonl_gz = str(tmp_path / 'x_openfoodfacts_00.jsonl.gz')
+    collect_data.download_file_segmented(server.url, jsonl_gz, 256, 2, SEGMENT_SIZE)
+    with open(jsonl_gz, 'rb') as file:
+        assert file.read() == PAYLOAD
+    assert len(server.requests) == len(segments(len(PAYLOAD), SEGMENT_SIZE)) + 3
+
+def test_single_stream_without_range_support(tmp_path, range_server):
+    server = range_server(PAYLOAD, ranges=False)
+    jsonl_gz = str(tmp_path / 'x_openfoodfacts_00.jsonl.gz')
+    collect_data.download_file_segmented(server.url, jsonl_gz, 256, 4, SEGMENT_SIZE)
+    with open(jsonl_gz, 'rb') as file:
+        assert file.read() == PAYLOAD
+    assert server.requests == [(0, len(PAYLOAD) - 1)]
@@ -0,0 +1,285 @@
+import os
+import re
+import json
+import time
+import collections
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import load_stage, FIXTURES_PATH
+from intermediate_io import read_chunks, open_writer, iter_records
+
+keep_usefull_columns = load_stage('01_keep_usefull_columns')
+columns_preprocessing = load_stage('02_columns_preprocessing')
+
+
+def write_countries(file_path, countries):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for value in countries:
+            file.write(json.dumps({'countries': value}) + '\n')
+
+# delta: seuil des pays rares du traitement complet (enregistré), pas celui du seul fichier delta
+def test_delta_rare_countries_use_full_run_counts(config, tmp_path):
+    full_02, delta_02 = str(tmp_path / 'x_openfoodfacts_02.jsonl'), str(tmp_path / 'x_delta_02.jsonl')
+    counts_file = str(tmp_path / 'x_country_counts.json')
+    write_countries(full_02, ['en:france'] * 2000 + ['Spain'])
+    write_countries(delta_02, ['Spain'] * 3 + ['Tuvalu'])
+    vtr = columns_preprocessing.VALUES_TO_REPLACE
+    full = columns_preprocessing.global_rare_countries(full_02, 100, vtr, False, counts_file, True)
+    assert full == {'spain'}
+    assert columns_preprocessing.load_country_counts(counts_file) == {'france': 2000, 'spain': 1}
+    delta = columns_preprocessing.global_rare_countries(delta_02, 100, vtr, False, counts_file, False)
+    assert delta == {'spain', 'tuvalu'}
+    # occurrences du traitement complet non modifiées par le delta
+    assert columns_preprocessing.load_country_counts(counts_file) == {'france': 2000, 'spain': 1}
+    # sans occurrences enregistrées: seuil du fichier delta seul
+    assert columns_preprocessing.global_rare_countries(delta_02, 100, vtr, False, None, False) == set()
+
+# dédoublonnage actif: les doublons écartés au traitement ne comptent pas dans le seuil des pays rares
+def test_country_counts_skip_duplicates(config, tmp_path):
+    jsonl_02 = str(tmp_path / 'x_openfoodfacts_02.jsonl')
+    records = [{'code': str(i), 'product_name': f"produit {i}", 'countries': 'en:france'} for i in range(1500)]
+    spain = {'code': 's', 'product_name': 'turron', 'countries': 'Spain'}
+    records += [spain, spain, dict(spain, code='t')]
+    with open(jsonl_02, 'w', encoding='utf-8') as file:
+        file.writelines(json.dumps(record) + '\n' for record in records)
+    vtr = columns_preprocessing.VALUES_TO_REPLACE
+    assert columns_preprocessing.count_countries(jsonl_02, 100, vtr) == {'france': 1500, 'spain': 3}
+    assert columns_preprocessing.global_rare_countries(jsonl_02, 100, vtr, False, None, True) == set()
+    seen = columns_preprocessing.dedup.SeenKeys(str(tmp_path / 'counted.sqlite'), 1000)
+    assert columns_preprocessing.count_countries(jsonl_02, 100, vtr, seen=seen) == {'france': 1500, 'spain': 1}
+    seen.close()
+    seen = columns_preprocessing.dedup.SeenKeys(str(tmp_path / 'counted.sqlite'), 1000)
+    assert columns_preprocessing.global_rare_countries(jsonl_02, 100, vtr, False, None, True, seen) == {'spain'}
+    seen.close()
+    assert os.listdir(tmp_path) == ['x_openfoodfacts_02.jsonl']
+
+def raw_chunk(records):
+    return pd.DataFrame(records, columns=list(records[0]))
+
+@pytest.mark.parametrize('entry', [
+    {'column': 'food_group', 'source': 'food_groups_tags', 'normalization': 'tags', 'prefix': 'fr:'},
+    {'column': 'packaging', 'source': 'packaging_tags', 'normalization': 'tags', 'prefix': 1},
+    {'column': 'stores', 'normalization': 'text', 'null_tokens': 'yes'},
+    {'column': 'stores', 'normalization': 'text', 'null_tokens': 0},
+    {'column': 'stores', 'normalization': 'upper'},
+    {'column': 'countries', 'encoding': 'iso'}])
+def test_invalid_column_spec(entry):
+    with pytest.raises(ValueError):
+        columns_preprocessing.compile_plan([entry])
+
+# spécification invalide signalée avant le traitement (pas dans un processus du pool)
+def test_invalid_column_spec_fails_before_processing(config, tmp_path):
+    config.update({'preprocessing_engine': 'planned', 'nb_workers': 2,
+                   'column_spec': [{'column': 'stores', 'normalization': 'tags', 'prefix': 'fr:'}]})
+    columns_preprocessing.PLANS.clear()
+    jsonl_02 = str(tmp_path / 'x_openfoodfacts_02.jsonl')
+    write_countries(jsonl_02, ['France'])
+    try:
+        with pytest.raises(ValueError):
+            columns_preprocessing.browse_file(jsonl_02, str(tmp_path / 'x_openfoodfacts_03.jsonl'), 10,
+                                              columns_preprocessing.VALUES_TO_REPLACE)
+    finally:
+        columns_preprocessing.PLANS.clear()
+
+def test_null_tokens(config):
+    chunk = raw_chunk([{'stores': 'unknown', 'ecoscore_data': 'Unknown'},
+                       {'stores': None, 'ecoscore_data': 'Carrefour, Auchan'}])
+    vtr = columns_preprocessing.VALUES_TO_REPLACE
+    spec = [{'column': 'stores', 'normalization': 'text', 'null_tokens': False},
+            {'column': 'ecoscore_data', 'normalization': 'text'}]
+    renames, operators = columns_preprocessing.compile_plan(spec)
+    df = chunk.copy()
+    for operator in operators:
+        operator(df, vtr, None)
+    assert df['stores'].tolist() == ['unknown', 'empty']
+    assert df['ecoscore_data'].tolist() == ['empty', 'carrefour  auchan']
+
+def test_tag_prefixes(config):
+    chunk = raw_chunk([{'packaging_tags': ['en:plastic-film', 'fr:carton'], 'compared_to_category': 'en:biscuits, fr:gateaux'}])
+    vtr = columns_preprocessing.VALUES_TO_REPLACE
+    results = {}
+    for prefix in columns_preprocessing.PREFIXES:
+        spec = [{'column': 'packaging_tags', 'normalization': 'tags', 'prefix': prefix},
+                {'column': 'compared_to_category', 'normalization': 'tag_text', 'prefix': prefix}]
+        renames, operators = columns_preprocessing.compile_plan(spec)
+        df = chunk.copy()
+        for operator in operators:
+            operator(df, vtr, None)
+        results[prefix] = df.iloc[0].tolist()
+    assert results == {None: ['en plastic film fr carton', 'en biscuits fr gateaux'],
+                       'en:': [' plastic film fr carton', ' biscuits fr gateaux'],
+                       'language': [' plastic film  carton', ' biscuits  gateaux']}
+
+# spécification par défaut: sortie identique au moteur vectorisé
+def test_default_spec_matches_vectorized_engine(config):
+    chunk = next(read_chunks(os.path.join(FIXTURES_PATH, 'delta_base.jsonl'), 100, dtype={'code': str}, raw=True))
+    chunk = chunk[keep_usefull_columns.COLUMNS_TO_KEEP]
+    vtr = columns_preprocessing.VALUES_TO_REPLACE
+    for categorical_encoding in [False, True]:
+        renames, operators = columns_preprocessing.compile_plan(columns_preprocessing.DEFAULT_COLUMN_SPEC, categorical_encoding)
+        planned = chunk.copy().rename(columns=renames)
+        for operator in operators:
+            operator(planned, vtr, None)
+        vectorized = columns_preprocessing.process_chunk_vectorized(chunk, vtr, None, 'text', categorical_encoding)
+        assert planned.to_json(orient='records', lines=True) == vectorized.to_json(orient='records', lines=True)
+
+ENGINE_PRODUCTS = os.path.join(FIXTURES_PATH, 'engine_products.jsonl')
+
+# moteur vectorisé: même DataFrame que process_chunk, et même jsonl 03, sur des lignes aux valeurs
+# manquantes, de remplissage ('unknown', ''), listes, dict et types inattendus
+@pytest.mark.parametrize('chunk_size', [30, 7])
+@pytest.mark.parametrize('ecoscore_data_mode', ['text', 'structured'])
+@pytest.mark.parametrize('categorical_encoding', [False, True])
+def test_vectorized_engine_matches_legacy(config, chunk_size, ecoscore_data_mode, categorical_encoding):
+    vtr = columns_preprocessing.VALUES_TO_REPLACE
+    for rare_countries in [None, {'belgium'}]:
+        for chunk in read_chunks(ENGINE_PRODUCTS, chunk_size, dtype={'code': str}, raw=True):
+            legacy = columns_preprocessing.process_chunk(chunk, vtr, rare_countries, ecoscore_data_mode, categorical_encoding)
+            vectorized = columns_preprocessing.process_chunk_vectorized(chunk, vtr, rare_countries, ecoscore_data_mode,
+                                                                        categorical_encoding)
+            pd.testing.assert_frame_equal(vectorized, legacy)
+            assert vectorized.to_json(orient='records', lines=True) == legacy.to_json(orient='records', lines=True)
+
+process_raw_chunk = columns_preprocessing.process_raw_chunk
+
+# premier morceau traité le plus lentement: les résultats arrivent dans le désordre
+def delayed_process_raw_chunk(task):
+    if '3017620422003' in columns_preprocessing.chunk_frame(task[0], dtype={'code': str})['code'].tolist():
+        time.sleep(0.5)
+    return process_raw_chunk(task)
+
+# traitement parallèle: morceaux écrits dans l'ordre de lecture, même jsonl 03 qu'en série
+@pytest.mark.parametrize('intermediate_format', ['jsonl', 'parquet'])
+def test_parallel_engine_writes_in_input_order(config, tmp_path, monkeypatch, intermediate_format):
+    config.update({'intermediate_format': intermediate_format, 'preprocessing_engine': 'vectorized'})
+    monkeypatch.setattr(columns_preprocessing, 'process_raw_chunk', delayed_process_raw_chunk)
+    ext = '.' + intermediate_format
+    outputs = []
+    for nb_workers in [1, 3]:
+        config['nb_workers'] = nb_workers
+        jsonl_02 = str(tmp_path / f"workers{nb_workers}_02{ext}")
+        with open_writer(jsonl_02, raw=True) as writer:
+            writer.write_records(list(iter_records(ENGINE_PRODUCTS)))
+        jsonl_03 = str(tmp_path / f"workers{nb_workers}_03{ext}")
+        columns_preprocessing.browse_file(jsonl_02, jsonl_03, 4, columns_preprocessing.VALUES_TO_REPLACE)
+        outputs.append(list(iter_records(jsonl_03)))
+    assert [record['code'] for record in outputs[0]] == [record['code'] for record in iter_records(ENGINE_PRODUCTS)]
+    assert outputs[1] == outputs[0]
+
+# countries_processing d'origine (avant le normaliseur mémoïsé), référence du comportement sans codes iso
+def previous_countries_processing(df, values_to_replace):
+    def clean_abrev(texte):
+        if isinstance(texte, str):
+            return re.sub(r'\b\w{2}:\b', '', texte).strip()
+        return texte
+    df['countries'] = df['countries'].replace(values_to_replace, np.nan)
+    df['countries'] = df['countries'].apply(lambda x: x.split(', ') if isinstance(x, str) else ([] if pd.isna(x) else x))
+    df['countries'] = df['countries'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
+    df['countries'] = df['countries'].str.lower()
+    df['countries'] = df['countries'].apply(clean_abrev)
+    df['countries'] = df['countries'].replace(columns_preprocessing.COUNTRY_MAPPING)
+    country_counts = df['countries'].value_counts(normalize=True)
+    rare_countries = country_counts[country_counts < 0.001].index
+    def replace_rare_countries(countries):
+        if isinstance(countries, str):
+            countries_list = [c.strip() for c in countries.split(',')]
+            updated_countries = [c if c not in rare_countries else np.nan for c in countries_list]
+            return ', '.join(filter(lambda x: x is not np.nan, updated_countries)) if updated_countries else np.nan
+        return np.nan
+    df['countries'] = df['countries'].apply(replace_rare_countries)
+    df['countries'] = df['countries'].apply(lambda x: 'world' if ',' in x else x)
+    df['countries'] = df['countries'].replace(values_to_replace, np.nan)
+    country_to_id = {entry["country"]: entry["id"] for entry in columns_preprocessing.COUNTRIES_TO_NUM}
+    df['countries'] = df['countries'].map(country_to_id).fillna(np.nan)
+    return df
+
+def test_country_ids_match_previous_processing():
+    vtr = columns_preprocessing.VALUES_TO_REPLACE
+    values = (['en:france'] * 900 + ['France'] * 500 + ['en:fr'] * 300 + ['France, Germany'] * 200 + ['Deutschland'] * 50
+              + ['en:spain, en:italy'] * 40 + ['unknown'] * 5 + [''] * 5 + [None] * 10 + ['Tuvalu', 'en:es', 'Belgique, Tuvalu'])
+    expected = previous_countries_processing(pd.DataFrame({'countries': values}), vtr)['countries']
+    for _ in range(2): # deuxième passage servi par les tables mémoïsées
+        pd.testing.assert_series_equal(columns_preprocessing.country_ids(pd.Series(values, name='countries'), vtr), expected)
+
+# codes iso alpha-2 restant après le préfixe de langue, absents de COUNTRY_MAPPING: nom anglais du csv
+def test_iso_country_codes_after_language_prefix():
+    normalize_country = columns_preprocessing.normalize_country
+    assert normalize_country('en:sn') == 'senegal'
+    assert normalize_country('en:tl') == 'timor-leste'
+    assert normalize_country('en:fr') == 'france'
+    # sans préfixe de langue, ou code alpha-3 (mots ordinaires): valeur gardée
+    assert normalize_country('sn') == 'sn'
+    assert normalize_country('en:can') == 'can'
+    ids = columns_preprocessing.country_ids(pd.Series(['en:sn', 'en:sn', 'Senegal', 'sn']), columns_preprocessing.VALUES_TO_REPLACE)
+    senegal = columns_preprocessing.COUNTRY_TO_ID['senegal']
+    assert ids.tolist()[:3] == [senegal] * 3 and np.isnan(ids.tolist()[3])
+
+# noyau des tags: chaque tag distinct nettoyé une fois (cache partagé entre les appels), éléments internés,
+# tags non textuels convertis en str, cache vidé au-delà de TAG_CACHE_SIZE
+def test_tag_kernel_cache(monkeypatch):
+    cleaned = []
+    def clean(tag):
+        cleaned.append(tag)
+        return None if tag == 'skip' else tag.upper()
+    tag_items = columns_preprocessing.tag_kernel(clean)
+    assert tag_items(['en:a', 'skip', 'en:a']) == ['EN:A', None, 'EN:A']
+    assert tag_items(['en:a', 1]) == ['EN:A', '1']
+    assert cleaned == ['en:a', 'skip', '1']
+    first, second = tag_items([''.join(['en:', 'b'])]), tag_items([''.join(['en:', 'b'])])
+    assert first[0] is second[0] and len(cleaned) == 4
+    monkeypatch.setattr(columns_preprocessing, 'TAG_CACHE_SIZE', 4)
+    assert tag_items(['x']) == ['X']
+    assert tag_items(['en:a']) == ['EN:A'] and cleaned[-2:] == ['x', 'en:a']
+
+# listes 'en:' (ingrédients, catégories): même texte que le join / strip('[]') / split(', ') de process_chunk
+@pytest.mark.parametrize('tags', [
+    ['en:sugar', 'en:palm-oil', 'fr:sel'],
+    ['fr:sel'],
+    ['en:a, en:b', 'en:c'],
+    ['[en:a', 'en:b]'],
+    ['en:fr:x', 'en:'],
+    [],
+])
+def test_en_tags_text_matches_process_chunk(tags):
+    expected = ', '.join(tag.split(':')[-1] for tag in ', '.join(tags).strip('[]').split(', ') if tag.startswith('en:'))
+    for _ in range(2):
+        assert columns_preprocessing.en_tags_text(tags) == expected
+
+# ecoscore_data structuré: colonnes numériques insérées après ecoscore_data, texte résiduel sans les étiquettes
+def test_ecoscore_data_structured():
+    data = {'agribalyse': {'name_en': 'Hazelnut spread', 'co2_total': 5.2, 'ef_total': '0.8', 'is_beverage': True},
+            'adjustments': {'packaging': {'value': -15, 'packagings': [{'material': 'en:glass', 'shape': 'en:jar'}, 'x'],
+                                          'warning': 'packaging_data_missing'},
+                            'origins_of_ingredients': {'aggregated_origins': [{'origin': 'en:italy'}], 'epi_value': 'n/a'},
+                            'production_system': {'labels': ['fr:ab-agriculture-biologique']},
+                            'threatened_species': {'ingredient': 'en:palm-oil', 'value': -10}},
+            'missing': {'labels': 1}, 'score': 48, 'grade': 'c', 'status': 'known'}
+    df = pd.DataFrame({'code': ['1', '2', '3', '4'], 'ecoscore_data': [data, {}, 'text', np.nan], 'stores': ['a'] * 4})
+    columns_preprocessing.ecoscore_data_structured(df)
+    numeric = list(columns_preprocessing.ECOSCORE_DATA_NUMERIC)
+    assert list(df.columns) == ['code', 'ecoscore_data'] + numeric + ['stores']
+    assert df['ecoscore_data'].iloc[0] == ('Hazelnut spread glass jar italy ab-agriculture-biologique palm-oil '
+                                           'packaging_data_missing missing labels')
+    assert df['ecoscore_data'].tolist()[1:3] == ['empty', 'text'] and pd.isna(df['ecoscore_data'].iloc[3])
+    first = df.iloc[0]
+    assert (first['ecoscore_co2_total'], first['ecoscore_ef_total'], first['ecoscore_packaging_value'],
+            first['ecoscore_threatened_species_value']) == (5.2, 0.8, -15.0, -10.0)
+    # booléen, texte non numérique, clé absente -> NaN
+    assert first[['ecoscore_is_beverage', 'ecoscore_epi_value', 'ecoscore_dqr']].isna().all()
+    assert df.loc[1:, numeric].isna().all().all() and (df[numeric].dtypes == float).all()
+
+# lignes inutiles écartées sur les valeurs brutes: mêmes lignes gardées que delete_useless_lines
+# appliqué à la sortie de process_chunk, morceau brut (02) ou enregistrement (01)
+def test_prune_matches_delete_useless_lines():
+    vtr = columns_preprocessing.VALUES_TO_REPLACE
+    row_filters = columns_preprocessing.row_filters
+    counts = collections.Counter()
+    for chunk in read_chunks(ENGINE_PRODUCTS, 30, dtype={'code': str}, raw=True):
+        legacy = columns_preprocessing.delete_useless_lines(columns_preprocessing.process_chunk(chunk, vtr), vtr)
+        pruned = row_filters.prune_frame(chunk, counts)
+        assert 0 < len(pruned) < len(chunk)
+        assert pruned['code'].tolist() == legacy['code'].tolist()
+    assert set(counts) == set(row_filters.PRUNE_REASONS)
+    kept = [record['code'] for record in iter_records(ENGINE_PRODUCTS) if row_filters.record_prune_reason(record) is None]
+    assert kept == pruned['code'].tolist()
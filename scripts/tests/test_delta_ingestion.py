@@ -0,0 +1,123 @@
+import os
+import json
+import gzip
+import shutil
+import pytest
+from pipeline_config import get_param
+from conftest import load_stage, FIXTURES_PATH, SCRIPTS_PATH
+from intermediate_io import iter_records, extension
+from vocabularies import VOCABULARY_COLUMNS, load_vocabularies
+
+keep_usefull_columns = load_stage('01_keep_usefull_columns')
+columns_preprocessing = load_stage('02_columns_preprocessing')
+delta_ingestion = load_stage('delta_ingestion')
+
+BASE = os.path.join(FIXTURES_PATH, 'delta_base.jsonl')
+CHANGES = os.path.join(FIXTURES_PATH, 'delta_changes.jsonl')
+CHUNK_SIZE = 4
+
+
+def shipped_config():
+    with open(os.path.join(SCRIPTS_PATH, 'config.json'), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+# options facultatives qui changent la sortie, toutes activées
+FEATURES = {'fused_projection': True, 'json_backend': 'auto', 'preprocessing_engine': 'planned',
+            'global_rare_countries': True, 'ecoscore_data_mode': 'structured', 'categorical_encoding': True,
+            'json_reader': 'arrow', 'vocabulary_mode': 'alongside', 'prune_useless_lines': True,
+            'dedup_products': True}
+
+CONFIGS = {
+    'defaults': {},
+    'shipped': dict(shipped_config(), nb_workers=1),
+    'features': dict(shipped_config(), **FEATURES, nb_workers=1),
+    'features_parallel': dict(shipped_config(), **FEATURES, nb_workers=2),
+    'features_parquet': dict(shipped_config(), **FEATURES, nb_workers=2, intermediate_format='parquet'),
+}
+
+def codes(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [json.loads(line)['code'] for line in file]
+
+# traitement complet 01 -> 02 du fichier de base puis initialisation de la base produits
+def full_run(data_path, file_id='x'):
+    if get_param('fused_projection', False):
+        with open(BASE, 'rb') as infile, gzip.open(data_path + file_id + '_openfoodfacts_00.jsonl.gz', 'wb') as outfile:
+            shutil.copyfileobj(infile, outfile)
+    else:
+        shutil.copy(BASE, data_path + file_id + '_openfoodfacts_01.jsonl')
+    keep_usefull_columns.main(CHUNK_SIZE, file_id, data_path)
+    columns_preprocessing.main(CHUNK_SIZE, file_id, data_path)
+    delta_ingestion.main(CHUNK_SIZE, file_id, data_path, 'seed')
+    return {record['code']: record for record in iter_records(data_path + file_id + '_openfoodfacts_03' + extension())}
+
+@pytest.fixture(params=sorted(CONFIGS))
+def pipeline(request, config, tmp_path):
+    config.update(CONFIGS[request.param])
+    config['logs_path'] = str(tmp_path / 'logs')
+    data_path = str(tmp_path / 'data') + '/'
+    os.makedirs(data_path)
+    return data_path
+
+def test_seed_and_export_round_trip(pipeline):
+    seeded = full_run(pipeline)
+    store = delta_ingestion.open_store(pipeline + 'x_product_store.sqlite')
+    exported = pipeline + 'x_exported' + extension()
+    delta_ingestion.export_store(store, exported)
+    store.close()
+    assert {record['code']: record for record in iter_records(exported)} == seeded
+    assert sorted(seeded) == sorted(codes(BASE))
+
+def test_apply_delta(pipeline):
+    seeded = full_run(pipeline)
+    delta_ingestion.main(CHUNK_SIZE, 'x', pipeline, 'apply', CHANGES)
+    applied = {record['code']: record for record in iter_records(pipeline + 'x_openfoodfacts_03' + extension())}
+    changed, useless, new, same = codes(CHANGES)
+    # produit devenu inutile supprimé (gardé et mis à jour sans prune_useless_lines, comme en
+    # traitement complet), nouveau produit ajouté, autres produits inchangés
+    if get_param('prune_useless_lines', False):
+        assert sorted(applied) == sorted(set(seeded) - {useless} | {new})
+    else:
+        assert sorted(applied) == sorted(set(seeded) | {new})
+        assert applied[useless] != seeded[useless]
+    assert 'bio' in applied[changed]['name']
+    assert applied[same] == seeded[same]
+    for code in set(seeded) - {changed, useless}:
+        assert applied[code] == seeded[code]
+    assert not [name for name in os.listdir(pipeline) if '_delta_' in name]
+    # occurrences des pays du traitement complet conservées pour les deltas suivants
+    assert os.path.exists(columns_preprocessing.country_counts_path(pipeline, 'x')) == get_param('global_rare_countries', False)
+
+def test_apply_without_delta_file(pipeline):
+    full_run(pipeline)
+    with pytest.raises(SystemExit):
+        delta_ingestion.main(CHUNK_SIZE, 'x', pipeline, 'apply')
+    with pytest.raises(SystemExit):
+        delta_ingestion.main(CHUNK_SIZE, 'x', pipeline, 'apply', pipeline + 'missing.jsonl')
+
+# occurrences des vocabulaires d'après les identifiants des lignes du jsonl 03
+def vocabulary_counts(data_path):
+    counts = {}
+    for record in iter_records(data_path + 'x_openfoodfacts_03' + extension()):
+        for column in VOCABULARY_COLUMNS:
+            for token_id in record.get(column + '_ids') or []:
+                counts.setdefault(column, {}).setdefault(token_id, 0)
+                counts[column][token_id] += 1
+    return counts
+
+def saved_counts(data_path):
+    vocabularies = load_vocabularies(columns_preprocessing.vocabulary_path(data_path, 'x'))
+    return {column: {i + 1: count for i, count in enumerate(vocabulary.counts) if count}
+            for column, vocabulary in vocabularies.items() if any(vocabulary.counts)}
+
+# produits déjà en base ré-ingérés: occurrences des vocabulaires sans dérive d'un delta à l'autre
+def test_vocabulary_counts_after_deltas(pipeline):
+    if get_param('vocabulary_mode', 'off') == 'off':
+        pytest.skip("vocabularies disabled")
+    full_run(pipeline)
+    assert saved_counts(pipeline) == vocabulary_counts(pipeline)
+    delta_ingestion.main(CHUNK_SIZE, 'x', pipeline, 'apply', CHANGES)
+    applied = saved_counts(pipeline)
+    assert applied == vocabulary_counts(pipeline)
+    delta_ingestion.main(CHUNK_SIZE, 'x', pipeline, 'apply', CHANGES)
+    assert saved_counts(pipeline) == applied
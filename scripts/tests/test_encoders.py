@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import encoders
+
+
+# codes int8 nullables: tag en liste ou chaîne, casse, espaces et préfixe de langue ignorés, alias
+def test_encode_grades():
+    values = pd.Series([['en:c'], 'A', ' b ', 'en:a-plus', 'fr:e', [], 'unknown', np.nan, None, 5], index=range(3, 13))
+    codes = encoders.encode_grades(values)
+    assert str(codes.dtype) == 'Int8'
+    assert codes.index.equals(values.index)
+    assert codes.tolist()[:5] == [2, 0, 1, 0, 4]
+    assert codes.iloc[5:].isna().all()
+
+# décodage du code encodé: catégorie d'origine pour chaque entrée du vocabulaire
+def test_categories_round_trip():
+    for categories in [encoders.GRADES, encoders.PNNS_1_GROUPS]:
+        codes = encoders.encode_categories([value.upper() for value in categories], categories)
+        assert [encoders.decode_category(code, categories) for code in codes] == categories
+    assert encoders.decode_category(pd.NA, encoders.GRADES) is None
+    # sortie du modèle: arrondie et bornée au vocabulaire
+    assert [encoders.decode_grade(code) for code in [1.4, 1.6, -3, 9.0]] == ['b', 'c', 'a', 'e']
@@ -0,0 +1,74 @@
+import os
+import gzip
+import json
+import random
+import pytest
+import gz_index
+from conftest import load_stage
+
+pytest.importorskip('indexed_gzip')
+keep_usefull_columns = load_stage('01_keep_usefull_columns')
+
+SPACING = 64 * 1024
+
+
+# jsonl.gz de ~1 Mo peu compressible: plusieurs points d'index avec un petit spacing
+def write_archive(jsonl_gz, nb_lines=4000):
+    rng = random.Random(3)
+    lines = []
+    for i in range(nb_lines):
+        name = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(rng.randrange(50, 400)))
+        lines.append(json.dumps({'code': str(i), 'product_name': name, 'countries': 'France'}).encode() + b'\n')
+    with gzip.open(jsonl_gz, 'wb') as file:
+        file.writelines(lines)
+    return lines
+
+def test_ranges_cover_archive_on_line_boundaries(tmp_path):
+    jsonl_gz = str(tmp_path / 'x_openfoodfacts_00.jsonl.gz')
+    lines = write_archive(jsonl_gz)
+    line_offsets = gz_index.load_gz_index(jsonl_gz, SPACING)
+    assert len(line_offsets) > 10
+    ranges = gz_index.gz_ranges(line_offsets, 7)
+    assert len(ranges) == 7
+    assert ranges[0][0] == 0 and ranges[-1][1] == sum(len(line) for line in lines)
+    read = [line for start, end in ranges for line in gz_index.read_gz_range(jsonl_gz, start, end)]
+    assert read == lines
+
+def test_index_reused_until_archive_changes(tmp_path, monkeypatch):
+    jsonl_gz = str(tmp_path / 'x_openfoodfacts_00.jsonl.gz')
+    write_archive(jsonl_gz)
+    built = []
+    build_gz_index = gz_index.build_gz_index
+    monkeypatch.setattr(gz_index, 'build_gz_index', lambda *args: built.append(args) or build_gz_index(*args))
+    line_offsets = gz_index.load_gz_index(jsonl_gz, SPACING)
+    assert gz_index.load_gz_index(jsonl_gz, SPACING) == line_offsets
+    assert len(built) == 1
+    # spacing différent ou archive remplacée: index reconstruit
+    gz_index.load_gz_index(jsonl_gz, SPACING * 2)
+    assert len(built) == 2
+    write_archive(jsonl_gz, 3000)
+    os.utime(jsonl_gz, (0, 0))
+    assert gz_index.load_gz_index(jsonl_gz, SPACING * 2) != line_offsets
+    assert len(built) == 3
+
+# projection parallèle depuis les points d'index: même jsonl 02 qu'en série, index gardé avec
+# l'archive et réutilisé au passage suivant
+def test_parallel_projection_from_index(config, tmp_path, monkeypatch):
+    config.update({'fused_projection': True, 'gz_index_spacing': SPACING})
+    built = []
+    build_gz_index = gz_index.build_gz_index
+    monkeypatch.setattr(gz_index, 'build_gz_index', lambda *args: built.append(args) or build_gz_index(*args))
+    outputs = []
+    for nb_workers in [1, 3]:
+        config['nb_workers'] = nb_workers
+        data_path = str(tmp_path / f"workers{nb_workers}") + '/'
+        os.makedirs(data_path)
+        write_archive(data_path + 'x_openfoodfacts_00.jsonl.gz')
+        keep_usefull_columns.main(500, 'x', data_path)
+        with open(data_path + 'x_openfoodfacts_02.jsonl', 'rb') as file:
+            outputs.append(file.read())
+    assert outputs[0].count(b'\n') == 4000
+    assert outputs[1] == outputs[0]
+    assert all(os.path.exists(file_path) for file_path in gz_index.index_paths(data_path + 'x_openfoodfacts_00.jsonl.gz'))
+    keep_usefull_columns.main(500, 'x', data_path)
+    assert len(built) == 1
@@ -0,0 +1,112 @@
+import json
+import math
+import pyarrow.parquet as pq
+import intermediate_io
+from intermediate_io import open_writer, concat_files, shard_path, iter_records, read_jsonl_chunks, read_chunks, loads
+
+
+def write_shard(file_path, records, raw=True):
+    with open_writer(file_path, raw=raw) as writer:
+        writer.write_records(records)
+
+# deux shards dont les premières valeurs d'une colonne n'ont pas le même type
+def test_shards_with_different_first_types(config, tmp_path):
+    config['intermediate_format'] = 'parquet'
+    file_path = str(tmp_path / 'x_openfoodfacts_02.parquet')
+    first = [{'code': 1, 'product_name': 123, 'nutriscore_tags': None, 'ecoscore_score': None, 'ecoscore_data': None},
+             {'code': '2', 'product_name': 'Skyr', 'nutriscore_tags': ['b'], 'ecoscore_score': 52, 'ecoscore_data': {'a': 1}}]
+    second = [{'code': '3', 'product_name': 'Pain de mie', 'nutriscore_tags': 'c', 'ecoscore_score': 12.5, 'ecoscore_data': None},
+              {'code': '4', 'product_name': None, 'nutriscore_tags': [], 'ecoscore_score': None, 'ecoscore_data': {'b': [2]}}]
+    shards = [shard_path(file_path, 0), shard_path(file_path, 1)]
+    write_shard(shards[0], first)
+    write_shard(shards[1], second)
+    assert pq.ParquetFile(shards[0]).schema_arrow == pq.ParquetFile(shards[1]).schema_arrow
+    concat_files(shards, file_path)
+    assert list(iter_records(file_path)) == [
+        {'code': '1', 'product_name': '123', 'nutriscore_tags': None, 'ecoscore_score': None, 'ecoscore_data': None},
+        {'code': '2', 'product_name': 'Skyr', 'nutriscore_tags': ['b'], 'ecoscore_score': 52.0, 'ecoscore_data': {'a': 1}},
+        {'code': '3', 'product_name': 'Pain de mie', 'nutriscore_tags': ['c'], 'ecoscore_score': 12.5, 'ecoscore_data': None},
+        {'code': '4', 'product_name': None, 'nutriscore_tags': [], 'ecoscore_score': None, 'ecoscore_data': {'b': [2]}}]
+
+# en série: une colonne texte dont la première valeur est numérique garde les valeurs texte suivantes
+def test_batches_with_different_first_types(config, tmp_path):
+    config['intermediate_format'] = 'parquet'
+    file_path = str(tmp_path / 'x_openfoodfacts_03.parquet')
+    with open_writer(file_path) as writer:
+        writer.write_records([{'code': '1', 'name': 0, 'countries': None, 'stores': None, 'keywords_ids': [1, 2]}])
+        writer.write_records([{'code': '2', 'name': 'skyr', 'countries': 12, 'stores': 'carrefour', 'keywords_ids': []}])
+    assert list(iter_records(file_path)) == [
+        {'code': '1', 'name': '0', 'countries': None, 'stores': None, 'keywords_ids': [1, 2]},
+        {'code': '2', 'name': 'skyr', 'countries': 12.0, 'stores': 'carrefour', 'keywords_ids': []}]
+
+# colonnes du column_spec (moteur planned): type d'après l'encodage ou la normalisation
+def test_column_spec_types(config, tmp_path):
+    config.update({'intermediate_format': 'parquet', 'preprocessing_engine': 'planned',
+                   'column_spec': [{'column': 'nova_group'}, {'column': 'grade', 'source': 'nutriscore_tags', 'encoding': 'grade'},
+                                   {'column': 'countries', 'normalization': 'text'}]})
+    file_path = str(tmp_path / 'x_openfoodfacts_03.parquet')
+    write_shard(file_path, [{'nova_group': 4, 'grade': 2, 'countries': 'france'}], raw=False)
+    schema = pq.ParquetFile(file_path).schema_arrow
+    assert [str(field.type) for field in schema] == ['double', 'double', 'string']
+
+def same_value(x, y):
+    if isinstance(x, dict):
+        return isinstance(y, dict) and set(x) == set(y) and all(same_value(x[key], y[key]) for key in x)
+    if isinstance(x, list):
+        return isinstance(y, list) and len(x) == len(y) and all(same_value(u, v) for u, v in zip(x, y))
+    if x is None or (isinstance(x, float) and math.isnan(x)):
+        return y is None or (isinstance(y, float) and math.isnan(y))
+    return x == y
+
+# lecteur arrow (schéma explicite du jsonl 02 brut) et pd.read_json sur des lignes aux types mélangés
+def test_arrow_reader_matches_pandas_on_mixed_types(config, tmp_path):
+    file_path = str(tmp_path / 'x_openfoodfacts_02.jsonl')
+    records = [
+        # morceau aux types inattendus: valeur seule dans une colonne de listes, texte dans une colonne
+        # numérique, nombre dans une colonne texte
+        {'code': '1', 'product_name': 'Skyr', 'nutriscore_tags': 'b', 'ingredients_tags': ['en:milk'],
+         'ecoscore_score': 52, 'ecoscore_data': {'agribalyse': {'co2_total': 1.5}}, 'countries': 'France'},
+        {'code': '2', 'product_name': 123, 'nutriscore_tags': ['a'], 'ingredients_tags': 'en:sugar',
+         'ecoscore_score': 'unknown', 'ecoscore_data': None, 'countries': None},
+        {'code': '3', 'product_name': None, 'nutriscore_tags': None, 'ingredients_tags': None,
+         'ecoscore_score': None, 'ecoscore_data': {}, 'countries': 'en:spain'},
+        # morceau décodé nativement
+        {'code': '4', 'product_name': 'Pain de mie', 'nutriscore_tags': ['c'], 'ingredients_tags': [],
+         'ecoscore_score': 12.5, 'ecoscore_data': {'missing': {'labels': 1}}, 'countries': 'Belgique, France'},
+        {'code': '5', 'product_name': None, 'nutriscore_tags': [], 'ingredients_tags': ['en:salt', 'en:water'],
+         'ecoscore_score': None, 'ecoscore_data': None, 'countries': None}]
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for record in records:
+            file.write(json.dumps(record) + '\n')
+    arrow = list(read_jsonl_chunks(file_path, 3, dtype={'code': str}, raw=True, reader='arrow'))
+    pandas = list(read_jsonl_chunks(file_path, 3, dtype={'code': str}, raw=True, reader='pandas'))
+    assert len(arrow) == len(pandas) == 2
+    for arrow_chunk, pandas_chunk in zip(arrow, pandas):
+        assert list(arrow_chunk.columns) == list(pandas_chunk.columns)
+        for column in arrow_chunk.columns:
+            for x, y in zip(arrow_chunk[column].tolist(), pandas_chunk[column].tolist()):
+                assert same_value(x, y), (column, x, y)
+
+# colonnes numériques entières (nova, additives...): int64 comme pd.read_json, float64 si valeur manquante
+# ou non entière, en jsonl avec le lecteur arrow comme en parquet
+def test_integer_columns_read_like_pandas(config, tmp_path):
+    records = [{'code': str(i), 'nova': i % 4 + 1, 'additives': i * 2, 'palm_oil': None if i == 3 else 0,
+                'ecoscore_score': 50.0 + i, 'countries': 12.5, 'name': 'skyr'} for i in range(6)]
+    jsonl = str(tmp_path / 'x_openfoodfacts_03.jsonl')
+    write_shard(jsonl, records, raw=False)
+    pandas = list(read_jsonl_chunks(jsonl, 3, dtype={'code': str}, reader='pandas'))
+    config['intermediate_format'] = 'parquet'
+    parquet = str(tmp_path / 'x_openfoodfacts_03.parquet')
+    write_shard(parquet, records, raw=False)
+    for chunks in [list(read_jsonl_chunks(jsonl, 3, dtype={'code': str}, reader='arrow')), list(read_chunks(parquet, 3))]:
+        for chunk, pandas_chunk in zip(chunks, pandas):
+            assert chunk.dtypes.to_dict() == pandas_chunk.dtypes.to_dict()
+    assert [str(chunk['palm_oil'].dtype) for chunk in pandas] == ['int64', 'float64']
+
+# orjson décode les entiers de 64 bits ou plus en flottants: json en secours
+def test_loads_keeps_big_integers():
+    for line in ['{"code": 12345678901234567890123}', b'{"code": 9223372036854775808}']:
+        assert loads(line) == json.loads(line)
+        assert isinstance(loads(line)['code'], int)
+    assert intermediate_io.has_big_integer('{"code": "1234567890123456789"}')
+    assert loads('{"nova": 4}') == {'nova': 4}
@@ -0,0 +1,92 @@
+import os
+import json
+import gzip
+import shutil
+import pytest
+from conftest import load_stage, FIXTURES_PATH
+from intermediate_io import iter_records, list_shards, shard_path
+
+keep_usefull_columns = load_stage('01_keep_usefull_columns')
+
+PRODUCTS = os.path.join(FIXTURES_PATH, 'delta_base.jsonl')
+
+
+def read_bytes(file_path):
+    with open(file_path, 'rb') as file:
+        return file.read()
+
+def project(config, data_path, fused):
+    config['fused_projection'] = fused
+    os.makedirs(data_path)
+    if fused:
+        with open(PRODUCTS, 'rb') as infile, gzip.open(os.path.join(data_path, 'x_openfoodfacts_00.jsonl.gz'), 'wb') as outfile:
+            shutil.copyfileobj(infile, outfile)
+    else:
+        shutil.copy(PRODUCTS, os.path.join(data_path, 'x_openfoodfacts_01.jsonl'))
+    keep_usefull_columns.main(4, 'x', data_path + '/')
+    return read_bytes(os.path.join(data_path, 'x_openfoodfacts_02.jsonl'))
+
+# projection en flux depuis le jsonl.gz: même jsonl 02 que depuis le jsonl décompressé
+def test_fused_projection_matches_uncompressed_input(config, tmp_path):
+    uncompressed = project(config, str(tmp_path / 'plain'), False)
+    assert uncompressed.count(b'\n') == 10
+    assert project(config, str(tmp_path / 'fused'), True) == uncompressed
+
+# lignes aux valeurs délicates: grand entier, flottants, unicode, échappements, objets imbriqués,
+# colonnes absentes ou nulles, clés non gardées
+LINES = [
+    '{"code": "3017620422003", "product_name": "Nutella \\u00e0 tartiner", "nova_group": 4, "ecoscore_score": 0.1, '
+    '"ecoscore_data": {"adjustments": {"packaging": {"value": -15.5, "packagings": [{"material": "en:glass"}]}}}, '
+    '"ingredients_tags": ["en:sugar", "en:palm-oil"], "images": {"1": {"sizes": [100, 400]}}}',
+    '{"code": 12345678901234567890123, "product_name": null, "additives_old_n": 123456789012, "stores": "Carrefour, \\"Lidl\\"\\n"}',
+    '{"code": "1", "countries": "España,Deutschland", "ecoscore_score": 1e-7, "nutriscore_tags": [], "ecoscore_data": {}}',
+    '{"other": [1, 2, {"deep": true}]}',
+]
+
+@pytest.mark.parametrize('json_backend', ['orjson', 'simdjson', 'auto'])
+def test_json_backends_match_stdlib(json_backend, tmp_path):
+    if keep_usefull_columns.resolve_json_backend(json_backend) == 'json' and json_backend != 'auto':
+        pytest.skip(f"{json_backend} not installed")
+    columns = keep_usefull_columns.COLUMNS_TO_KEEP
+    expected, _ = keep_usefull_columns.get_json_codec('json', columns)
+    extract, _ = keep_usefull_columns.get_json_codec(json_backend, columns)
+    for line in LINES:
+        assert extract(line) == expected(line)
+    # lignes écrites par le backend relues à l'identique
+    outputs = {}
+    for backend in ['json', json_backend]:
+        outputs[backend] = str(tmp_path / f"{backend}_02.jsonl")
+        keep_usefull_columns.write_filtered_lines(LINES, columns, outputs[backend], 2, backend)
+    assert list(iter_records(outputs[json_backend])) == list(iter_records(outputs['json']))
+
+def test_auto_backend_is_partial_decoding():
+    assert keep_usefull_columns.resolve_json_backend('auto') == ('simdjson' if keep_usefull_columns.simdjson is not None else 'json')
+
+def write_products(file_path, nb_lines):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for i in range(nb_lines):
+            file.write(json.dumps({'code': str(i), 'product_name': f"produit {i}" * (i % 7), 'nova_group': i % 4}) + '\n')
+
+# projection par plages d'octets: shards dans l'ordre des plages, même contenu qu'en série
+@pytest.mark.parametrize('keep_shards', [False, True])
+def test_range_shards_keep_input_order(config, tmp_path, keep_shards):
+    jsonl_01 = str(tmp_path / 'x_openfoodfacts_01.jsonl')
+    write_products(jsonl_01, 3000)
+    serial = str(tmp_path / 'serial_02.jsonl')
+    keep_usefull_columns.jsonl_filtered_creator(jsonl_01, keep_usefull_columns.COLUMNS_TO_KEEP, serial, 100)
+    ranges = keep_usefull_columns.file_ranges(jsonl_01, 12)
+    assert len(ranges) == 12
+    assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(jsonl_01)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    jsonl_02 = str(tmp_path / 'x_openfoodfacts_02.jsonl')
+    keep_usefull_columns.jsonl_filtered_creator_parallel(jsonl_01, keep_usefull_columns.COLUMNS_TO_KEEP, jsonl_02, 100,
+                                                         3, ranges, keep_shards=keep_shards)
+    parts = list_shards(jsonl_02) if keep_shards else [jsonl_02]
+    assert len(parts) == (12 if keep_shards else 1)
+    assert b''.join(read_bytes(part) for part in parts) == read_bytes(serial)
+
+def test_shards_listed_by_number(tmp_path):
+    file_path = str(tmp_path / 'x_openfoodfacts_02.jsonl')
+    for i in [2, 999, 1000, 0, 10]:
+        (tmp_path / os.path.basename(shard_path(file_path, i))).write_text('')
+    assert list_shards(file_path) == [shard_path(file_path, i) for i in [0, 2, 10, 999, 1000]]
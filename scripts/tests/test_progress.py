@@ -0,0 +1,39 @@
+import progress
+from progress import Progress, format_duration
+from intermediate_io import read_chunks
+
+MB = 1024 * 1024
+
+
+# horloge simulée: débit lissé sur les fenêtres d'au moins interval secondes, temps restant d'après le débit
+def test_smoothed_rate_and_eta(tmp_path, monkeypatch, capsys):
+    file_path = tmp_path / 'x_openfoodfacts_02.jsonl'
+    file_path.write_bytes(b' ' * (10 * MB))
+    clock = [0.0]
+    monkeypatch.setattr(progress.time, 'perf_counter', lambda: clock[0])
+    tracker = Progress([str(file_path), str(tmp_path / 'missing.jsonl')], smoothing=0.5, interval=1.0)
+    for now, done in [(0.5, 1), (1.0, 2), (2.0, 6), (2.5, 7)]:
+        clock[0] = now
+        tracker.advance(done * MB - tracker.done)
+        tracker.report()
+    lines = [line.split('progress: ')[1] for line in capsys.readouterr().out.splitlines()]
+    assert lines == [
+        '10.0 % (2.0 MB/s, eta 4s)',  # première fenêtre: débit moyen depuis le début
+        '20.0 % (2.0 MB/s, eta 4s)',
+        '60.0 % (3.0 MB/s, eta 1s)',  # 0.5 * 4 + 0.5 * 2
+        '70.0 % (3.0 MB/s, eta 1s)']  # fenêtre de 0.5 s: débit inchangé
+    tracker.report(done=12 * MB)
+    assert capsys.readouterr().out.split('progress: ')[1].startswith('100.0 %')
+
+# position des lecteurs: tout le fichier consommé à la fin de la lecture
+def test_reader_advances_to_file_size(config, tmp_path):
+    file_path = tmp_path / 'x_openfoodfacts_02.jsonl'
+    file_path.write_text(''.join(f'{{"code": "{i}", "nova": {i % 4}}}\n' for i in range(100)))
+    for reader in ['pandas', 'arrow']:
+        config['json_reader'] = reader
+        tracker = Progress([str(file_path)])
+        assert sum(len(chunk) for chunk in read_chunks(str(file_path), 30, progress=tracker)) == 100
+        assert tracker.done == tracker.total == file_path.stat().st_size
+
+def test_format_duration():
+    assert [format_duration(seconds) for seconds in [0.4, 59, 61, 3600 + 125]] == ['0s', '59s', '1m01s', '1h02m']
@@ -0,0 +1,82 @@
+import os
+import json
+import random
+from conftest import load_stage
+
+split_dataset = load_stage('03_split_dataset')
+
+
+def write_lines(file_path, nb_lines):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for i in range(nb_lines):
+            ecoscore_score = [None, 12.0, 55.0][i % 3]
+            file.write(json.dumps({'code': str(i), 'name': 'produit ' * 10, 'ecoscore_score': ecoscore_score, 'ecoscore_tags': i % 3}) + '\n')
+
+def shuffle(config, tmp_path, memory_bytes, limit):
+    config['shuffle_seed'] = 7
+    jsonl_03 = str(tmp_path / 'x_openfoodfacts_03.jsonl')
+    write_lines(jsonl_03, 300)
+    jsonl_04 = str(tmp_path / 'x_openfoodfacts_04.jsonl')
+    rng = random.Random(7)
+    buckets = split_dataset.bucket_paths(jsonl_04, split_dataset.nb_buckets(os.path.getsize(jsonl_03), memory_bytes, limit))
+    split_dataset.scatter_buckets(jsonl_03, buckets, rng, 50)
+    batches = list(split_dataset.gather_buckets(buckets, jsonl_04, rng, 50, memory_bytes, limit))
+    return len(buckets), [json.loads(line)['code'] for batch in batches for _, _, line in batch]
+
+# seaux plafonnés: les seaux trop gros sont redispersés, toutes les lignes sorties une fois
+def test_capped_buckets_shuffle_recursively(config, tmp_path):
+    nb_buckets, codes = shuffle(config, tmp_path, 1024, 3)
+    assert nb_buckets == 3
+    assert sorted(codes, key=int) == [str(i) for i in range(300)]
+    assert codes != sorted(codes, key=int)
+    assert sorted(os.listdir(tmp_path)) == ['x_openfoodfacts_03.jsonl', 'x_openfoodfacts_04.jsonl']
+    # mêmes tirages pour la même graine
+    os.remove(tmp_path / 'x_openfoodfacts_04.jsonl')
+    assert shuffle(config, tmp_path, 1024, 3) == (nb_buckets, codes)
+
+def test_max_buckets_below_open_files_limit(config):
+    config['shuffle_max_buckets'] = 100000
+    import resource
+    soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft_limit != resource.RLIM_INFINITY:
+        assert split_dataset.max_buckets() < soft_limit
+    config['shuffle_max_buckets'] = 16
+    assert split_dataset.max_buckets() == 16
+
+def write_classes(file_path, nb_lines):
+    rng = random.Random(11)
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for i in range(nb_lines):
+            # classe corrélée au score: classe None toujours sans écoscore score (ko)
+            tags = rng.choice([None, 0, 1, 2, 3, 4])
+            score = None if tags is None or rng.random() < 0.3 else float(rng.randrange(101))
+            file.write(json.dumps({'code': str(i), 'ecoscore_score': score, 'ecoscore_tags': tags}) + '\n')
+
+def split_records(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+# répartition par classe ecoscore_tags contrôlée d'après les comptages de la dispersion
+def test_split_checks_repartition_per_class(config, tmp_path, capsys):
+    config.update({'shuffle_seed': 3, 'shuffle_memory_mb': 1})
+    jsonl_03 = str(tmp_path / 'x_openfoodfacts_03.jsonl')
+    write_classes(jsonl_03, 3000)
+    outputs = [str(tmp_path / f"x_{split}.jsonl") for split in ['train', 'test', 'valid']]
+    split_dataset.split_jsonl_file(jsonl_03, *outputs, str(tmp_path / 'x_openfoodfacts_04.jsonl'), 100)
+    out = capsys.readouterr().out
+    assert 'class_check: True' in out and 'per ecoscore_tags class valid, 6 classes' in out
+    train, test, valid = (split_records(output) for output in outputs)
+    assert len(train) + len(test) + len(valid) >= 2995
+    assert {record['ecoscore_tags'] for record in test} == {None, 0, 1, 2, 3, 4}
+
+# classe absente d'un fichier: contrôle en erreur
+def test_class_validation_reports_skewed_class(capsys):
+    counts = split_dataset.SplitCounts()
+    for i in range(1000):
+        counts.add({'ecoscore_score': 50.0, 'ecoscore_tags': i % 2})
+    quotas = {'train': {split_dataset.KO: 0, split_dataset.OK: 800}, 'test': {split_dataset.KO: 0, split_dataset.OK: 200}}
+    balanced = {'train': {0: 400, 1: 400}, 'test': {0: 100, 1: 100}}
+    assert split_dataset.class_validation(counts, balanced, quotas)
+    skewed = {'train': {0: 500, 1: 300}, 'test': {0: 0, 1: 200}}
+    assert not split_dataset.class_validation(counts, skewed, quotas)
+    assert 'ERROR, test repartition of ecoscore_tags class 0 invalid: 0 lines, 100.0 expected' in capsys.readouterr().out
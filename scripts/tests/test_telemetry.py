@@ -0,0 +1,35 @@
+import os
+import shutil
+import telemetry
+from conftest import load_stage, FIXTURES_PATH
+
+keep_usefull_columns = load_stage('01_keep_usefull_columns')
+
+
+# mesures d'une étape ajoutées à pipeline_metrics.jsonl: lignes, morceaux, octets lus et écrits
+def test_stage_metrics_written_per_run(config, tmp_path, capsys):
+    config['logs_path'] = str(tmp_path / 'logs')
+    data_path = str(tmp_path) + '/'
+    jsonl_01 = data_path + 'x_openfoodfacts_01.jsonl'
+    shutil.copy(os.path.join(FIXTURES_PATH, 'delta_base.jsonl'), jsonl_01)
+    input_size = os.path.getsize(jsonl_01)
+    keep_usefull_columns.main(4, 'x', data_path)
+    metrics = telemetry.load_metrics('x')['01_keep_usefull_columns']
+    assert (metrics['rows_in'], metrics['rows_out'], metrics['chunks']) == (10, 10, 3)
+    assert metrics['bytes_read'] == input_size
+    assert metrics['bytes_written'] == os.path.getsize(data_path + 'x_openfoodfacts_02.jsonl')
+    assert metrics['rows_pruned'] == {}
+    latencies = metrics['chunk_latency_ms']
+    assert latencies['p50'] <= latencies['p90'] <= latencies['p99'] <= latencies['max']
+    # deuxième exécution sous un autre file_id, comparée à la première
+    shutil.copy(os.path.join(FIXTURES_PATH, 'delta_base.jsonl'), data_path + 'y_openfoodfacts_01.jsonl')
+    keep_usefull_columns.main(4, 'y', data_path)
+    capsys.readouterr()
+    telemetry.compare('x', 'y')
+    assert capsys.readouterr().out.splitlines()[1].startswith('01_keep_usefull_columns')
+
+def test_percentile():
+    values = [0.001 * i for i in range(1, 101)]
+    assert telemetry.percentile([], 0.5) is None
+    assert telemetry.percentile(values, 0.5) == 51.0
+    assert telemetry.percentile(values, 1) == 100.0
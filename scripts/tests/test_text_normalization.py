@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+from text_normalization import PUNCTUATION_PATTERN, normalize_text, normalize_columns
+
+
+VALUES = ['Nutella: pâte à tartiner', "{'packaging': [\"en:glass\"]}", 'Ça_va-bien, MERCI', 'ﬁ ǅ İstanbul ẞ', '😀: emoji',
+          '', 'empty', np.nan, None]
+
+# même texte que str.lower() puis str.replace(regex) de 02_columns_preprocessing.py, colonnes traitées ensemble
+def test_normalize_columns_matches_regex_path():
+    df = pd.DataFrame({'stores': VALUES, 'ecoscore_data': VALUES[::-1]}, index=range(10, 10 + len(VALUES)))
+    expected = {column: df[column].str.lower().str.replace(PUNCTUATION_PATTERN, ' ', regex=True) for column in df.columns}
+    normalize_columns(df, ['stores', 'ecoscore_data'])
+    for column, values in expected.items():
+        pd.testing.assert_series_equal(df[column], values, check_dtype=False)
+    # sans minuscules, valeurs remplacées après normalisation
+    assert normalize_text('A:b', lower=False) == 'A b'
+    assert normalize_text('', replaced={''}) == 'empty'
+    assert normalize_text(3.5) == 3.5
@@ -0,0 +1,29 @@
+import pandas as pd
+
+
+# normalisation des colonnes texte: minuscules puis ponctuation -> espace, équivalent à
+# str.lower() puis str.replace(r'[:{}\'",_\[\]-]', ' ', regex=True) de 02_columns_preprocessing.py;
+# utilisable tel quel à l'inférence sur le texte d'un produit scanné
+PUNCTUATION = ':{}\'",_[]-'
+PUNCTUATION_PATTERN = r'[:{}\'",_\[\]-]'
+# table sur les octets utf-8: la ponctuation est ascii et n'apparaît jamais dans un caractère
+# multi-octets, bytes.translate est bien plus rapide que str.translate (table dict)
+PUNCTUATION_BYTES = bytes.maketrans(PUNCTUATION.encode(), b' ' * len(PUNCTUATION))
+
+def normalize_text(text, lower=True, replaced=None):
+    if not isinstance(text, str):
+        return text
+    if lower:
+        text = text.lower()
+    text = text.encode('utf-8', 'surrogatepass').translate(PUNCTUATION_BYTES).decode('utf-8', 'surrogatepass')
+    if replaced is not None and text in replaced:
+        return 'empty'
+    return text
+
+# toutes les colonnes texte d'un morceau en un seul passage (valeurs mises bout à bout)
+def normalize_columns(df, columns, lower=True, replaced=None):
+    values = [value for column in columns for value in df[column].tolist()]
+    normalized = [normalize_text(value, lower, replaced) for value in values]
+    for i, column in enumerate(columns):
+        df[column] = pd.Series(normalized[i * len(df):(i + 1) * len(df)], index=df.index, dtype=object)
+    return df
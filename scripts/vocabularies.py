@@ -0,0 +1,76 @@
+import os
+import json
+
+
+# vocabulaires des colonnes texte à forte cardinalité de 02 (élément -> identifiant entier, avec
+# nombre d'occurrences): identifiants attribués dans l'ordre d'apparition à partir de 1, 0 étant
+# réservé au remplissage et aux éléments inconnus à l'inférence; conservés dans un fichier json
+# d'une exécution à l'autre pour que les identifiants restent stables (ingestion delta, embeddings)
+VOCABULARY_COLUMNS = ['stores', 'packaging', 'main_category', 'food_group', 'keywords']
+UNKNOWN_ID = 0
+
+class Vocabulary:
+    def __init__(self, tokens=(), counts=()):
+        self.ids = {}
+        self.tokens = []
+        self.counts = []
+        for token in tokens:
+            self.add(token)
+        for i, count in enumerate(list(counts)[:len(self.counts)]):
+            self.counts[i] = count
+
+    def __len__(self):
+        return len(self.tokens)
+
+    # identifiant d'un token, ajouté s'il est nouveau
+    def add(self, token):
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = self.ids[token] = len(self.tokens) + 1
+            self.tokens.append(token)
+            self.counts.append(0)
+        return token_id
+
+    # listes de tokens -> listes d'identifiants, tokens nouveaux ajoutés
+    def encode(self, token_lists):
+        return [[self.add(token) for token in tokens] for tokens in token_lists]
+
+    # à l'inférence: vocabulaire figé, token inconnu -> UNKNOWN_ID
+    def lookup(self, tokens):
+        return [self.ids.get(token, UNKNOWN_ID) for token in tokens]
+
+    # fusion d'un autre vocabulaire (celui d'un morceau, éventuellement construit par un processus
+    # du pool) et de ses listes d'identifiants: seuls les tokens utilisés par id_lists sont ajoutés,
+    # dans leur ordre de première utilisation; renvoie les listes avec les identifiants de self
+    def merge(self, other, id_lists):
+        remap = {}
+        def merged_id(token_id):
+            merged = remap.get(token_id)
+            if merged is None:
+                merged = remap[token_id] = self.add(other.tokens[token_id - 1])
+            return merged
+        return [[merged_id(token_id) for token_id in ids] for ids in id_lists]
+
+    # occurrences comptées sur les lignes effectivement écrites
+    def count(self, id_lists):
+        for ids in id_lists:
+            for token_id in ids:
+                self.counts[token_id - 1] += 1
+
+    def reset_counts(self):
+        self.counts = [0] * len(self.tokens)
+
+    def to_json(self):
+        return {'tokens': self.tokens, 'counts': self.counts}
+
+def load_vocabularies(file_path, columns=VOCABULARY_COLUMNS):
+    data = {}
+    if file_path is not None and os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    return {column: Vocabulary(data.get(column, {}).get('tokens', []), data.get(column, {}).get('counts', []))
+            for column in columns}
+
+def save_vocabularies(vocabularies, file_path):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump({column: vocabulary.to_json() for column, vocabulary in vocabularies.items()}, file, ensure_ascii=False)